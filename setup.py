@@ -29,7 +29,9 @@ setup(
         "rq-dashboard>=0.6",
         "toml",
         "bcrypt",
-        "Flask-SQLAlchemy",
+        # The read replica routing subclasses SignallingSession, which
+        # was removed in Flask-SQLAlchemy 3
+        "Flask-SQLAlchemy<3",
         "Flask-WTF",
         "flask-talisman",
         "arrow"
@@ -0,0 +1,296 @@
+"""
+Redis-backed cache for expensive API responses.
+
+Each cached entry is considered fresh for a configurable TTL and is kept for
+an additional grace period afterwards. When an entry is no longer fresh, only
+one worker acquires a lock and recomputes the entry while the other workers
+keep serving the stale entry (stale-while-revalidate). This prevents every
+worker from recomputing the same entry at the same time.
+
+The TTL and grace period can be configured per entry using the
+`API_CACHE_<NAME>_TTL` and `API_CACHE_<NAME>_GRACE` configuration values.
+
+Deleting an entry also increments the generation of the entry. Entries are
+saved with the generation that was current when their computation started,
+and entries from an older generation are ignored, so that a computation that
+was started before the entry was deleted can't save outdated data.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, namedtuple
+
+from flask import current_app
+from redis.exceptions import LockError
+
+from passari_web_ui.redis_connection import get_redis_connection
+
+CacheEntry = namedtuple("CacheEntry", ["data", "generated_at", "digest"])
+
+# Redis hash containing the hit, miss, stale and recompute counters for
+# each cached entry
+COUNTERS_KEY = "api_cache_counters"
+
+# Hits are counted in each process and added to the Redis counters at most
+# this often in seconds, so that serving a fresh entry doesn't require
+# a write
+HIT_FLUSH_INTERVAL = 10
+
+_hits_lock = threading.Lock()
+
+# How often to check whether another worker has finished recomputing
+# an entry when no stale entry is available
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_cache_config(name):
+    """
+    Get the TTL and grace period for a cached entry in seconds
+
+    :returns: Tuple of (ttl, grace)
+    """
+    config = current_app.config
+    ttl = config.get(
+        f"API_CACHE_{name.upper()}_TTL", config["API_CACHE_TTL"]
+    )
+    grace = config.get(
+        f"API_CACHE_{name.upper()}_GRACE", config["API_CACHE_GRACE"]
+    )
+
+    return float(ttl), float(grace)
+
+
+def _increment_counter(redis, name, counter):
+    redis.hincrby(COUNTERS_KEY, f"{name}:{counter}", 1)
+
+
+def _take_pending_hits(hits):
+    pending = hits["pending"]
+    hits["pending"] = Counter()
+    hits["flushed_at"] = time.monotonic()
+
+    return pending
+
+
+def _write_hits(redis, pending):
+    if not pending:
+        return
+
+    pipeline = redis.pipeline(transaction=False)
+    for name, count in pending.items():
+        pipeline.hincrby(COUNTERS_KEY, f"{name}:hit", count)
+
+    pipeline.execute()
+
+
+def _record_hit(redis, name):
+    """
+    Count a hit in this process, adding the hits counted so far to the
+    Redis counters once HIT_FLUSH_INTERVAL seconds have passed
+    """
+    hits = current_app.extensions.setdefault(
+        "api_cache_hits",
+        {"pending": Counter(), "flushed_at": time.monotonic()}
+    )
+
+    with _hits_lock:
+        hits["pending"][name] += 1
+
+        if time.monotonic() - hits["flushed_at"] < HIT_FLUSH_INTERVAL:
+            return
+
+        pending = _take_pending_hits(hits)
+
+    _write_hits(redis, pending)
+
+
+def flush_hit_counters():
+    """
+    Add the hits counted in this process to the Redis counters
+    """
+    hits = current_app.extensions.get("api_cache_hits")
+    if not hits:
+        return
+
+    with _hits_lock:
+        pending = _take_pending_hits(hits)
+
+    _write_hits(get_redis_connection(), pending)
+
+
+def get_cache_counters():
+    """
+    Get the cache counters for all cached entries.
+
+    Hits counted by other processes are only included once they have been
+    added to the Redis counters, which happens at most HIT_FLUSH_INTERVAL
+    seconds after the hit.
+
+    :returns: Dictionary of {name: {counter: count}}, where 'counter'
+              is one of 'hit', 'miss', 'stale' or 'recompute'
+    """
+    flush_hit_counters()
+
+    redis = get_redis_connection()
+    counters = {}
+
+    for key, count in redis.hgetall(COUNTERS_KEY).items():
+        name, counter = key.decode("utf-8").rsplit(":", 1)
+        counters.setdefault(name, {})[counter] = int(count)
+
+    return counters
+
+
+def _get_generation_key(name):
+    return f"{name}:generation"
+
+
+def get_generation(name):
+    """
+    Get the current generation of a cached entry
+    """
+    return int(get_redis_connection().get(_get_generation_key(name)) or 0)
+
+
+def get_digest(data):
+    """
+    Get a digest for JSON serializable data. The digest only changes if the
+    data changes.
+    """
+    content = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def save_cache_entry(name, data, generation=None):
+    """
+    Save an entry into the cache
+
+    :param generation: Generation of the entry when the data was computed.
+                       Defaults to the current generation.
+
+    :returns: CacheEntry instance
+    """
+    redis = get_redis_connection()
+    ttl, grace = get_cache_config(name)
+
+    if generation is None:
+        generation = get_generation(name)
+
+    entry = CacheEntry(
+        data=data, generated_at=time.time(), digest=get_digest(data)
+    )
+    redis.set(
+        name,
+        json.dumps({
+            "generated_at": entry.generated_at,
+            "digest": entry.digest,
+            "generation": generation,
+            "data": data
+        }),
+        # Keep the entry around for the grace period so that it can be served
+        # while a new entry is being computed
+        px=int((ttl + grace) * 1000)
+    )
+
+    return entry
+
+
+def load_cache_entry(name):
+    """
+    Load an entry from the cache regardless of its age
+
+    :returns: CacheEntry instance, or None if the entry doesn't exist or
+              was computed before the entry was deleted
+    """
+    redis = get_redis_connection()
+    entry, generation = redis.mget(name, _get_generation_key(name))
+
+    if not entry:
+        return None
+
+    entry = json.loads(entry)
+
+    if entry.get("generation", 0) != int(generation or 0):
+        return None
+
+    return CacheEntry(
+        data=entry["data"],
+        generated_at=entry["generated_at"],
+        # Entries saved by older versions don't include the digest
+        digest=entry.get("digest") or get_digest(entry["data"])
+    )
+
+
+def delete_cache_entry(name):
+    """
+    Delete an entry from the cache, causing it to be recomputed when it's
+    retrieved the next time. Computations of the entry that are already
+    in progress won't be saved.
+    """
+    pipeline = get_redis_connection().pipeline()
+    pipeline.incr(_get_generation_key(name))
+    pipeline.delete(name)
+    pipeline.execute()
+
+
+def get_cached(name, compute, record_hit=True):
+    """
+    Retrieve an entry from the cache, recomputing it if it is no longer fresh.
+
+    :param name: Name of the cached entry
+    :param compute: Function that returns the data for the entry.
+                    The data must be JSON serializable.
+    :param record_hit: Whether to increment the 'hit' counter if the entry
+                       is fresh
+
+    :returns: CacheEntry instance
+    """
+    redis = get_redis_connection()
+    ttl, _ = get_cache_config(name)
+
+    entry = load_cache_entry(name)
+
+    if entry and time.time() - entry.generated_at <= ttl:
+        if record_hit:
+            _record_hit(redis, name)
+        return entry
+
+    _increment_counter(redis, name, "miss")
+
+    lock_timeout = float(current_app.config["API_CACHE_LOCK_TIMEOUT"])
+    lock = redis.lock(f"{name}:lock", timeout=lock_timeout)
+
+    if lock.acquire(blocking=False):
+        try:
+            generation = get_generation(name)
+            entry = save_cache_entry(name, compute(), generation=generation)
+            _increment_counter(redis, name, "recompute")
+            return entry
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                # Lock expired while the entry was being computed
+                pass
+
+    if entry:
+        # Another worker is recomputing the entry, serve the stale entry
+        # in the meantime
+        _increment_counter(redis, name, "stale")
+        return entry
+
+    # No entry is available at all. Wait for the other worker to finish,
+    # and compute the entry ourselves if it doesn't finish in time.
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = load_cache_entry(name)
+        if entry:
+            return entry
+
+    generation = get_generation(name)
+    entry = save_cache_entry(name, compute(), generation=generation)
+    _increment_counter(redis, name, "recompute")
+
+    return entry
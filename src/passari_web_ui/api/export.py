@@ -0,0 +1,108 @@
+"""
+Streaming export of search results as CSV or newline-delimited JSON.
+
+The results are read using a server-side cursor and written to the response
+one batch at a time, so the memory usage doesn't depend on the amount of
+results.
+"""
+import csv
+import io
+import json
+
+from flask import Response, stream_with_context
+
+# Amount of rows fetched from the database cursor at a time
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson"
+}
+
+
+def iter_batches(query, batch_size=None):
+    """
+    Iterate query results in lists of at most 'batch_size' results using
+    a server-side cursor
+    """
+    if batch_size is None:
+        batch_size = EXPORT_BATCH_SIZE
+
+    batch = []
+    for item in query.yield_per(batch_size):
+        batch.append(item)
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _to_csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(entry) for entry in value)
+
+    return value
+
+
+def iter_csv(batches, fieldnames):
+    """
+    Serialize batches of dicts as CSV, yielding one chunk per batch
+    """
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames)
+    writer.writeheader()
+
+    for batch in batches:
+        for row in batch:
+            writer.writerow({
+                key: _to_csv_value(value) for key, value in row.items()
+            })
+
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def iter_ndjson(batches):
+    """
+    Serialize batches of dicts as newline-delimited JSON, yielding one chunk
+    per batch
+    """
+    for batch in batches:
+        yield "".join(json.dumps(row) + "\n" for row in batch)
+
+
+def create_export_response(batches, fieldnames, export_format, filename):
+    """
+    Create a streaming response for exporting search results
+
+    :param batches: Iterable of lists of dicts to export
+    :param fieldnames: Keys of the dicts, used as the CSV header
+    :param export_format: 'csv' or 'ndjson'
+    :param filename: Filename without the extension for the
+                     'Content-Disposition' header
+    """
+    if export_format == "csv":
+        chunks = iter_csv(batches, fieldnames)
+    else:
+        chunks = iter_ndjson(batches)
+
+    response = Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[export_format]
+    )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename={filename}.{export_format}"
+    )
+    # Disable response buffering in nginx
+    response.headers["X-Accel-Buffering"] = "no"
+
+    return response
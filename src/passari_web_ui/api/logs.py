@@ -0,0 +1,227 @@
+"""
+Functions for reading and searching SIP log files.
+
+The log files of a package are listed using MuseumPackage. Log files can be
+hundreds of megabytes in size, so they are read from disk in fixed-size
+chunks or line by line instead of being read into memory at once.
+"""
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+
+from passari_workflow.config import CONFIG as WORKFLOW_CONFIG
+
+# Size of the chunks read from the log file at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Lines longer than this are truncated in search results
+MAX_LINE_LENGTH = 2000
+
+
+def get_log_filenames(museum_package):
+    """
+    Get the names of the log files for a package
+    """
+    return museum_package.get_log_filenames()
+
+
+def get_log_dir(museum_package):
+    """
+    Get the directory containing the log files for a package in the
+    workflow archive
+    """
+    return (
+        Path(WORKFLOW_CONFIG["package"]["archive_dir"])
+        / str(museum_package.museum_object_id)
+        / museum_package.sip_filename
+        / "logs"
+    )
+
+
+def get_log_path(museum_package, log_filename):
+    """
+    Get the path to a log file for a package
+
+    :raises FileNotFoundError: If the log file doesn't exist
+    """
+    # Only accept the log files listed for the package to prevent accessing
+    # other files
+    if log_filename not in get_log_filenames(museum_package):
+        raise FileNotFoundError(f"Log file {log_filename} not found")
+
+    path = get_log_dir(museum_package) / log_filename
+
+    if not path.is_file():
+        raise FileNotFoundError(f"Log file {log_filename} not found")
+
+    return path
+
+
+def get_byte_range(size, offset=None, length=None, tail=None):
+    """
+    Get the byte range to read from a file based on the given parameters.
+
+    :param size: Size of the file
+    :param offset: Offset to start reading from
+    :param length: Maximum amount of bytes to read
+    :param tail: Amount of bytes to read from the end of the file.
+                 Overrides 'offset'.
+
+    :raises ValueError: If any of the parameters is negative
+    :returns: Tuple of (start, end), where 'end' is exclusive
+    """
+    if any(value is not None and value < 0 for value in (offset, length, tail)):
+        raise ValueError("Parameters can't be negative")
+
+    if tail is not None:
+        start = max(size - tail, 0)
+    else:
+        start = min(offset or 0, size)
+
+    end = size
+    if length is not None:
+        end = min(start + length, size)
+
+    return start, end
+
+
+def iter_file_range(path, start, end):
+    """
+    Read the given byte range of a file in chunks
+    """
+    with open(path, "rb") as file_:
+        file_.seek(start)
+        remaining = end - start
+
+        while remaining > 0:
+            chunk = file_.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+
+            remaining -= len(chunk)
+            yield chunk
+
+
+def gzip_chunks(chunks):
+    """
+    Compress chunks into a gzip stream without buffering the entire content
+    """
+    # wbits=31 produces the gzip container format
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+
+class SearchBudget:
+    """
+    Limits for a log search. The search is stopped once any of the limits
+    is exceeded.
+    """
+    def __init__(self, time_limit, byte_limit, max_matches):
+        self.deadline = time.monotonic() + time_limit
+        self.bytes_remaining = byte_limit
+        self.matches_remaining = max_matches
+        self.exceeded = None
+
+    def consume_bytes(self, amount):
+        self.bytes_remaining -= amount
+
+    def consume_match(self):
+        self.matches_remaining -= 1
+
+    def check(self):
+        """
+        Check whether the budget has been exceeded
+
+        :returns: True if the search should be stopped
+        """
+        if self.exceeded:
+            return True
+
+        if self.matches_remaining <= 0:
+            self.exceeded = "matches"
+        elif self.bytes_remaining <= 0:
+            self.exceeded = "bytes"
+        elif time.monotonic() > self.deadline:
+            self.exceeded = "time"
+
+        return bool(self.exceeded)
+
+
+def _truncate_line(line):
+    if len(line) > MAX_LINE_LENGTH:
+        return line[:MAX_LINE_LENGTH] + "…"
+
+    return line
+
+
+def search_log_file(path, query, context_lines, budget, ignore_case=False):
+    """
+    Search a log file line by line for lines containing a substring.
+
+    Regular expressions are not supported, since a single pattern could
+    take an unbounded amount of time to match one line regardless of the
+    search limits.
+
+    :param path: Path to the log file
+    :param query: Substring to search for
+    :param context_lines: Amount of lines to include before and after
+                          each matching line
+    :param budget: SearchBudget instance shared by all searched files
+    :param ignore_case: Whether to ignore case when searching
+
+    :returns: Generator of dictionaries containing the keys 'line_number',
+              'line', 'before' and 'after'
+    """
+    if ignore_case:
+        query = query.casefold()
+
+    before = deque(maxlen=context_lines)
+    # Matches that are still waiting for the lines after them
+    pending = []
+
+    with open(path, "rb") as file_:
+        for line_number, line in enumerate(file_, start=1):
+            if budget.check():
+                # Finish collecting the lines after the last matches
+                # if only the match limit was reached
+                if budget.exceeded != "matches" or not pending:
+                    break
+
+            budget.consume_bytes(len(line))
+            line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            is_match = not budget.exceeded and query in (
+                line.casefold() if ignore_case else line
+            )
+            line = _truncate_line(line)
+
+            for match in pending:
+                match["after"].append(line)
+
+            while pending and len(pending[0]["after"]) >= context_lines:
+                yield pending.pop(0)
+
+            if is_match:
+                budget.consume_match()
+                match = {
+                    "line_number": line_number,
+                    "line": line,
+                    "before": list(before),
+                    "after": []
+                }
+
+                if context_lines:
+                    pending.append(match)
+                else:
+                    yield match
+
+            before.append(line)
+
+    # Return matches near the end of the file with fewer lines after them
+    yield from pending
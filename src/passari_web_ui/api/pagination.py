@@ -0,0 +1,200 @@
+"""
+Keyset (cursor) pagination for API endpoints.
+
+Instead of skipping a number of rows using OFFSET, each page is retrieved by
+filtering the rows that come after the last row of the previous page. This
+keeps the cost of retrieving a page constant regardless of how deep the page
+is. The position is passed between requests as an opaque cursor.
+
+Counting the total amount of results can also be expensive with large result
+sets, in which case the amount can be estimated using the query planner
+instead.
+"""
+import base64
+import binascii
+import datetime
+import json
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+import arrow
+from arrow.parser import ParserError
+from passari_web_ui.db import db
+
+KeysetPage = namedtuple("KeysetPage", ["items", "next_cursor", "prev_cursor"])
+ResultCount = namedtuple("ResultCount", ["count", "estimated"])
+
+
+class _Explain(Executable, ClauseElement):
+    """
+    EXPLAIN statement returning the query plan as JSON
+    """
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kwargs):
+    return "EXPLAIN (FORMAT JSON) {}".format(
+        compiler.process(element.statement, **kwargs)
+    )
+
+
+def _serialize_value(value):
+    if isinstance(value, datetime.datetime):
+        return {
+            "datetime": value.isoformat(),
+            "naive": value.tzinfo is None
+        }
+
+    return value
+
+
+def _deserialize_value(value):
+    if isinstance(value, dict):
+        timestamp = arrow.get(value["datetime"])
+        return timestamp.naive if value["naive"] else timestamp.datetime
+
+    return value
+
+
+def encode_cursor(values, direction):
+    """
+    Encode the key values of a row into an opaque cursor
+
+    :param values: Key values of the row
+    :param direction: 'next' to retrieve the rows after the given row,
+                      'prev' to retrieve the rows before the given row
+    """
+    content = json.dumps({
+        "values": [_serialize_value(value) for value in values],
+        "direction": direction
+    })
+
+    return base64.urlsafe_b64encode(content.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor):
+    """
+    Decode an opaque cursor
+
+    :raises ValueError: If the cursor is invalid
+    :returns: Tuple of (values, direction)
+    """
+    try:
+        content = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8")
+        )
+        values = [_deserialize_value(value) for value in content["values"]]
+        direction = content["direction"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError,
+            TypeError, ParserError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    if direction not in ("next", "prev"):
+        raise ValueError("Invalid cursor")
+
+    return values, direction
+
+
+def paginate_keyset(
+        query, columns, get_key, cursor=None, limit=20, descending=False):
+    """
+    Retrieve a page of results using keyset pagination.
+
+    :param query: Query to paginate. The query must not be ordered.
+    :param columns: Columns that uniquely identify each row and determine
+                    the order of the results
+    :param get_key: Function that returns the values for 'columns'
+                    from a result
+    :param cursor: Cursor returned by a previous call, or None to retrieve
+                   the first page
+    :param limit: Maximum amount of results per page
+    :param descending: Whether the results are in descending order
+
+    :raises ValueError: If the cursor is invalid
+    :returns: KeysetPage instance
+    """
+    values, direction = None, "next"
+    if cursor:
+        values, direction = decode_cursor(cursor)
+
+        if len(values) != len(columns):
+            raise ValueError("Invalid cursor")
+
+    backwards = direction == "prev"
+
+    # When retrieving the previous page, iterate in the opposite order and
+    # reverse the results afterwards
+    reverse_order = descending != backwards
+
+    key = tuple_(*columns)
+    if values is not None:
+        if reverse_order:
+            query = query.filter(key < tuple_(*values))
+        else:
+            query = query.filter(key > tuple_(*values))
+
+    query = query.order_by(
+        *[
+            column.desc() if reverse_order else column.asc()
+            for column in columns
+        ]
+    )
+
+    # Retrieve one extra result to determine whether more results exist
+    items = query.limit(limit + 1).all()
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if backwards:
+        items.reverse()
+        has_next, has_prev = values is not None, has_more
+    else:
+        has_next, has_prev = has_more, values is not None
+
+    next_cursor = None
+    prev_cursor = None
+
+    if items and has_next:
+        next_cursor = encode_cursor(get_key(items[-1]), "next")
+    if items and has_prev:
+        prev_cursor = encode_cursor(get_key(items[0]), "prev")
+
+    return KeysetPage(
+        items=items, next_cursor=next_cursor, prev_cursor=prev_cursor
+    )
+
+
+def estimate_count(query):
+    """
+    Estimate the amount of results for a query using the row estimate
+    from the PostgreSQL query planner. The query is not executed.
+    """
+    plan = db.session.execute(
+        _Explain(query.order_by(None).statement)
+    ).scalar()
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_results(query):
+    """
+    Count the amount of results for a query.
+
+    The exact amount is only counted if the estimated amount is below
+    the `EXACT_COUNT_THRESHOLD` configuration value, since counting
+    a large amount of results can be slow.
+
+    :returns: ResultCount instance
+    """
+    estimate = estimate_count(query)
+
+    if estimate > int(current_app.config["EXACT_COUNT_THRESHOLD"]):
+        return ResultCount(count=estimate, estimated=True)
+
+    return ResultCount(count=query.order_by(None).count(), estimated=False)
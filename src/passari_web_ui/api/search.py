@@ -0,0 +1,209 @@
+"""
+Text search used by the API endpoints.
+
+By default, searches are performed as case-insensitive substring matches
+using ILIKE. These can't use B-tree indexes, but they can use the trigram
+GIN indexes created using the `flask create-search-indexes` command if the
+`pg_trgm` PostgreSQL extension is available.
+
+If `SEARCH_BACKEND` is set to 'fulltext', free-text fields are searched using
+PostgreSQL full-text search instead, which matches words and word prefixes
+instead of arbitrary substrings. This requires the full-text indexes created
+by the same command; if they don't exist, substring search is used instead.
+
+The workflow tables are owned by passari-workflow, which is why the indexes
+are managed here instead of in the table definitions.
+"""
+import re
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import func, or_, text
+
+from passari_web_ui.db import db
+from passari_workflow.db.models import MuseumObject, MuseumPackage
+
+# Text search configuration used for full-text search. 'simple' is used
+# since the titles are in multiple languages.
+FULLTEXT_CONFIG = "simple"
+
+SearchIndex = namedtuple(
+    "SearchIndex", ["name", "table", "method", "expression", "kind"]
+)
+
+
+def _fulltext_expression(column_name):
+    return (
+        f"to_tsvector('{FULLTEXT_CONFIG}'::regconfig, "
+        f"coalesce({column_name}, ''))"
+    )
+
+
+SEARCH_INDEXES = [
+    SearchIndex(
+        name="ix_web_ui_trgm_museum_package_sip_filename",
+        table=MuseumPackage.__table__.name,
+        method="gin",
+        expression="sip_filename gin_trgm_ops",
+        kind="trigram"
+    ),
+    SearchIndex(
+        name="ix_web_ui_trgm_museum_object_title",
+        table=MuseumObject.__table__.name,
+        method="gin",
+        expression="title gin_trgm_ops",
+        kind="trigram"
+    ),
+    SearchIndex(
+        name="ix_web_ui_trgm_museum_object_freeze_reason",
+        table=MuseumObject.__table__.name,
+        method="gin",
+        expression="freeze_reason gin_trgm_ops",
+        kind="trigram"
+    ),
+    SearchIndex(
+        name="ix_web_ui_fts_museum_object_title",
+        table=MuseumObject.__table__.name,
+        method="gin",
+        expression=_fulltext_expression("title"),
+        kind="fulltext"
+    ),
+    SearchIndex(
+        name="ix_web_ui_fts_museum_object_freeze_reason",
+        table=MuseumObject.__table__.name,
+        method="gin",
+        expression=_fulltext_expression("freeze_reason"),
+        kind="fulltext"
+    ),
+    # Used for ordering and keyset pagination in the 'Manage SIPs' page
+    SearchIndex(
+        name="ix_web_ui_museum_package_created_date_id",
+        table=MuseumPackage.__table__.name,
+        method="btree",
+        expression="created_date, id",
+        kind="btree"
+    )
+]
+
+# Cached result of whether the full-text indexes exist, keyed by
+# the database URL
+_fulltext_index_status = {}
+
+
+def is_trigram_extension_available():
+    """
+    Check whether the 'pg_trgm' extension is installed in the database
+    """
+    return bool(
+        db.session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar()
+    )
+
+
+def _get_index_names(valid):
+    results = db.session.execute(
+        text(
+            "SELECT pg_class.relname FROM pg_index "
+            "JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = ANY(:names) "
+            "AND pg_index.indisvalid = :valid"
+        ),
+        {"names": [index.name for index in SEARCH_INDEXES], "valid": valid}
+    )
+
+    return set(result[0] for result in results)
+
+
+def get_existing_index_names():
+    """
+    Get the names of the search indexes that exist in the database and
+    can be used by queries
+    """
+    return _get_index_names(valid=True)
+
+
+def get_invalid_index_names():
+    """
+    Get the names of the search indexes that are invalid.
+
+    A failed or interrupted 'CREATE INDEX CONCURRENTLY' leaves behind an
+    invalid index, which isn't used by queries but still exists.
+    """
+    return _get_index_names(valid=False)
+
+
+def get_search_backend():
+    """
+    Get the search backend to use, either 'fulltext' or 'ilike'
+    """
+    if current_app.config["SEARCH_BACKEND"] != "fulltext":
+        return "ilike"
+
+    url = str(db.engine.url)
+    if url not in _fulltext_index_status:
+        existing_names = get_existing_index_names()
+        _fulltext_index_status[url] = all(
+            index.name in existing_names for index in SEARCH_INDEXES
+            if index.kind == "fulltext"
+        )
+
+        if not _fulltext_index_status[url]:
+            current_app.logger.warning(
+                "Full-text search indexes don't exist, falling back to "
+                "substring search. Run 'flask create-search-indexes' to "
+                "create them."
+            )
+
+    return "fulltext" if _fulltext_index_status[url] else "ilike"
+
+
+def _get_prefix_tsquery(search_query):
+    """
+    Convert a search query into a tsquery that matches all words in the
+    query as prefixes, or None if the query contains no words
+    """
+    words = re.findall(r"\w+", search_query)
+
+    if not words:
+        return None
+
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def get_search_filter(search_query, text_columns=(), identifier_columns=()):
+    """
+    Get a filter clause matching any of the given columns
+
+    :param search_query: Search query entered by the user
+    :param text_columns: Columns containing free text, which are searched
+                         using full-text search if it is enabled
+    :param identifier_columns: Columns containing identifiers such as
+                               filenames, which are always searched as
+                               substrings
+    """
+    backend = get_search_backend()
+    tsquery = _get_prefix_tsquery(search_query)
+
+    clauses = []
+    for column in text_columns:
+        if backend == "fulltext" and tsquery:
+            # The expression must match the index expression exactly for
+            # the index to be used
+            clauses.append(
+                func.to_tsvector(
+                    text(f"'{FULLTEXT_CONFIG}'::regconfig"),
+                    func.coalesce(column, "")
+                ).op("@@")(
+                    func.to_tsquery(
+                        text(f"'{FULLTEXT_CONFIG}'::regconfig"), tsquery
+                    )
+                )
+            )
+        else:
+            clauses.append(column.ilike(f"%{search_query}%"))
+
+    for column in identifier_columns:
+        clauses.append(column.ilike(f"%{search_query}%"))
+
+    return or_(*clauses)
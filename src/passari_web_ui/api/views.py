@@ -1,21 +1,45 @@
 import json
+import time
 
-from flask import Blueprint, jsonify, request
+from flask import (Blueprint, Response, abort, current_app, jsonify, request,
+                   stream_with_context)
+from flask_sqlalchemy import Pagination
 from sqlalchemy import and_, or_
-
+from sqlalchemy.orm import contains_eager
+
+from passari_web_ui.api.cache import get_cached
+from passari_web_ui.api.export import (EXPORT_MIMETYPES,
+                                       create_export_response, iter_batches)
+from passari_web_ui.api.logs import (SearchBudget, get_byte_range,
+                                     get_log_filenames, get_log_path,
+                                     gzip_chunks, iter_file_range,
+                                     search_log_file)
+from passari_web_ui.api.pagination import count_results, paginate_keyset
+from passari_web_ui.api.search import get_search_filter
 from passari_web_ui.db import db
+from passari_web_ui.db.replica import read_replica
+from passari_web_ui.freeze_reasons import (invalidate_freeze_reasons,
+                                           search_freeze_reasons)
+from passari_web_ui.jobs import (enqueue_job, get_job, get_job_status,
+                                 get_unreenqueueable_object_ids)
+from passari_web_ui.jobs import reenqueue_objects as do_reenqueue_objects
+from passari_web_ui.rejections import get_signature_counts_query
+from passari_web_ui.stats import STATS_FUNCS
+from passari_web_ui.timeseries import (RESOLUTIONS, get_current_throughput,
+                                       get_snapshots)
+from passari_web_ui.ui.utils import get_system_status
 from passari_workflow.db.models import MuseumObject, MuseumPackage
-from passari_workflow.queue.queues import (QueueType, get_object_id2queue_map,
-                                           get_queue)
-from passari_workflow.redis.connection import get_redis_connection
+from passari_workflow.queue.queues import get_object_id2queue_map
 from passari_workflow.scripts.reenqueue_object import \
     reenqueue_object as do_reenqueue_object
 from passari_workflow.scripts.unfreeze_objects import \
     unfreeze_objects as do_unfreeze_objects
-from rq.registry import FailedJobRegistry, StartedJobRegistry
 
 routes = Blueprint("api", __name__)
 
+# Seconds after which a comment is sent to an idle event stream
+STREAM_KEEPALIVE_INTERVAL = 15
+
 
 STRING_TO_BOOLEAN = {
     "true": True,
@@ -36,106 +60,72 @@ def to_bool(s):
     return STRING_TO_BOOLEAN.get(s, None)
 
 
-@routes.route("/overview-stats")
-def overview_stats():
+def _set_revalidation_headers(response):
     """
-    Retrieve real-time statistics used in the 'Overview' page
+    Allow the browser to store the response, but require it to revalidate
+    the response using its ETag every time before using it
     """
-    # Check cache first
-    redis = get_redis_connection()
-    result = redis.get("overview_stats")
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
 
-    if result:
-        result = json.loads(result)
-        return jsonify(result)
+    return response
 
-    queues = (
-        get_queue(QueueType.DOWNLOAD_OBJECT),
-        get_queue(QueueType.CREATE_SIP),
-        get_queue(QueueType.SUBMIT_SIP),
-        get_queue(QueueType.CONFIRM_SIP)
-    )
-    job_count = sum([queue.count for queue in queues])
 
-    failed_count = sum([
-        FailedJobRegistry(queue=queue).count for queue in queues
-    ])
+def _make_conditional(response):
+    """
+    Add an ETag computed from the response body, and replace the response
+    with '304 Not Modified' if the ETag matches the 'If-None-Match' header
+    """
+    _set_revalidation_headers(response)
+    response.add_etag()
 
-    total_count = db.session.query(MuseumObject).count()
+    return response.make_conditional(request)
 
-    frozen_count = (
-        db.session.query(MuseumObject)
-        .filter(MuseumObject.frozen)
-        .count()
-    )
 
-    submitted_count = (
-        db.session.query(MuseumObject)
-        .join(
-            MuseumPackage, MuseumObject.latest_package_id == MuseumPackage.id
-        )
-        .filter(
-            and_(
-                MuseumObject.latest_package,
-                MuseumPackage.rejected == False,
-                MuseumPackage.preserved == False,
-                MuseumPackage.uploaded
-            )
-        )
-        .count()
-    )
+def _get_stats_payload(name):
+    """
+    Get cached statistics including their age in seconds for the stream
 
-    rejected_count = (
-        db.session.query(MuseumObject)
-        .join(
-            MuseumPackage, MuseumObject.latest_package_id == MuseumPackage.id
-        ).filter(
-            and_(MuseumObject.latest_package, MuseumPackage.rejected)
-        )
-        .count()
-    )
+    :returns: Tuple of (payload, digest)
+    """
+    # Streams check the statistics every STATS_STREAM_INTERVAL seconds,
+    # which would drown out the hits of actual requests
+    entry = get_cached(name, STATS_FUNCS[name], record_hit=False)
 
-    preserved_count = (
-        db.session.query(MuseumObject)
-        .with_transformation(MuseumObject.exclude_preservation_pending)
-        .filter(MuseumObject.preserved)
-        .count()
-    )
+    result = dict(entry.data)
+    result["generated_at"] = entry.generated_at
+    result["age"] = max(time.time() - entry.generated_at, 0)
 
-    result = {
-        "steps": {
-            "pending": {
-                "count": int(
-                    total_count
-                    - job_count - failed_count - frozen_count - rejected_count
-                    - submitted_count - preserved_count
-                )
-            },
-        },
-        "total_count": total_count
-    }
+    return result, entry.digest
 
-    # Add the individual queues
-    for queue in queues:
-        result["steps"][queue.name] = {
-            "count": queue.count
-        }
 
-    # Add counts outside of queues
-    other_steps = [
-        ("preserved", preserved_count),
-        ("rejected", rejected_count),
-        ("submitted", submitted_count),
-        ("frozen", frozen_count),
-        ("failed", failed_count)
-    ]
+def _get_cached_stats(name):
+    """
+    Return a response containing cached statistics.
 
-    for name, count in other_steps:
-        result["steps"][name] = {"count": count}
+    The digest of the statistics is used as a weak ETag. If the statistics
+    haven't changed, '304 Not Modified' is returned without serializing
+    them, even if they have been recomputed in the meantime.
+    """
+    entry = get_cached(name, STATS_FUNCS[name])
+
+    if request.if_none_match.contains_weak(entry.digest):
+        response = Response(status=304)
+    else:
+        response = jsonify(entry.data)
 
-    # Cache result for 2 seconds
-    redis.set("overview_stats", json.dumps(result), ex=2)
-    return jsonify(result)
+    response.set_etag(entry.digest, weak=True)
+
+    return _set_revalidation_headers(response)
+
+
+@routes.route("/overview-stats")
+@read_replica
+def overview_stats():
+    """
+    Retrieve real-time statistics used in the 'Overview' page
+    """
+    return _get_cached_stats("overview_stats")
 
 
 @routes.route("/navbar-stats")
@@ -143,50 +133,145 @@ def navbar_stats():
     """
     Retrieve object counts used for the navbar
     """
-    # Check cache first
-    redis = get_redis_connection()
-    result = redis.get("navbar_stats")
+    return _get_cached_stats("navbar_stats")
 
-    if result:
-        result = json.loads(result)
-        return jsonify(result)
 
-    queues = (
-        get_queue(QueueType.DOWNLOAD_OBJECT),
-        get_queue(QueueType.CREATE_SIP),
-        get_queue(QueueType.SUBMIT_SIP),
-        get_queue(QueueType.CONFIRM_SIP)
+@routes.route("/system-status")
+def system_status():
+    """
+    Retrieve the status of the heartbeats of automated procedures
+    """
+    return jsonify(get_system_status().to_dict())
+
+
+@routes.route("/stats-history")
+def stats_history():
+    """
+    Retrieve the recorded object counts of each workflow step, and the
+    current throughput and projected drain time of each step.
+
+    Accepts the parameters 'resolution', which is 'second', 'minute'
+    (default) or 'hour', and 'since', which is a UNIX timestamp.
+    """
+    resolution = request.args.get("resolution", "minute")
+    if resolution not in RESOLUTIONS:
+        return jsonify({
+            "success": False,
+            "error": f"Unknown resolution '{resolution}'"
+        }), 400
+
+    since = request.args.get("since", None, type=float)
+
+    return jsonify({
+        "resolution": resolution,
+        "snapshots": get_snapshots(resolution, since=since),
+        "throughput": get_current_throughput()
+    })
+
+
+@routes.route("/stats-stream")
+def stats_stream():
+    """
+    Stream the statistics used in the 'Overview' page and the navbar as
+    server-sent events.
+
+    An event named after the statistics is sent whenever the statistics
+    change. Every stream reads the same cached statistics, which are only
+    recomputed by one worker at a time.
+    """
+    if not current_app.config["STATS_STREAM_ENABLED"]:
+        abort(404)
+
+    names = request.args.get("events", ",".join(STATS_FUNCS)).split(",")
+    names = [name for name in names if name in STATS_FUNCS]
+
+    interval = float(current_app.config["STATS_STREAM_INTERVAL"])
+    max_duration = float(current_app.config["STATS_STREAM_MAX_DURATION"])
+
+    def generate():
+        start = time.monotonic()
+        last_sent = start
+        digests = {}
+
+        # Tell the browser how long to wait before reconnecting once
+        # the stream is closed
+        yield f"retry: {int(interval * 1000)}\n\n"
+
+        while time.monotonic() - start < max_duration:
+            for name in names:
+                result, digest = _get_stats_payload(name)
+
+                if digests.get(name) != digest:
+                    digests[name] = digest
+                    last_sent = time.monotonic()
+                    yield f"event: {name}\ndata: {json.dumps(result)}\n\n"
+
+            # Release the database connection until the next check
+            db.session.remove()
+
+            if time.monotonic() - last_sent > STREAM_KEEPALIVE_INTERVAL:
+                # Send a comment to prevent proxies from closing an idle
+                # connection
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+
+            time.sleep(interval)
+
+    response = Response(
+        stream_with_context(generate()), mimetype="text/event-stream"
     )
-    result = {"queues": {}}
-    for queue in queues:
-        result["queues"][queue.name] = {
-            "pending": queue.count,
-            "processing": StartedJobRegistry(queue=queue).count
-        }
+    response.headers["Cache-Control"] = "no-cache"
+    # Disable response buffering in nginx
+    response.headers["X-Accel-Buffering"] = "no"
 
-    # Add failed
-    result["failed"] = sum([
-        FailedJobRegistry(queue=queue).count for queue in queues
-    ])
+    return response
 
-    # Cache result for 2 seconds
-    redis.set("navbar_stats", json.dumps(result), ex=2)
-    return jsonify(result)
 
+def _paginate_by_page_number(query, page, limit, result_count):
+    """
+    Retrieve a page of results using page numbers
 
-@routes.route("/list-frozen-objects")
-def list_frozen_objects():
+    :param result_count: ResultCount instance, or None if the results
+                         were not counted
+
+    :returns: Tuple of (items, pagination details as a dict)
+    """
+    page = max(page, 1)
+    items = query.limit(limit).offset((page - 1) * limit).all()
+
+    if result_count is None:
+        # Page numbers can't be determined without the total count
+        return items, {"page_numbers": [], "page": page, "page_count": None}
+
+    pagination = Pagination(query, page, limit, result_count.count, items)
+
+    return items, {
+        "page_numbers": list(pagination.iter_pages()),
+        "page": page,
+        "page_count": pagination.pages
+    }
+
+
+def _get_result_count_details(result_count):
     """
-    List and search frozen objects
+    Get the result count details for a search response
     """
-    page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 20))
-    search_query = request.args.get("search", "")
+    if result_count is None:
+        return {"result_count": None, "result_count_estimated": False}
 
+    return {
+        "result_count": result_count.count,
+        "result_count_estimated": result_count.estimated
+    }
+
+
+def _get_frozen_objects_query(search_query):
+    """
+    Get a query for frozen objects matching the search query
+    """
     query = (
         db.session.query(MuseumObject)
         .filter_by(frozen=True)
-        .order_by(MuseumObject.id)
     )
 
     if search_query.strip():
@@ -197,17 +282,27 @@ def list_frozen_objects():
             query = query.filter_by(id=object_id)
         except ValueError:
             query = query.filter(
-                or_(
-                    MuseumObject.freeze_reason.ilike(f"%{search_query}%"),
-                    MuseumObject.title.ilike(f"%{search_query}%")
+                get_search_filter(
+                    search_query,
+                    text_columns=(
+                        MuseumObject.freeze_reason, MuseumObject.title
+                    )
                 )
             )
 
-    pagination = query.paginate(page=page, per_page=limit, error_out=False)
+    return query
 
-    items = []
-    for museum_object in pagination.items:
-        items.append({
+
+FROZEN_OBJECT_FIELDS = ("id", "latest_package_id", "title", "source", "reason")
+
+
+def _serialize_frozen_objects(museum_objects):
+    """
+    Serialize frozen MuseumObject entries for the 'Manage frozen objects'
+    page
+    """
+    return [
+        {
             "id": museum_object.id,
             "latest_package_id": museum_object.latest_package_id,
             "title": museum_object.title,
@@ -216,47 +311,181 @@ def list_frozen_objects():
                 else museum_object.freeze_source.value
             ),
             "reason": museum_object.freeze_reason
-        })
+        }
+        for museum_object in museum_objects
+    ]
 
-    result = {
-        "results": items,
-        "result_count": pagination.total,
-        "page_numbers": list(pagination.iter_pages()),
-        "page": page,
-        "page_count": pagination.pages
-    }
 
-    return jsonify(result)
+@routes.route("/list-frozen-objects")
+@read_replica
+def list_frozen_objects():
+    """
+    List and search frozen objects.
 
+    Results are paginated using page numbers by default. If the 'cursor'
+    parameter is provided, keyset pagination is used instead: an empty cursor
+    retrieves the first page and the 'next_cursor' and 'prev_cursor' values
+    in the response can be used to retrieve the adjacent pages.
 
-@routes.route("/list-sips")
-def list_sips():
-    """
-    Query SIPs
+    The results are counted unless 'include_count' is false. If the amount
+    of results is large, the count is estimated instead.
     """
     page = int(request.args.get("page", 1))
     limit = int(request.args.get("limit", 20))
+    cursor = request.args.get("cursor", None)
+    include_count = to_bool(request.args.get("include_count", True))
     search_query = request.args.get("search", "")
-    only_latest = to_bool(request.args.get("only_latest", False))
-    preserved = to_bool(request.args.get("preserved", False))
-    rejected = to_bool(request.args.get("rejected", False))
-    processing = to_bool(request.args.get("processing", False))
-    cancelled = to_bool(request.args.get("cancelled", False))
 
-    query = db.session.query(MuseumPackage)
+    query = _get_frozen_objects_query(search_query)
 
-    if only_latest:
-        query = (
-            query.join(
-                MuseumObject,
-                MuseumPackage.id == MuseumObject.latest_package_id
+    result_count = count_results(query) if include_count else None
+
+    if cursor is not None:
+        try:
+            keyset_page = paginate_keyset(
+                query,
+                columns=(MuseumObject.id,),
+                get_key=lambda museum_object: (museum_object.id,),
+                cursor=cursor,
+                limit=limit
             )
-        )
+        except ValueError as exc:
+            return jsonify({"success": False, "error": str(exc)}), 400
+
+        items = keyset_page.items
+        pagination_details = {
+            "next_cursor": keyset_page.next_cursor,
+            "prev_cursor": keyset_page.prev_cursor
+        }
     else:
-        query = query.join(
+        items, pagination_details = _paginate_by_page_number(
+            query.order_by(MuseumObject.id), page=page, limit=limit,
+            result_count=result_count
+        )
+
+    result = {"results": _serialize_frozen_objects(items)}
+    result.update(_get_result_count_details(result_count))
+    result.update(pagination_details)
+
+    return _make_conditional(jsonify(result))
+
+
+@routes.route("/export-frozen-objects")
+@read_replica
+def export_frozen_objects():
+    """
+    Export all frozen objects matching the search query as CSV or
+    newline-delimited JSON.
+
+    Accepts the same search parameters as '/api/list-frozen-objects' and
+    the 'format' parameter, which is either 'csv' (default) or 'ndjson'.
+    """
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_MIMETYPES:
+        return jsonify({
+            "success": False,
+            "error": f"Unknown export format '{export_format}'"
+        }), 400
+    search_query = request.args.get("search", "")
+
+    query = _get_frozen_objects_query(search_query).order_by(MuseumObject.id)
+
+    batches = (
+        _serialize_frozen_objects(museum_objects)
+        for museum_objects in iter_batches(query)
+    )
+
+    return create_export_response(
+        batches, fieldnames=FROZEN_OBJECT_FIELDS,
+        export_format=export_format, filename="frozen_objects"
+    )
+
+
+def _is_latest_package(museum_package):
+    """
+    Check whether the package is the latest package of its object.
+
+    The foreign key is compared instead of the 'latest_package' relationship
+    to avoid loading the latest package separately for each result.
+    """
+    return (
+        museum_package.museum_object.latest_package_id == museum_package.id
+    )
+
+
+def _serialize_museum_packages(museum_packages):
+    """
+    Serialize MuseumPackage entries for the 'Manage SIPs' page.
+
+    The 'museum_object' relationship of each package should be loaded
+    beforehand.
+    """
+    # Retrieve the workflow status for each museum package
+    object_ids = [
+        museum_package.museum_object_id for museum_package in museum_packages
+        if _is_latest_package(museum_package)
+    ]
+    object_id2queue_names = get_object_id2queue_map(object_ids)
+
+    items = []
+    for museum_package in museum_packages:
+        if museum_package.cancelled:
+            status = "cancelled"
+        elif museum_package.preserved:
+            status = "preserved"
+        elif museum_package.rejected:
+            status = "rejected"
+        else:
+            status = "processing"
+
+        is_latest_package = _is_latest_package(museum_package)
+
+        items.append({
+            "id": museum_package.id,
+            "filename": museum_package.sip_filename,
+            "object_id": museum_package.museum_object_id,
+            "title": museum_package.museum_object.title,
+            "status": status,
+            "can_reenqueue": museum_package.rejected and is_latest_package,
+            # Get the current queues for the object if they exist
+            "queues": (
+                object_id2queue_names[museum_package.museum_object_id]
+                if is_latest_package and status == "processing" else []
+            ),
+            "uploaded": museum_package.uploaded
+        })
+
+    return items
+
+
+def _get_sips_query(args):
+    """
+    Get a query for SIPs matching the search parameters
+
+    :param args: Search parameters as a dict-like object
+    """
+    search_query = args.get("search", "")
+    only_latest = to_bool(args.get("only_latest", False))
+    preserved = to_bool(args.get("preserved", False))
+    rejected = to_bool(args.get("rejected", False))
+    processing = to_bool(args.get("processing", False))
+    cancelled = to_bool(args.get("cancelled", False))
+
+    # Load each package's object in the same query, since the object title
+    # and latest package are needed for every result
+    query = (
+        db.session.query(MuseumPackage)
+        .join(
             MuseumObject,
             MuseumPackage.museum_object_id == MuseumObject.id
         )
+        .options(contains_eager(MuseumPackage.museum_object))
+    )
+
+    if only_latest:
+        query = query.filter(
+            MuseumPackage.id == MuseumObject.latest_package_id
+        )
 
     all_selected = sum([preserved, rejected, processing, cancelled]) == 4
     none_selected = sum([preserved, rejected, processing, cancelled]) == 0
@@ -283,8 +512,6 @@ def list_sips():
 
         query = query.filter(or_(*or_clauses))
 
-    query = query.order_by(MuseumPackage.created_date.desc())
-
     if search_query.strip():
         try:
             # If an integer is provided, assume the user is searching
@@ -293,59 +520,142 @@ def list_sips():
             query = query.filter(MuseumPackage.museum_object_id == object_id)
         except ValueError:
             query = query.filter(
-                or_(
-                    MuseumPackage.sip_filename.ilike(f"%{search_query}%"),
-                    MuseumObject.title.ilike(f"%{search_query}%")
+                get_search_filter(
+                    search_query,
+                    text_columns=(MuseumObject.title,),
+                    identifier_columns=(MuseumPackage.sip_filename,)
                 )
             )
 
-    pagination = query.paginate(page=page, per_page=limit, error_out=False)
+    return query
 
-    # Retrieve the workflow status for each museum package
-    object_ids = [
-        museum_package.museum_object_id for museum_package in pagination.items
-        if museum_package == museum_package.museum_object.latest_package
-    ]
-    object_id2queue_names = get_object_id2queue_map(object_ids)
 
-    items = []
-    for museum_package in pagination.items:
-        if museum_package.cancelled:
-            status = "cancelled"
-        elif museum_package.preserved:
-            status = "preserved"
-        elif museum_package.rejected:
-            status = "rejected"
-        else:
-            status = "processing"
+@routes.route("/list-sips")
+@read_replica
+def list_sips():
+    """
+    Query SIPs.
 
-        is_latest_package = \
-            museum_package == museum_package.museum_object.latest_package
+    Results are paginated using page numbers by default. If the 'cursor'
+    parameter is provided, keyset pagination is used instead: an empty cursor
+    retrieves the first page and the 'next_cursor' and 'prev_cursor' values
+    in the response can be used to retrieve the adjacent pages.
 
-        items.append({
-            "id": museum_package.id,
-            "filename": museum_package.sip_filename,
-            "object_id": museum_package.museum_object_id,
-            "title": museum_package.museum_object.title,
-            "status": status,
-            "can_reenqueue": museum_package.rejected and is_latest_package,
-            # Get the current queues for the object if they exist
-            "queues": (
-                object_id2queue_names[museum_package.museum_object_id]
-                if is_latest_package and status == "processing" else []
-            ),
-            "uploaded": museum_package.uploaded
-        })
+    The results are counted unless 'include_count' is false. If the amount
+    of results is large, the count is estimated instead.
+    """
+    page = int(request.args.get("page", 1))
+    limit = int(request.args.get("limit", 20))
+    cursor = request.args.get("cursor", None)
+    include_count = to_bool(request.args.get("include_count", True))
 
-    result = {
-        "results": items,
-        "result_count": pagination.total,
-        "page_numbers": list(pagination.iter_pages()),
-        "page": page,
-        "page_count": pagination.pages
-    }
+    query = _get_sips_query(request.args)
+
+    result_count = count_results(query) if include_count else None
+
+    if cursor is not None:
+        try:
+            keyset_page = paginate_keyset(
+                query,
+                columns=(MuseumPackage.created_date, MuseumPackage.id),
+                get_key=lambda museum_package: (
+                    museum_package.created_date, museum_package.id
+                ),
+                cursor=cursor,
+                limit=limit,
+                descending=True
+            )
+        except ValueError as exc:
+            return jsonify({"success": False, "error": str(exc)}), 400
+
+        items = keyset_page.items
+        pagination_details = {
+            "next_cursor": keyset_page.next_cursor,
+            "prev_cursor": keyset_page.prev_cursor
+        }
+    else:
+        items, pagination_details = _paginate_by_page_number(
+            query.order_by(MuseumPackage.created_date.desc()),
+            page=page, limit=limit, result_count=result_count
+        )
+
+    result = {"results": _serialize_museum_packages(items)}
+    result.update(_get_result_count_details(result_count))
+    result.update(pagination_details)
 
-    return jsonify(result)
+    return _make_conditional(jsonify(result))
+
+
+SIP_FIELDS = (
+    "id", "filename", "object_id", "title", "status", "can_reenqueue",
+    "queues", "uploaded"
+)
+
+
+@routes.route("/export-sips")
+@read_replica
+def export_sips():
+    """
+    Export all SIPs matching the search parameters as CSV or
+    newline-delimited JSON.
+
+    Accepts the same search parameters as '/api/list-sips' and the 'format'
+    parameter, which is either 'csv' (default) or 'ndjson'.
+    """
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_MIMETYPES:
+        return jsonify({
+            "success": False,
+            "error": f"Unknown export format '{export_format}'"
+        }), 400
+
+    query = _get_sips_query(request.args).order_by(
+        MuseumPackage.created_date.desc(), MuseumPackage.id.desc()
+    )
+
+    batches = (
+        _serialize_museum_packages(museum_packages)
+        for museum_packages in iter_batches(query)
+    )
+
+    return create_export_response(
+        batches, fieldnames=SIP_FIELDS, export_format=export_format,
+        filename="sips"
+    )
+
+
+@routes.route("/list-rejection-signatures")
+@read_replica
+def list_rejection_signatures():
+    """
+    List the errors found in rejected SIPs in descending order of the
+    amount of SIPs they were found in
+    """
+    page = int(request.args.get("page", 1))
+    limit = int(request.args.get("limit", 20))
+
+    query = get_signature_counts_query()
+    result_count = count_results(query)
+
+    items, pagination_details = _paginate_by_page_number(
+        query, page=page, limit=limit, result_count=result_count
+    )
+
+    results = [
+        {
+            "id": signature.id,
+            "signature": signature.signature,
+            "example": signature.example,
+            "package_count": package_count
+        }
+        for signature, package_count in items
+    ]
+
+    result = {"results": results}
+    result.update(_get_result_count_details(result_count))
+    result.update(pagination_details)
+
+    return _make_conditional(jsonify(result))
 
 
 @routes.route("/reenqueue-object", methods=["POST"])
@@ -369,6 +679,87 @@ def reenqueue_object():
     return jsonify({"success": True})
 
 
+@routes.route("/reenqueue-objects", methods=["POST"])
+def reenqueue_objects():
+    """
+    Re-enqueue multiple rejected objects.
+
+    The objects are provided as a comma-separated list of object IDs. If more
+    objects than BULK_OPERATION_SYNC_LIMIT are provided, they are re-enqueued
+    in a background job and the job ID is returned instead of the results.
+    The progress of the job can be followed using the '/api/job-status'
+    endpoint.
+    """
+    object_ids = request.form.get("object_ids", "")
+
+    try:
+        object_ids = list(dict.fromkeys(
+            int(object_id) for object_id in object_ids.split(",")
+            if object_id.strip()
+        ))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid object IDs"})
+
+    if not object_ids:
+        return jsonify({"success": False, "error": "No object ID was provided"})
+
+    missing_object_ids, not_rejected_object_ids = \
+        get_unreenqueueable_object_ids(object_ids)
+
+    if missing_object_ids or not_rejected_object_ids:
+        return jsonify({
+            "success": False,
+            "error": "Some objects can't be re-enqueued",
+            "missing_object_ids": missing_object_ids,
+            "not_rejected_object_ids": not_rejected_object_ids
+        })
+
+    if len(object_ids) > current_app.config["BULK_OPERATION_SYNC_LIMIT"]:
+        job = enqueue_job(
+            do_reenqueue_objects, object_ids,
+            description=f"Re-enqueue {len(object_ids)} object(s)"
+        )
+        return jsonify({"success": True, "job_id": job.id})
+
+    return jsonify({
+        "success": True, "result": do_reenqueue_objects(object_ids)
+    })
+
+
+@routes.route("/job-status/<job_id>")
+def job_status(job_id):
+    """
+    Get the status and progress of a background job
+    """
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    return jsonify(get_job_status(job))
+
+
+@routes.route("/list-freeze-reasons")
+def list_freeze_reasons():
+    """
+    List the most used freeze reasons starting with the 'search' prefix
+    along with the amount of frozen objects using each reason.
+
+    Used for auto-completing freeze reasons.
+    """
+    # The primary database is used since the cached freeze reasons are
+    # refilled here after freezing or unfreezing objects, and a lagging
+    # replica would cache outdated reasons for the whole TTL
+    search_query = request.args.get("search", "")
+    limit = min(int(request.args.get("limit", 10)), 100)
+
+    results = [
+        {"reason": reason, "count": count}
+        for reason, count in search_freeze_reasons(search_query, limit=limit)
+    ]
+
+    return _make_conditional(jsonify({"results": results}))
+
+
 @routes.route("/unfreeze-objects", methods=["POST"])
 def unfreeze_objects():
     """
@@ -384,6 +775,7 @@ def unfreeze_objects():
     count = do_unfreeze_objects(
         object_ids=object_ids, reason=reason, enqueue=enqueue
     )
+    invalidate_freeze_reasons()
 
     return jsonify({"success": True, "count": count})
 
@@ -405,3 +797,180 @@ def get_log_content():
     log_content = museum_package.get_log_file_content(log_filename)
 
     return jsonify({"success": True, "data": log_content})
+
+
+def _get_int_arg(name):
+    """
+    Get an optional integer query parameter
+    """
+    value = request.args.get(name, None)
+    return int(value) if value not in (None, "") else None
+
+
+@routes.route("/get-log-file")
+def get_log_file():
+    """
+    Stream a single log file for a SIP as plain text.
+
+    A part of the file can be retrieved using the HTTP 'Range' header, or
+    using the 'offset' and 'length' parameters. The 'tail' parameter
+    retrieves the given amount of bytes from the end of the file instead.
+    The total size of the file is returned in the 'X-Log-Size' header.
+
+    The response is compressed if the client accepts gzip encoding, unless
+    the 'Range' header is used.
+    """
+    sip_filename = request.args.get("sip_filename", None)
+    log_filename = request.args.get("log_filename", None)
+
+    museum_package = (
+        db.session.query(MuseumPackage)
+        .filter_by(sip_filename=sip_filename)
+        .first()
+    )
+    if not museum_package:
+        abort(404)
+
+    try:
+        path = get_log_path(museum_package, log_filename)
+    except FileNotFoundError:
+        abort(404)
+
+    size = path.stat().st_size
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "X-Log-Size": str(size),
+        # HTML reports are returned as plain text as well, so that they
+        # aren't rendered on the same origin as the application
+        "Content-Type": "text/plain; charset=utf-8",
+        "X-Content-Type-Options": "nosniff"
+    }
+
+    # Only single ranges are supported. Other Range headers are ignored.
+    byte_range = request.range
+    use_range_header = bool(byte_range and len(byte_range.ranges) == 1)
+
+    status = 200
+    if use_range_header:
+        range_for_length = byte_range.range_for_length(size)
+        if range_for_length is None:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status=416, headers=headers)
+
+        start, end = range_for_length
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    else:
+        # Parts requested using the query parameters are regular responses,
+        # since the parameters are already a part of the URL
+        try:
+            start, end = get_byte_range(
+                size,
+                offset=_get_int_arg("offset"),
+                length=_get_int_arg("length"),
+                tail=_get_int_arg("tail")
+            )
+        except ValueError as exc:
+            return jsonify({"success": False, "error": str(exc)}), 400
+
+    chunks = iter_file_range(path, start, end)
+
+    # Content-Encoding would change the meaning of the byte range requested
+    # using the Range header, so only compress other responses
+    if not use_range_header and "gzip" in request.accept_encodings:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    else:
+        headers["Content-Length"] = str(end - start)
+
+    return Response(chunks, status=status, headers=headers)
+
+
+@routes.route("/search-logs")
+def search_logs():
+    """
+    Search the log files of a SIP for lines containing a substring.
+
+    If 'log_filename' is not provided, all log files are searched. The
+    matching lines are streamed as newline-delimited JSON objects as they
+    are found, each including the given amount of 'context' lines before
+    and after the line. The last object summarizes the search, including
+    whether it was stopped early due to the configured time, byte or match
+    limits.
+    """
+    sip_filename = request.args.get("sip_filename", None)
+    log_filename = request.args.get("log_filename", None)
+    query = request.args.get("query", "")
+    ignore_case = to_bool(request.args.get("ignore_case", False))
+
+    try:
+        context_lines = int(request.args.get("context", 2))
+    except ValueError:
+        context_lines = -1
+
+    if not 0 <= context_lines <= current_app.config["LOG_SEARCH_MAX_CONTEXT"]:
+        return jsonify({
+            "success": False, "error": "Invalid amount of context lines"
+        }), 400
+
+    if not query:
+        return jsonify({"success": False, "error": "Query is required"}), 400
+
+    museum_package = (
+        db.session.query(MuseumPackage)
+        .filter_by(sip_filename=sip_filename)
+        .first()
+    )
+    if not museum_package:
+        abort(404)
+
+    if log_filename:
+        try:
+            paths = [get_log_path(museum_package, log_filename)]
+        except FileNotFoundError:
+            abort(404)
+    else:
+        paths = [
+            get_log_path(museum_package, filename)
+            for filename in get_log_filenames(museum_package)
+        ]
+
+    config = current_app.config
+    budget = SearchBudget(
+        time_limit=float(config["LOG_SEARCH_TIME_LIMIT"]),
+        byte_limit=int(config["LOG_SEARCH_BYTE_LIMIT"]),
+        max_matches=int(config["LOG_SEARCH_MAX_MATCHES"])
+    )
+
+    def generate():
+        match_count = 0
+        searched_filenames = []
+
+        for path in paths:
+            if budget.check():
+                break
+
+            searched_filenames.append(path.name)
+            for match in search_log_file(
+                    path, query, context_lines, budget,
+                    ignore_case=ignore_case):
+                match_count += 1
+                yield json.dumps(
+                    dict(match, type="match", log_filename=path.name)
+                ) + "\n"
+
+        yield json.dumps({
+            "type": "summary",
+            "match_count": match_count,
+            "searched_filenames": searched_filenames,
+            # Which limit stopped the search, if any
+            "limit_exceeded": budget.exceeded
+        }) + "\n"
+
+    return Response(
+        generate(),
+        mimetype="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
@@ -1,28 +1,22 @@
-from flask import Flask, current_app, g, redirect, request, url_for
+from flask import Flask, current_app, redirect, url_for
 from flask_security import (Security, SQLAlchemySessionUserDatastore,
                             current_user)
 from flask_wtf.csrf import CSRFProtect
 
 import rq_dashboard
 from flask_talisman import Talisman
-from passari_web_ui.commands import create_db
+from passari_web_ui.commands import (create_db, create_search_indexes,
+                                     index_rejections, refresh_stats,
+                                     run_worker)
 from passari_web_ui.config import get_flask_config
 from passari_web_ui.db import db
 from passari_web_ui.db.models import Role, User
-from passari_web_ui.ui.utils import get_system_status
-from passari_workflow.config import CONFIG as WORKFLOW_CONFIG
+from passari_web_ui.db.replica import REPLICA_BIND
+from passari_web_ui.profiling import init_profiling
+from passari_web_ui.redis_connection import get_redis_url, init_redis
 from passari_workflow.db.connection import get_connection_uri
 
 
-def add_system_status():
-    """
-    Add system status information to UI views
-    """
-    if request.path.startswith("/web-ui"):
-        # System status is only displayed in the web UI
-        g.system_status = get_system_status()
-
-
 def require_authentication():
     """
     Check that the user is authenticated
@@ -35,15 +29,11 @@ def register_rq_dashboard(app):
     """
     Install RQ dashboard into the web application
     """
-    redis_host = WORKFLOW_CONFIG["redis"]["host"]
-    redis_port = WORKFLOW_CONFIG["redis"]["port"]
-    redis_password = WORKFLOW_CONFIG["redis"]["password"]
-
     app.config.from_object(rq_dashboard.default_settings)
+    # rq-dashboard creates its own client from the URL, but uses the same
+    # connection options as the shared connection pool
     app.config.from_mapping({
-        "RQ_DASHBOARD_REDIS_URL": [
-            f"redis://:{redis_password}@{redis_host}:{redis_port}"
-        ]
+        "RQ_DASHBOARD_REDIS_URL": [get_redis_url(app.config)]
     })
 
     # We can't decorate rq_dashboard routes with the 'login_required'
@@ -75,22 +65,33 @@ def create_app():
     app.config["SQLALCHEMY_DATABASE_URI"] = get_connection_uri()
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    if app.config["READ_REPLICA_DATABASE_URI"]:
+        app.config["SQLALCHEMY_BINDS"] = {
+            REPLICA_BIND: app.config["READ_REPLICA_DATABASE_URI"]
+        }
+
     db.init_app(app)
+    init_redis(app)
 
     with app.app_context():
         init_security()
 
     # Register blueprints
     from passari_web_ui.api.views import routes as api_routes
+    from passari_web_ui.metrics import require_metrics_token
+    from passari_web_ui.metrics import routes as metrics_routes
     from passari_web_ui.ui.views import routes as ui_routes
 
     api_routes.before_request(require_authentication)
     ui_routes.before_request(require_authentication)
+    # Metrics are scraped using a token instead of a user session
+    metrics_routes.before_request(require_metrics_token)
 
-    app.before_request(add_system_status)
+    init_profiling(app)
 
     app.register_blueprint(api_routes, url_prefix="/api")
     app.register_blueprint(ui_routes, url_prefix="/web-ui")
+    app.register_blueprint(metrics_routes)
 
     register_rq_dashboard(app)
 
@@ -99,6 +100,10 @@ def create_app():
 
     # Register CLI commands
     app.cli.add_command(create_db)
+    app.cli.add_command(refresh_stats)
+    app.cli.add_command(create_search_indexes)
+    app.cli.add_command(index_rejections)
+    app.cli.add_command(run_worker)
 
     # Enable global CSRF
     CSRFProtect(app)
@@ -1,8 +1,20 @@
+import time
+
 import click
+from flask import current_app
 from flask.cli import with_appcontext
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
+from passari_web_ui.api.search import (SEARCH_INDEXES,
+                                       get_invalid_index_names,
+                                       is_trigram_extension_available)
 from passari_web_ui.db.models import Base
 from passari_web_ui.db import db
+from passari_web_ui.jobs import WebUIWorker, get_web_ui_queue
+from passari_web_ui.redis_connection import get_workflow_redis_connection
+from passari_web_ui.rejections import index_rejections as do_index_rejections
+from passari_web_ui.stats import update_stats
 
 
 @click.command(help="Create web UI database tables")
@@ -14,3 +26,163 @@ def create_db():
     print("Creating tables...")
     Base.metadata.create_all(db.engine)
     print("Done")
+
+
+@click.command(help="Refresh the statistics displayed in the web UI")
+@click.option(
+    "--interval", type=float, default=None,
+    help=(
+        "Seconds between refreshes. Defaults to the STATS_REFRESH_INTERVAL "
+        "configuration value."
+    )
+)
+@click.option(
+    "--once", is_flag=True, default=False,
+    help="Refresh the statistics once and exit"
+)
+@with_appcontext
+def refresh_stats(interval, once):
+    """
+    Compute the statistics used by the web UI and store them in Redis.
+
+    This is meant to be run as a long-lived process alongside the web
+    application, so that the statistics are never computed inside
+    HTTP requests.
+    """
+    if interval is None:
+        interval = float(current_app.config["STATS_REFRESH_INTERVAL"])
+
+    while True:
+        start = time.monotonic()
+
+        try:
+            update_stats()
+        except Exception:
+            if once:
+                raise
+
+            # Keep refreshing even if a single refresh fails, for example
+            # due to a temporary database connection issue
+            current_app.logger.exception("Could not refresh statistics")
+        finally:
+            # End the transaction so that the next refresh sees new data
+            db.session.remove()
+
+        if once:
+            break
+
+        time.sleep(max(interval - (time.monotonic() - start), 0))
+
+
+@click.command(help="Create indexes used for searching in the web UI")
+@click.option(
+    "--concurrently/--no-concurrently", default=True,
+    help=(
+        "Create the indexes without locking the tables against writes. "
+        "Enabled by default."
+    )
+)
+@with_appcontext
+def create_search_indexes(concurrently):
+    """
+    Create the trigram, full-text and ordering indexes used by the web UI
+    searches. Existing indexes are left untouched, except for invalid
+    indexes left behind by a failed concurrent build, which are rebuilt.
+
+    The trigram indexes require the 'pg_trgm' extension. If the extension
+    can't be created due to missing privileges, the trigram indexes are
+    skipped and searches keep working without them.
+    """
+    engine = db.engine.execution_options(isolation_level="AUTOCOMMIT")
+
+    with engine.connect() as connection:
+        try:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except SQLAlchemyError as exc:
+            print(f"Could not create the 'pg_trgm' extension: {exc}")
+
+    trigram_available = is_trigram_extension_available()
+    if not trigram_available:
+        print(
+            "The 'pg_trgm' extension is not available, skipping trigram "
+            "indexes"
+        )
+
+    invalid_names = get_invalid_index_names()
+
+    # CREATE INDEX CONCURRENTLY can't be run inside a transaction
+    with engine.connect() as connection:
+        for index in SEARCH_INDEXES:
+            if index.kind == "trigram" and not trigram_available:
+                continue
+
+            if index.name in invalid_names:
+                # 'IF NOT EXISTS' would skip the invalid index
+                print(f"Index {index.name} is invalid, dropping it...")
+                connection.execute(text(
+                    "DROP INDEX {concurrently} IF EXISTS {name}".format(
+                        concurrently="CONCURRENTLY" if concurrently else "",
+                        name=index.name
+                    )
+                ))
+
+            print(f"Creating index {index.name}...")
+            connection.execute(text(
+                "CREATE INDEX {concurrently} IF NOT EXISTS {name} "
+                "ON {table} USING {method} ({expression})".format(
+                    concurrently="CONCURRENTLY" if concurrently else "",
+                    name=index.name,
+                    table=index.table,
+                    method=index.method,
+                    expression=index.expression
+                )
+            ))
+            connection.execute(text(f"ANALYZE {index.table}"))
+
+    print("Done")
+
+
+@click.command(help="Index the errors of rejected SIPs")
+@click.option(
+    "--full", is_flag=True, default=False,
+    help=(
+        "Clear the index and index all rejected SIPs instead of only the "
+        "SIPs that haven't been indexed yet"
+    )
+)
+@click.option(
+    "--batch-size", type=int, default=100,
+    help="How many SIPs to index in a single transaction"
+)
+@with_appcontext
+def index_rejections(full, batch_size):
+    """
+    Extract the error signatures from the logs of rejected SIPs for the
+    'Rejection statistics' page
+    """
+    print("Indexing rejected SIPs...")
+    package_count, rejection_count = do_index_rejections(
+        full=full, batch_size=batch_size
+    )
+    print(f"Indexed {package_count} SIP(s) with {rejection_count} error(s)")
+
+
+@click.command(help="Run a worker for web UI background jobs")
+@click.option(
+    "--burst", is_flag=True, default=False,
+    help="Exit once all queued jobs have been processed"
+)
+@with_appcontext
+def run_worker(burst):
+    """
+    Process background jobs enqueued by the web UI, such as bulk
+    re-enqueues.
+
+    Jobs are run in the worker process itself instead of a forked process,
+    so that they can use the application and its database connections.
+    Each job is run in its own application context.
+    """
+    # Waiting for jobs blocks for longer than the socket timeout of the
+    # shared connection pool, so use a separate connection
+    queue = get_web_ui_queue(connection=get_workflow_redis_connection())
+    WebUIWorker([queue], connection=queue.connection).work(burst=burst)
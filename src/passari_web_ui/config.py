@@ -34,6 +34,27 @@ HEARTBEAT_INTERVAL_SYNC_OBJECTS=176400
 HEARTBEAT_INTERVAL_SYNC_ATTACHMENTS=176400
 # 24 hours (expected) + 1 hour
 HEARTBEAT_INTERVAL_SYNC_HASHES=90000
+
+# How long the cached statistics are considered fresh (TTL) and how long
+# stale statistics can be displayed while they are being refreshed (GRACE)
+# in seconds
+API_CACHE_OVERVIEW_STATS_TTL=2
+API_CACHE_OVERVIEW_STATS_GRACE=30
+API_CACHE_NAVBAR_STATS_TTL=2
+API_CACHE_NAVBAR_STATS_GRACE=30
+
+# Search backend for object titles and freeze reasons. Either 'ilike' for
+# substring search or 'fulltext' for word search. 'fulltext' requires the
+# indexes created using 'flask create-search-indexes'.
+SEARCH_BACKEND="ilike"
+
+# Bearer token for scraping Prometheus metrics from '/metrics'. Replace this
+# with a random string to enable the endpoint.
+METRICS_TOKEN=''
+
+# Connection URI of an optional PostgreSQL read replica used for read-only
+# pages and API endpoints
+READ_REPLICA_DATABASE_URI=''
 """[1:]
 
 
@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, orm
+
+from passari_web_ui.db.replica import RoutingSession
 
 convention = {
     "ix": 'ix_%(column_0_label)s',
@@ -9,5 +11,15 @@ convention = {
     "pk": "pk_%(table_name)s"
 }
 
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """
+    Flask-SQLAlchemy extension that can route read-only queries to a read
+    replica
+    """
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
 metadata = MetaData(naming_convention=convention)
-db = SQLAlchemy(metadata=metadata)
+db = RoutingSQLAlchemy(metadata=metadata)
@@ -1,7 +1,8 @@
 """
-Simple database models used for authentication
+Simple database models used for authentication and for indexing data
+displayed in the web UI
 
-Based mostly on Flask-Security tutorial:
+Authentication models are based mostly on Flask-Security tutorial:
 https://pythonhosted.org/Flask-Security/quickstart.html
 
 These are kept separate from the workflow tables (eg. no relations between
@@ -10,7 +11,8 @@ authentication tables and the workflow tables). If we wanted to add relations,
 into `passari-workflow` to keep migrations under one repository.
 """
 from flask_security import RoleMixin, UserMixin
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Integer,
+                        String, Text, UniqueConstraint)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import backref, relationship
 
@@ -52,3 +54,60 @@ class User(Base, UserMixin):
     confirmed_at = Column(DateTime())
     roles = relationship('Role', secondary='roles_users',
                          backref=backref('users', lazy='dynamic'))
+
+
+class RejectionSignature(Base):
+    """
+    Normalized error message found in the logs of rejected SIPs
+    """
+    __tablename__ = 'rejection_signature'
+
+    id = Column(Integer, primary_key=True)
+    # Error message with variable parts such as numbers and paths replaced
+    signature = Column(Text, unique=True, nullable=False)
+    # Original error message from the first package the signature was
+    # found in
+    example = Column(Text, nullable=False)
+
+
+class IndexedRejectedPackage(Base):
+    """
+    Rejected SIP that has been processed by the rejection indexer.
+
+    The package ID refers to the 'museum_packages' workflow table, but
+    no foreign key is used to keep the tables separate.
+    """
+    __tablename__ = 'indexed_rejected_package'
+
+    package_id = Column(Integer, primary_key=True, autoincrement=False)
+    indexed_date = Column(DateTime(timezone=True), nullable=False)
+
+    rejections = relationship(
+        'PackageRejection', back_populates='indexed_package',
+        cascade='all, delete-orphan'
+    )
+
+
+class PackageRejection(Base):
+    """
+    Occurrence of a rejection signature in a rejected SIP
+    """
+    __tablename__ = 'package_rejection'
+    __table_args__ = (UniqueConstraint('package_id', 'signature_id'),)
+
+    id = Column(Integer, primary_key=True)
+    package_id = Column(
+        Integer, ForeignKey('indexed_rejected_package.package_id'),
+        nullable=False, index=True
+    )
+    signature_id = Column(
+        Integer, ForeignKey('rejection_signature.id'), nullable=False,
+        index=True
+    )
+    log_filename = Column(String(255), nullable=False)
+    line_number = Column(Integer, nullable=False)
+
+    indexed_package = relationship(
+        'IndexedRejectedPackage', back_populates='rejections'
+    )
+    signature = relationship('RejectionSignature')
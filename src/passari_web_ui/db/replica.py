@@ -0,0 +1,121 @@
+"""
+Routing of read-only queries to an optional PostgreSQL read replica.
+
+Views decorated with `read_replica` run their queries against the replica
+configured in READ_REPLICA_DATABASE_URI when handling GET requests. Other
+views, flushes and queries made outside requests use the primary database.
+
+Views fall back to the primary database if the replica can't be reached or
+if it lags behind the primary by more than READ_REPLICA_MAX_LAG seconds. The
+lag is checked at most once every READ_REPLICA_LAG_CHECK_INTERVAL seconds in
+each process.
+"""
+import functools
+import time
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy import SignallingSession, get_state
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Name of the Flask-SQLAlchemy bind for the replica
+REPLICA_BIND = "replica"
+
+# Seconds since the latest transaction replayed by the replica, or 0 if the
+# database is not a replica. NULL if no transaction has been replayed yet.
+#
+# Only the replay timestamp is used, since the WAL location functions were
+# renamed in PostgreSQL 10 and a replica whose WAL receiver has stopped would
+# otherwise appear to be up to date. As a result, the lag also grows while
+# the primary receives no writes, in which case the primary is used.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "  WHEN NOT pg_is_in_recovery() THEN 0 "
+    "  ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+    "END"
+)
+
+
+def get_replica_engine():
+    """
+    Get the engine for the read replica
+    """
+    app = current_app._get_current_object()
+
+    return get_state(app).db.get_engine(app, bind=REPLICA_BIND)
+
+
+def get_replica_lag():
+    """
+    Get the replication lag of the read replica in seconds
+
+    :returns: Lag in seconds, or None if the replica can't be reached or
+              the lag is unknown
+    """
+    try:
+        with get_replica_engine().connect() as connection:
+            lag = connection.execute(REPLICA_LAG_QUERY).scalar()
+    except SQLAlchemyError:
+        current_app.logger.warning(
+            "Could not check read replica lag, using primary database",
+            exc_info=True
+        )
+        return None
+
+    return float(lag) if lag is not None else None
+
+
+def is_replica_available():
+    """
+    Check whether a read replica is configured and is not lagging behind
+    by more than READ_REPLICA_MAX_LAG seconds
+    """
+    config = current_app.config
+    if not config["READ_REPLICA_DATABASE_URI"]:
+        return False
+
+    cache = current_app.extensions.setdefault("replica_lag_cache", {})
+    interval = float(config["READ_REPLICA_LAG_CHECK_INTERVAL"])
+    now = time.monotonic()
+
+    if "lag" not in cache or now - cache["checked_at"] >= interval:
+        cache["lag"] = get_replica_lag()
+        cache["checked_at"] = now
+
+    lag = cache["lag"]
+
+    return lag is not None and lag <= float(config["READ_REPLICA_MAX_LAG"])
+
+
+def read_replica(func):
+    """
+    Decorator for views that only read from the database. Queries made
+    during GET requests are sent to the read replica if it's available.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if request.method in ("GET", "HEAD") and is_replica_available():
+            g.use_read_replica = True
+
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+class RoutingSession(SignallingSession):
+    """
+    Session that sends queries to the read replica in views decorated with
+    `read_replica`. Flushes always use the primary database.
+    """
+    def get_bind(self, mapper=None, clause=None):
+        use_replica = (
+            has_app_context()
+            and g.get("use_read_replica", False)
+            and not self._flushing
+        )
+        if use_replica:
+            return get_state(self.app).db.get_engine(
+                self.app, bind=REPLICA_BIND
+            )
+
+        return super().get_bind(mapper=mapper, clause=clause)
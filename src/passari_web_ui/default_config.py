@@ -1,2 +1,106 @@
 # Enable 'Change password' page
 SECURITY_CHANGEABLE = True
+
+# How often the statistics are refreshed by the 'refresh-stats' command
+# in seconds. This should be shorter than the TTL of the cached statistics.
+STATS_REFRESH_INTERVAL = 1
+
+# How long cached API responses are considered fresh in seconds, and how long
+# stale responses can be served afterwards while a new response is being
+# computed. These can be overridden for individual cached responses using
+# API_CACHE_<NAME>_TTL and API_CACHE_<NAME>_GRACE (eg.
+# API_CACHE_OVERVIEW_STATS_TTL).
+API_CACHE_TTL = 2
+API_CACHE_GRACE = 30
+
+# How long a worker can hold the lock for recomputing a cached response
+# in seconds
+API_CACHE_LOCK_TIMEOUT = 10
+
+# The freeze reasons used for auto-completion are invalidated when objects
+# are frozen or unfrozen using the web UI, so they can be cached for longer
+API_CACHE_FREEZE_REASONS_TTL = 300
+
+# The amount of objects available for enqueuing displayed in the 'Enqueue
+# objects' page is recomputed at most this often in seconds. The count is
+# also invalidated when objects are enqueued using the web UI.
+API_CACHE_AVAILABLE_OBJECT_COUNT_TTL = 30
+
+# How long heartbeats used for the system status are cached in each process
+# in seconds
+HEARTBEAT_CACHE_TTL = 10
+
+# Push the statistics to the browser using server-sent events instead of
+# polling. Each open stream reserves a worker thread for up to
+# STATS_STREAM_MAX_DURATION seconds, after which the browser reconnects,
+# so only enable this if the application server runs enough threads or
+# uses gevent workers.
+STATS_STREAM_ENABLED = False
+STATS_STREAM_INTERVAL = 1
+STATS_STREAM_MAX_DURATION = 300
+
+# Size of the Redis connection pool shared by the requests of each process,
+# and the timeouts and health check interval of the connections in seconds
+REDIS_MAX_CONNECTIONS = 50
+REDIS_SOCKET_TIMEOUT = 10
+REDIS_SOCKET_CONNECT_TIMEOUT = 5
+REDIS_HEALTH_CHECK_INTERVAL = 30
+
+# Connection URI of an optional PostgreSQL read replica. Read-only pages and
+# API endpoints query the replica instead of the primary database, unless
+# the replica can't be reached or lags behind the primary by more than
+# READ_REPLICA_MAX_LAG seconds. The lag is checked at most once every
+# READ_REPLICA_LAG_CHECK_INTERVAL seconds in each process.
+READ_REPLICA_DATABASE_URI = None
+READ_REPLICA_MAX_LAG = 10
+READ_REPLICA_LAG_CHECK_INTERVAL = 5
+
+# Bearer token required for scraping the Prometheus metrics from '/metrics'.
+# The endpoint is disabled if no token is configured.
+METRICS_TOKEN = None
+
+# Calculate the throughput of each workflow step and the projected time to
+# process the backlog over this many seconds of recorded statistics
+STATS_THROUGHPUT_WINDOW = 3600
+
+# Search result counts are estimated instead of counted exactly if the
+# estimated amount of results exceeds this value
+EXACT_COUNT_THRESHOLD = 10000
+
+# Search backend used for free-text fields such as object titles. 'ilike'
+# searches for substrings, 'fulltext' searches for words using PostgreSQL
+# full-text search. 'fulltext' requires the indexes created using the
+# 'create-search-indexes' command and falls back to 'ilike' without them.
+SEARCH_BACKEND = "ilike"
+
+# Limits for searching SIP log files. The search is stopped once it has run
+# for LOG_SEARCH_TIME_LIMIT seconds, read LOG_SEARCH_BYTE_LIMIT bytes or found
+# LOG_SEARCH_MAX_MATCHES matching lines.
+LOG_SEARCH_TIME_LIMIT = 10
+LOG_SEARCH_BYTE_LIMIT = 2 * 1024 * 1024 * 1024
+LOG_SEARCH_MAX_MATCHES = 500
+# Maximum amount of context lines displayed before and after each match
+LOG_SEARCH_MAX_CONTEXT = 10
+
+# Regular expression for finding error lines in the logs of rejected SIPs.
+# The expression is case-insensitive.
+REJECTION_ERROR_PATTERN = r"\b(error|critical|fatal|failed|failure)\b"
+
+# Amount of entries displayed per page in the rejection statistics
+REJECTION_STATISTICS_PAGE_SIZE = 50
+
+# Maximum run time of web UI background jobs and how long their results are
+# kept afterwards in seconds
+WEB_UI_JOB_TIMEOUT = 3600
+WEB_UI_JOB_RESULT_TTL = 86400
+
+# Re-enqueue, freeze or unfreeze up to this many objects at once inside
+# the request. Larger amounts are processed in a background job.
+BULK_OPERATION_SYNC_LIMIT = 50
+
+# Record the amount and duration of SQL queries and Redis commands for each
+# request. The timings are returned in the 'Server-Timing' header and the
+# most recent PROFILING_SAMPLE_SIZE requests of each endpoint are used to
+# calculate the percentiles in the 'Request profiling' page.
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_SIZE = 1000
@@ -0,0 +1,65 @@
+"""
+Catalogue of the reasons used for freezing objects.
+
+The reasons and the amount of objects frozen with each reason are cached
+in Redis, so that auto-completing a freeze reason doesn't require grouping
+all frozen objects. The cache is invalidated when objects are frozen or
+unfrozen through the web UI, and otherwise expires after
+API_CACHE_FREEZE_REASONS_TTL seconds.
+"""
+from sqlalchemy import func
+
+from passari_web_ui.api.cache import delete_cache_entry, get_cached
+from passari_web_ui.db import db
+from passari_workflow.db.models import MuseumObject
+
+CACHE_NAME = "freeze_reasons"
+
+
+def get_freeze_reason_counts():
+    """
+    Get each freeze reason and the amount of frozen objects using it
+
+    :returns: List of [reason, count] lists in descending order of count
+    """
+    object_count = func.count(MuseumObject.id)
+    results = (
+        db.session.query(MuseumObject.freeze_reason, object_count)
+        .filter(MuseumObject.frozen == True)
+        .filter(MuseumObject.freeze_reason != None)
+        .group_by(MuseumObject.freeze_reason)
+        .order_by(object_count.desc(), MuseumObject.freeze_reason)
+        .all()
+    )
+
+    return [[reason, count] for reason, count in results]
+
+
+def search_freeze_reasons(prefix, limit=10):
+    """
+    Find the most used freeze reasons starting with the given prefix.
+    The prefix is case-insensitive.
+
+    :returns: List of (reason, count) tuples in descending order of count
+    """
+    prefix = prefix.strip().lower()
+    reason_counts = get_cached(CACHE_NAME, get_freeze_reason_counts).data
+
+    results = []
+    for reason, count in reason_counts:
+        if reason.lower().startswith(prefix):
+            results.append((reason, count))
+
+            if len(results) >= limit:
+                break
+
+    return results
+
+
+def invalidate_freeze_reasons():
+    """
+    Invalidate the cached freeze reasons after objects have been frozen or
+    unfrozen. Freeze reasons that are being computed at the same time are
+    not cached.
+    """
+    delete_cache_entry(CACHE_NAME)
@@ -0,0 +1,295 @@
+"""
+Background jobs for operations that are too slow to run inside a request.
+
+The jobs are placed in a separate RQ queue from the workflow queues and are
+processed by the `flask run-worker` command. Each job reports its progress
+in the job metadata, which is returned by the `/api/job-status/<job_id>`
+endpoint. Job results are dictionaries containing a summary in 'message'
+and optionally per-object error messages in 'errors'.
+"""
+from flask import current_app
+from rq import Queue, SimpleWorker, get_current_job
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+from sqlalchemy import text
+
+from passari_web_ui.db import db
+from passari_web_ui.freeze_reasons import invalidate_freeze_reasons
+from passari_web_ui.redis_connection import get_redis_connection
+from passari_web_ui.ui.utils import iter_object_id_chunks
+from passari_workflow.db.models import (FreezeSource, MuseumObject,
+                                        MuseumPackage)
+from passari_workflow.scripts.freeze_objects import \
+    freeze_objects as do_freeze_objects
+from passari_workflow.scripts.reenqueue_object import \
+    reenqueue_object as do_reenqueue_object
+from passari_workflow.scripts.unfreeze_objects import \
+    unfreeze_objects as do_unfreeze_objects
+
+# Name of the RQ queue used for web UI jobs
+QUEUE_NAME = "web_ui"
+
+# Maximum amount of per-object errors stored in a job result
+MAX_REPORTED_ERRORS = 100
+
+
+def get_web_ui_queue(connection=None):
+    """
+    Get the RQ queue used for web UI jobs
+
+    :param connection: Redis connection to use instead of the shared
+                       connection pool
+    """
+    if connection is None:
+        connection = get_redis_connection()
+
+    return Queue(QUEUE_NAME, connection=connection)
+
+
+class WebUIWorker(SimpleWorker):
+    """
+    Worker that runs each job in the worker process itself, using a fresh
+    application context for each job.
+
+    The database session is removed after each job, so that the connection
+    is returned to the pool instead of staying idle in a transaction while
+    the worker waits for the next job.
+    """
+    def perform_job(self, *args, **kwargs):
+        with current_app.app_context():
+            try:
+                return super().perform_job(*args, **kwargs)
+            finally:
+                db.session.remove()
+
+
+def enqueue_job(func, *args, description=None, **kwargs):
+    """
+    Enqueue a web UI job
+
+    :returns: Job instance
+    """
+    config = current_app.config
+
+    return get_web_ui_queue().enqueue(
+        func, *args,
+        job_timeout=config["WEB_UI_JOB_TIMEOUT"],
+        # Keep the result around so that it can be displayed after
+        # the job has finished
+        result_ttl=config["WEB_UI_JOB_RESULT_TTL"],
+        description=description,
+        **kwargs
+    )
+
+
+def get_job(job_id):
+    """
+    Get a web UI job
+
+    :returns: Job instance, or None if the job doesn't exist or isn't
+              a web UI job
+    """
+    try:
+        job = Job.fetch(job_id, connection=get_redis_connection())
+    except NoSuchJobError:
+        return None
+
+    if job.origin != QUEUE_NAME:
+        return None
+
+    return job
+
+
+def update_progress(done, total):
+    """
+    Report the progress of the current job. Does nothing when not called
+    from a job.
+    """
+    job = get_current_job()
+
+    if job:
+        job.meta["progress"] = {"done": done, "total": total}
+        job.save_meta()
+
+
+def get_job_status(job):
+    """
+    Get the status of a job as a JSON serializable dict
+    """
+    status = job.get_status()
+    progress = job.meta.get("progress", {"done": 0, "total": None})
+
+    result = {
+        "id": job.id,
+        "description": job.description,
+        "status": status,
+        "progress": progress,
+        "result": job.result if status == "finished" else None,
+        "error": None
+    }
+
+    if status == "failed" and job.exc_info:
+        # Only return the last line of the traceback, which contains
+        # the exception message
+        result["error"] = job.exc_info.strip().split("\n")[-1]
+
+    return result
+
+
+def _add_error(errors, object_id, message):
+    if len(errors) < MAX_REPORTED_ERRORS:
+        errors[str(object_id)] = message
+
+
+def get_unreenqueueable_object_ids(object_ids):
+    """
+    Find the objects that can't be re-enqueued, either because they don't
+    exist or because their latest packages weren't rejected.
+
+    The IDs are sent in chunks in the same way as in
+    `get_missing_object_ids`.
+
+    :returns: Tuple of (missing_object_ids, not_rejected_object_ids) as
+              sorted lists
+    """
+    object_table = MuseumObject.__table__.name
+    package_table = MuseumPackage.__table__.name
+    query = text(
+        f"SELECT ids.id, obj.id IS NULL AS missing "
+        f"FROM unnest(CAST(:object_ids AS bigint[])) AS ids(id) "
+        f"LEFT JOIN {object_table} AS obj ON obj.id = ids.id "
+        f"LEFT JOIN {package_table} AS pkg "
+        f"  ON pkg.id = obj.latest_package_id "
+        f"WHERE obj.id IS NULL OR pkg.rejected IS NOT TRUE"
+    )
+
+    missing_object_ids = []
+    not_rejected_object_ids = []
+    for chunk in iter_object_id_chunks(object_ids):
+        for result in db.session.execute(query, {"object_ids": chunk}):
+            if result.missing:
+                missing_object_ids.append(result.id)
+            else:
+                not_rejected_object_ids.append(result.id)
+
+    return sorted(missing_object_ids), sorted(not_rejected_object_ids)
+
+
+def reenqueue_objects(object_ids, batch_size=100):
+    """
+    Re-enqueue multiple rejected objects.
+
+    The progress is reported after each batch of objects.
+
+    :returns: Dictionary containing a summary in 'message', the amount of
+              re-enqueued objects in 'count', the amount of failed objects
+              in 'error_count' and up to MAX_REPORTED_ERRORS error messages
+              in 'errors'
+    """
+    count = 0
+    error_count = 0
+    errors = {}
+
+    update_progress(0, len(object_ids))
+
+    for i in range(0, len(object_ids), batch_size):
+        for object_id in object_ids[i:i+batch_size]:
+            try:
+                do_reenqueue_object(object_id)
+                count += 1
+            except ValueError as exc:
+                # Object was re-enqueued or its package was cancelled after
+                # the objects were validated
+                error_count += 1
+                _add_error(errors, object_id, str(exc))
+
+        update_progress(min(i + batch_size, len(object_ids)), len(object_ids))
+
+    return {
+        "message": (
+            f"{count} object(s) were re-enqueued, "
+            f"{error_count} object(s) could not be re-enqueued."
+        ),
+        "count": count,
+        "error_count": error_count,
+        "errors": errors
+    }
+
+
+def freeze_objects(object_ids, reason):
+    """
+    Freeze multiple objects with the given reason.
+
+    The objects are frozen in a single call, since freezing is refused
+    altogether if any of the objects have running workflow jobs.
+
+    :raises WorkflowJobRunningError: If any of the objects have running
+                                     workflow jobs
+    :returns: Dictionary containing a summary in 'message', the amount of
+              frozen objects in 'count' and the amount of cancelled packages
+              in 'cancel_count'
+    """
+    update_progress(0, len(object_ids))
+
+    frozen_count, cancel_count = do_freeze_objects(
+        reason=reason,
+        object_ids=object_ids,
+        source=FreezeSource.USER
+    )
+
+    update_progress(len(object_ids), len(object_ids))
+    invalidate_freeze_reasons()
+
+    return {
+        "message": (
+            f"{frozen_count} object(s) were frozen, "
+            f"{cancel_count} package(s) were cancelled."
+        ),
+        "count": frozen_count,
+        "cancel_count": cancel_count
+    }
+
+
+def get_frozen_object_ids(reason):
+    """
+    Get the IDs of objects frozen with the given reason
+    """
+    return [
+        result.id for result in
+        db.session.query(MuseumObject.id)
+        .filter(MuseumObject.frozen)
+        .filter(MuseumObject.freeze_reason == reason)
+        .order_by(MuseumObject.id)
+    ]
+
+
+def unfreeze_objects(reason, enqueue=False, batch_size=100):
+    """
+    Unfreeze all objects frozen with the given reason.
+
+    The objects are unfrozen and optionally enqueued in batches, and the
+    progress is reported after each batch.
+
+    :returns: Dictionary containing a summary in 'message' and the amount of
+              unfrozen objects in 'count'
+    """
+    object_ids = get_frozen_object_ids(reason)
+    count = 0
+
+    update_progress(0, len(object_ids))
+
+    for i in range(0, len(object_ids), batch_size):
+        count += do_unfreeze_objects(
+            reason=reason,
+            object_ids=object_ids[i:i+batch_size],
+            enqueue=enqueue
+        )
+
+        update_progress(min(i + batch_size, len(object_ids)), len(object_ids))
+
+    invalidate_freeze_reasons()
+
+    return {
+        "message": f"{count} object(s) were unfrozen.",
+        "count": count
+    }
@@ -0,0 +1,236 @@
+"""
+Prometheus metrics endpoint.
+
+The metrics are served in the Prometheus text exposition format from the
+same cached statistics and heartbeats that are displayed in the web UI, so
+scraping the endpoint doesn't cause additional database queries while the
+statistics are kept fresh by `flask refresh-stats`.
+
+The endpoint is authenticated using a static bearer token configured in
+METRICS_TOKEN instead of a user session, and is disabled if no token is
+configured.
+"""
+import hmac
+import time
+
+from flask import Blueprint, Response, abort, current_app, request
+
+from passari_web_ui.api.cache import get_cache_counters, get_cached
+from passari_web_ui.redis_connection import get_pool_stats
+from passari_web_ui.stats import STATS_FUNCS
+from passari_web_ui.ui.utils import get_system_status
+from passari_workflow.heartbeat import HeartbeatSource
+
+routes = Blueprint("metrics", __name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def require_metrics_token():
+    """
+    Check that the request contains the bearer token configured in
+    METRICS_TOKEN
+    """
+    token = current_app.config["METRICS_TOKEN"]
+    if not token:
+        abort(404)
+
+    auth_type, _, auth_token = \
+        request.headers.get("Authorization", "").partition(" ")
+
+    authorized = (
+        auth_type.lower() == "bearer"
+        and hmac.compare_digest(auth_token.encode("utf-8"),
+                                token.encode("utf-8"))
+    )
+    if not authorized:
+        return Response(
+            "Unauthorized\n", status=401, mimetype="text/plain",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    return None
+
+
+def _escape_label_value(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+class MetricsWriter:
+    """
+    Writer for metrics in the Prometheus text exposition format
+    """
+    def __init__(self):
+        self.lines = []
+
+    def add_metric(self, name, help_text, samples, metric_type="gauge"):
+        """
+        Add a metric
+
+        :param name: Name of the metric
+        :param help_text: Description of the metric
+        :param samples: List of (labels, value) tuples, where 'labels'
+                        is a dict
+        :param metric_type: Prometheus metric type
+        """
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+
+        for labels, value in samples:
+            if labels:
+                label_str = ",".join(
+                    f'{key}="{_escape_label_value(label_value)}"'
+                    for key, label_value in labels.items()
+                )
+                self.lines.append(f"{name}{{{label_str}}} {value}")
+            else:
+                self.lines.append(f"{name} {value}")
+
+    def to_text(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def _add_stats_metrics(writer):
+    now = time.time()
+    overview_entry = get_cached(
+        "overview_stats", STATS_FUNCS["overview_stats"]
+    )
+    navbar_entry = get_cached("navbar_stats", STATS_FUNCS["navbar_stats"])
+
+    overview_stats = overview_entry.data
+    navbar_stats = navbar_entry.data
+
+    writer.add_metric(
+        "passari_objects",
+        "Amount of objects",
+        [({}, overview_stats["total_count"])]
+    )
+    writer.add_metric(
+        "passari_objects_by_state",
+        "Amount of objects in each workflow state",
+        [
+            ({"state": state}, entry["count"])
+            for state, entry in overview_stats["steps"].items()
+        ]
+    )
+    writer.add_metric(
+        "passari_queue_jobs",
+        "Amount of pending and processing jobs in each workflow queue",
+        [
+            ({"queue": queue_name, "status": status}, counts[status])
+            for queue_name, counts in navbar_stats["queues"].items()
+            for status in ("pending", "processing")
+        ]
+    )
+    writer.add_metric(
+        "passari_failed_jobs",
+        "Amount of failed jobs in all workflow queues",
+        [({}, navbar_stats["failed"])]
+    )
+    writer.add_metric(
+        "passari_stats_age_seconds",
+        "Age of the cached statistics the other metrics are based on",
+        [
+            ({"stats": "overview_stats"},
+             max(now - overview_entry.generated_at, 0)),
+            ({"stats": "navbar_stats"},
+             max(now - navbar_entry.generated_at, 0))
+        ]
+    )
+
+
+def _add_heartbeat_metrics(writer):
+    now = time.time()
+    system_status = get_system_status()
+
+    age_samples = []
+    interval_samples = []
+    overdue_samples = []
+
+    for source in HeartbeatSource:
+        labels = {"source": source.value}
+        timestamp = system_status.heartbeats[source]
+
+        # Procedures that have never been run have no age
+        if timestamp:
+            age_samples.append((labels, now - timestamp.timestamp()))
+
+        interval_samples.append((
+            labels,
+            system_status.get_heartbeat_interval(source).total_seconds()
+        ))
+        overdue_samples.append((
+            labels,
+            int(system_status.is_heartbeat_recent(source) is False)
+        ))
+
+    writer.add_metric(
+        "passari_heartbeat_age_seconds",
+        "Time since the latest heartbeat of each automated procedure",
+        age_samples
+    )
+    writer.add_metric(
+        "passari_heartbeat_interval_seconds",
+        "Expected heartbeat interval of each automated procedure",
+        interval_samples
+    )
+    writer.add_metric(
+        "passari_heartbeat_overdue",
+        "Whether the latest heartbeat of each automated procedure is overdue",
+        overdue_samples
+    )
+
+
+def _add_redis_pool_metrics(writer):
+    pool_stats = get_pool_stats()
+
+    writer.add_metric(
+        "passari_web_ui_redis_pool_connections",
+        "Amount of connections in the Redis connection pool of the process "
+        "serving the request",
+        [
+            ({"state": "in_use"}, pool_stats["in_use"]),
+            ({"state": "available"}, pool_stats["available"])
+        ]
+    )
+    writer.add_metric(
+        "passari_web_ui_redis_pool_max_connections",
+        "Maximum amount of connections in the Redis connection pool",
+        [({}, pool_stats["max"])]
+    )
+
+
+def _add_cache_metrics(writer):
+    counters = get_cache_counters()
+
+    writer.add_metric(
+        "passari_web_ui_api_cache_events_total",
+        "Amount of hits, misses, stale entries served and recomputations of "
+        "each cached API response in all processes",
+        [
+            ({"cache": name, "event": event}, count)
+            for name, name_counters in sorted(counters.items())
+            for event, count in sorted(name_counters.items())
+        ],
+        metric_type="counter"
+    )
+
+
+@routes.route("/metrics")
+def metrics():
+    """
+    Retrieve the workflow statistics and heartbeats in the Prometheus text
+    exposition format
+    """
+    writer = MetricsWriter()
+    _add_stats_metrics(writer)
+    _add_heartbeat_metrics(writer)
+    _add_redis_pool_metrics(writer)
+    _add_cache_metrics(writer)
+
+    return Response(writer.to_text(), content_type=CONTENT_TYPE)
@@ -0,0 +1,274 @@
+"""
+Opt-in instrumentation of SQL queries and Redis commands.
+
+When PROFILING_ENABLED is set, the amount and duration of SQL queries and
+Redis commands are recorded for each request and returned in the
+'Server-Timing' response header. The timings of the most recent
+PROFILING_SAMPLE_SIZE requests of each endpoint are stored in Redis, so that
+percentiles can be calculated over all application processes in the
+'Request profiling' page.
+"""
+import json
+import threading
+import time
+
+from flask import current_app, g, has_app_context, request
+from redis.client import Pipeline, Redis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from passari_web_ui.redis_connection import get_redis_connection
+
+# Redis key prefix for the stored request timings of each endpoint
+SAMPLES_KEY_PREFIX = "web_ui_profiling:samples:"
+
+# Redis set containing the names of the profiled endpoints
+ENDPOINTS_KEY = "web_ui_profiling:endpoints"
+
+# Endpoints that are not profiled. Streaming responses are only finished
+# after the request has been processed.
+EXCLUDED_ENDPOINTS = (
+    "static", "ui.static", "api.stats_stream", "api.export_frozen_objects",
+    "api.export_sips", "api.get_log_file", "api.search_logs"
+)
+
+# Timings stored for each request, in this order
+SAMPLE_FIELDS = ("total", "db_time", "db_count", "redis_time", "redis_count")
+
+PERCENTILES = (50, 95, 99)
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+class RequestProfile:
+    """
+    SQL and Redis timings of a single request
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_count = 0
+        self.db_time = 0.0
+        self.redis_count = 0
+        self.redis_time = 0.0
+
+    def add_query(self, duration):
+        self.db_count += 1
+        self.db_time += duration
+
+    def add_redis_commands(self, count, duration):
+        self.redis_count += count
+        self.redis_time += duration
+
+    def get_sample(self):
+        """
+        Get the timings in milliseconds as a list in the order of
+        SAMPLE_FIELDS
+        """
+        return [
+            (time.perf_counter() - self.start) * 1000,
+            self.db_time * 1000,
+            self.db_count,
+            self.redis_time * 1000,
+            self.redis_count
+        ]
+
+
+def _get_current_profile():
+    if not has_app_context():
+        return None
+
+    return g.get("request_profile", None)
+
+
+def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        # Query was started before the instrumentation was installed
+        return
+
+    start = start_times.pop()
+    profile = _get_current_profile()
+
+    if profile:
+        profile.add_query(time.perf_counter() - start)
+
+
+def _wrap_redis_method(method, get_count):
+    def wrapper(self, *args, **kwargs):
+        profile = _get_current_profile()
+        if not profile:
+            return method(self, *args, **kwargs)
+
+        count = get_count(self)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile.add_redis_commands(count, time.perf_counter() - start)
+
+    return wrapper
+
+
+def install_instrumentation():
+    """
+    Install the SQLAlchemy event listeners and Redis client wrappers.
+
+    The instrumentation is installed once per process when the first
+    request is profiled, and only records timings during requests that are
+    being profiled.
+    """
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+
+        _install_hooks()
+        _installed = True
+
+
+def _install_hooks():
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    # Pipelines buffer the commands and send them in 'execute', while
+    # other commands are sent in 'execute_command'
+    Redis.execute_command = _wrap_redis_method(
+        Redis.execute_command, lambda client: 1
+    )
+    Pipeline.execute = _wrap_redis_method(
+        Pipeline.execute, lambda pipeline: len(pipeline.command_stack)
+    )
+
+
+def start_request_profile():
+    """
+    Start profiling the current request if profiling is enabled
+    """
+    if not current_app.config["PROFILING_ENABLED"]:
+        return
+
+    if request.endpoint in EXCLUDED_ENDPOINTS:
+        return
+
+    install_instrumentation()
+    g.request_profile = RequestProfile()
+
+
+def finish_request_profile(response):
+    """
+    Add the 'Server-Timing' header to the response and store the timings
+    of the current request
+    """
+    profile = g.pop("request_profile", None)
+    if not profile:
+        return response
+
+    total, db_time, db_count, redis_time, redis_count = profile.get_sample()
+
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={db_time:.2f};desc="{db_count} queries", '
+        f'redis;dur={redis_time:.2f};desc="{redis_count} commands", '
+        f'total;dur={total:.2f}'
+    )
+
+    save_sample(
+        request.endpoint or "unknown",
+        [total, db_time, db_count, redis_time, redis_count]
+    )
+
+    return response
+
+
+def save_sample(endpoint, sample):
+    """
+    Store the timings of a request, keeping only the most recent
+    PROFILING_SAMPLE_SIZE samples of each endpoint
+    """
+    sample_size = int(current_app.config["PROFILING_SAMPLE_SIZE"])
+    key = f"{SAMPLES_KEY_PREFIX}{endpoint}"
+
+    pipeline = get_redis_connection().pipeline(transaction=False)
+    pipeline.sadd(ENDPOINTS_KEY, endpoint)
+    pipeline.lpush(key, json.dumps(sample))
+    pipeline.ltrim(key, 0, sample_size - 1)
+    pipeline.execute()
+
+
+def get_percentile(sorted_values, percentile):
+    """
+    Get a percentile of sorted values using the nearest-rank method
+    """
+    if not sorted_values:
+        return None
+
+    rank = max(int(round(percentile / 100 * len(sorted_values))), 1)
+    return sorted_values[rank - 1]
+
+
+def get_endpoint_stats():
+    """
+    Calculate percentiles of the stored request timings for each endpoint
+
+    :returns: List of dicts containing 'endpoint', 'count' and
+              '<field>_p<percentile>' for each field in SAMPLE_FIELDS and
+              percentile in PERCENTILES, ordered by the 95th percentile of
+              the total request time in descending order
+    """
+    redis = get_redis_connection()
+    endpoints = sorted(
+        endpoint.decode("utf-8") for endpoint in redis.smembers(ENDPOINTS_KEY)
+    )
+
+    pipeline = redis.pipeline(transaction=False)
+    for endpoint in endpoints:
+        pipeline.lrange(f"{SAMPLES_KEY_PREFIX}{endpoint}", 0, -1)
+
+    results = []
+    for endpoint, samples in zip(endpoints, pipeline.execute()):
+        samples = [json.loads(sample) for sample in samples]
+        stats = {"endpoint": endpoint, "count": len(samples)}
+
+        for i, field in enumerate(SAMPLE_FIELDS):
+            values = sorted(sample[i] for sample in samples)
+            for percentile in PERCENTILES:
+                stats[f"{field}_p{percentile}"] = get_percentile(
+                    values, percentile
+                )
+
+        results.append(stats)
+
+    results.sort(key=lambda stats: stats["total_p95"] or 0, reverse=True)
+
+    return results
+
+
+def clear_endpoint_stats():
+    """
+    Delete all stored request timings
+    """
+    redis = get_redis_connection()
+    endpoints = redis.smembers(ENDPOINTS_KEY)
+
+    keys = [
+        f"{SAMPLES_KEY_PREFIX}{endpoint.decode('utf-8')}"
+        for endpoint in endpoints
+    ]
+    redis.delete(ENDPOINTS_KEY, *keys)
+
+
+def init_profiling(app):
+    """
+    Register the request hooks used for profiling. Requests are only
+    profiled if PROFILING_ENABLED is set.
+    """
+    app.before_request(start_request_profile)
+    app.after_request(finish_request_profile)
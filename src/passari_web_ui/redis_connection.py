@@ -0,0 +1,79 @@
+"""
+Redis connection pool shared by the web application.
+
+A single Redis client backed by a bounded connection pool is created for
+each application in `create_app` and reused by every request, instead of
+opening a new connection in each request. The pool size, socket timeouts and
+health check interval are configured using the REDIS_* configuration values,
+while the Redis server is configured in the passari-workflow configuration.
+"""
+from urllib.parse import quote, urlencode
+
+from flask import current_app, has_app_context
+from redis import ConnectionPool, Redis
+
+from passari_workflow.config import CONFIG as WORKFLOW_CONFIG
+from passari_workflow.redis.connection import \
+    get_redis_connection as get_workflow_redis_connection
+
+
+def get_redis_url(config):
+    """
+    Get the URL of the Redis server including the connection options
+
+    :param config: Flask configuration
+    """
+    redis_config = WORKFLOW_CONFIG["redis"]
+    password = redis_config.get("password")
+    auth = f":{quote(password, safe='')}@" if password else ""
+
+    options = urlencode({
+        "socket_timeout": config["REDIS_SOCKET_TIMEOUT"],
+        "socket_connect_timeout": config["REDIS_SOCKET_CONNECT_TIMEOUT"],
+        "health_check_interval": config["REDIS_HEALTH_CHECK_INTERVAL"]
+    })
+
+    return (
+        f"redis://{auth}{redis_config['host']}:"
+        f"{redis_config.get('port', 6379)}/0?{options}"
+    )
+
+
+def init_redis(app):
+    """
+    Create the shared Redis client and its connection pool
+    """
+    pool = ConnectionPool.from_url(
+        get_redis_url(app.config),
+        max_connections=int(app.config["REDIS_MAX_CONNECTIONS"])
+    )
+    app.extensions["redis"] = Redis(connection_pool=pool)
+
+
+def get_redis_connection():
+    """
+    Get the Redis client shared by the application.
+
+    Outside the application context, a separate connection is opened using
+    passari-workflow instead.
+    """
+    if has_app_context() and "redis" in current_app.extensions:
+        return current_app.extensions["redis"]
+
+    return get_workflow_redis_connection()
+
+
+def get_pool_stats():
+    """
+    Get the utilization of the connection pool in this process
+
+    :returns: Dictionary containing the amount of connections 'in_use' and
+              'available', and the maximum amount of connections in 'max'
+    """
+    pool = current_app.extensions["redis"].connection_pool
+
+    return {
+        "in_use": len(pool._in_use_connections),
+        "available": len(pool._available_connections),
+        "max": pool.max_connections
+    }
@@ -0,0 +1,266 @@
+"""
+Indexing of the errors that caused SIPs to be rejected.
+
+The log files of each rejected SIP are scanned for error lines, which are
+normalized into signatures by replacing the variable parts such as numbers,
+paths and identifiers. This allows rejections to be grouped by their cause
+without having to open the logs one by one.
+
+The index is updated by the `flask index-rejections` command, which only
+processes packages that haven't been indexed yet unless a full reindex
+is requested.
+"""
+import datetime
+import re
+
+from flask import current_app
+from sqlalchemy import exists, func
+from sqlalchemy.dialects.postgresql import insert
+
+from passari_web_ui.api.logs import get_log_filenames, get_log_path
+from passari_web_ui.db import db
+from passari_web_ui.db.models import (IndexedRejectedPackage,
+                                      PackageRejection, RejectionSignature)
+from passari_workflow.db.models import MuseumObject, MuseumPackage
+
+# Maximum length of a signature; longer error lines are truncated
+MAX_SIGNATURE_LENGTH = 500
+
+# Only the first errors of each package are indexed. Later errors are
+# usually consequences of the first ones.
+MAX_SIGNATURES_PER_PACKAGE = 20
+
+# Replacements applied in order to turn an error line into a signature
+NORMALIZE_RULES = [
+    # Leading timestamp
+    (
+        re.compile(
+            r"^\[?\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}"
+            r"(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\]?\s*"
+        ),
+        ""
+    ),
+    (
+        re.compile(
+            r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
+            re.IGNORECASE
+        ),
+        "<UUID>"
+    ),
+    (re.compile(r"'[^']*'"), "'<STR>'"),
+    (re.compile(r'"[^"]*"'), '"<STR>"'),
+    (re.compile(r"(?:\w+:)?(?:/[\w.\-]+)+/?"), "<PATH>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{16,}\b", re.IGNORECASE), "<HEX>"),
+    (re.compile(r"\d+"), "<N>"),
+    (re.compile(r"\s+"), " ")
+]
+
+
+def get_signature(line):
+    """
+    Normalize an error line into a signature
+    """
+    signature = line.strip()
+    for pattern, replacement in NORMALIZE_RULES:
+        signature = pattern.sub(replacement, signature)
+
+    return signature.strip()[:MAX_SIGNATURE_LENGTH]
+
+
+def _add_file_signatures(path, log_filename, error_pattern, results):
+    """
+    Add the error signatures found in a log file to 'results' until
+    MAX_SIGNATURES_PER_PACKAGE signatures have been found
+    """
+    with open(path, "rb") as file_:
+        for line_number, line in enumerate(file_, start=1):
+            line = line.decode("utf-8", errors="replace").strip()
+            if not error_pattern.search(line):
+                continue
+
+            signature = get_signature(line)
+            if signature and signature not in results:
+                results[signature] = (
+                    signature, line[:MAX_SIGNATURE_LENGTH * 2],
+                    log_filename, line_number
+                )
+
+            if len(results) >= MAX_SIGNATURES_PER_PACKAGE:
+                return
+
+
+def extract_signatures(museum_package):
+    """
+    Extract the error signatures from the log files of a package
+
+    :returns: List of (signature, line, log_filename, line_number) tuples
+              for each unique signature in the order they were found
+    """
+    error_pattern = re.compile(
+        current_app.config["REJECTION_ERROR_PATTERN"], re.IGNORECASE
+    )
+    results = {}
+
+    for log_filename in get_log_filenames(museum_package):
+        if log_filename.endswith(".html"):
+            # HTML reports contain the same errors as the plain text logs
+            continue
+
+        try:
+            _add_file_signatures(
+                get_log_path(museum_package, log_filename), log_filename,
+                error_pattern, results
+            )
+        except OSError:
+            # Index the rest of the logs instead of retrying the package
+            # on every run
+            current_app.logger.warning(
+                "Could not read log file %s of package %s, skipping",
+                log_filename, museum_package.sip_filename, exc_info=True
+            )
+            continue
+
+        if len(results) >= MAX_SIGNATURES_PER_PACKAGE:
+            break
+
+    return list(results.values())
+
+
+def _get_signature_id(signature, example, signature_ids):
+    """
+    Get the ID of a signature, creating the signature if it doesn't exist
+
+    :param signature_ids: Dictionary of {signature: id} used to cache
+                          the IDs during indexing
+    """
+    if signature not in signature_ids:
+        # The signature might be created by another indexing run at the
+        # same time
+        db.session.execute(
+            insert(RejectionSignature)
+            .values(signature=signature, example=example)
+            .on_conflict_do_nothing(index_elements=["signature"])
+        )
+        signature_ids[signature] = (
+            db.session.query(RejectionSignature.id)
+            .filter_by(signature=signature)
+            .scalar()
+        )
+
+    return signature_ids[signature]
+
+
+def clear_rejection_index():
+    """
+    Delete all indexed rejections
+    """
+    db.session.query(PackageRejection).delete()
+    db.session.query(IndexedRejectedPackage).delete()
+    db.session.query(RejectionSignature).delete()
+    db.session.commit()
+
+
+def index_rejections(full=False, batch_size=100):
+    """
+    Index the error signatures of rejected packages
+
+    :param full: Clear the index and index all rejected packages again
+                 instead of only indexing new rejected packages
+    :param batch_size: How many packages to index in each transaction
+
+    :returns: Tuple of (package_count, rejection_count)
+    """
+    if full:
+        clear_rejection_index()
+
+    signature_ids = {}
+    package_count = 0
+    rejection_count = 0
+
+    while True:
+        # Indexed packages are excluded from the query, so the next
+        # batch always starts from the beginning
+        museum_packages = (
+            db.session.query(MuseumPackage)
+            .filter(MuseumPackage.rejected == True)
+            .filter(
+                ~exists().where(
+                    IndexedRejectedPackage.package_id == MuseumPackage.id
+                )
+            )
+            .order_by(MuseumPackage.id)
+            .limit(batch_size)
+            .all()
+        )
+
+        if not museum_packages:
+            break
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for museum_package in museum_packages:
+            result = db.session.execute(
+                insert(IndexedRejectedPackage)
+                .values(package_id=museum_package.id, indexed_date=now)
+                .on_conflict_do_nothing(index_elements=["package_id"])
+            )
+            if result.rowcount == 0:
+                # Already indexed by another indexing run
+                continue
+
+            for signature, line, log_filename, line_number in \
+                    extract_signatures(museum_package):
+                db.session.add(
+                    PackageRejection(
+                        package_id=museum_package.id,
+                        signature_id=_get_signature_id(
+                            signature, line, signature_ids
+                        ),
+                        log_filename=log_filename,
+                        line_number=line_number
+                    )
+                )
+                rejection_count += 1
+
+            package_count += 1
+
+        db.session.commit()
+
+    return package_count, rejection_count
+
+
+def get_signature_counts_query():
+    """
+    Get a query returning each signature with the amount of packages it
+    was found in, in descending order of occurrence
+    """
+    package_count = func.count(PackageRejection.id).label("package_count")
+
+    return (
+        db.session.query(RejectionSignature, package_count)
+        .join(
+            PackageRejection,
+            PackageRejection.signature_id == RejectionSignature.id
+        )
+        .group_by(RejectionSignature.id)
+        .order_by(package_count.desc(), RejectionSignature.id)
+    )
+
+
+def get_signature_packages_query(signature_id):
+    """
+    Get a query returning the packages a signature was found in, along
+    with the object title and the log line
+    """
+    return (
+        db.session.query(
+            MuseumPackage.id, MuseumPackage.sip_filename,
+            MuseumPackage.museum_object_id, MuseumObject.title,
+            PackageRejection.log_filename, PackageRejection.line_number
+        )
+        .join(
+            PackageRejection, PackageRejection.package_id == MuseumPackage.id
+        )
+        .join(MuseumObject, MuseumObject.id == MuseumPackage.museum_object_id)
+        .filter(PackageRejection.signature_id == signature_id)
+        .order_by(MuseumPackage.id.desc())
+    )
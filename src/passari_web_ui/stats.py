@@ -0,0 +1,225 @@
+"""
+Functions for computing the workflow statistics displayed in the web UI.
+
+The statistics are computed periodically by the `flask refresh-stats`
+command and stored in the API cache. If the statistics are not refreshed
+in time, they are recomputed by the API endpoints instead.
+"""
+from sqlalchemy import and_, func
+
+from passari_web_ui.api.cache import save_cache_entry
+from passari_web_ui.db import db
+from passari_web_ui.redis_connection import get_redis_connection
+from passari_web_ui.timeseries import record_snapshot
+from passari_workflow.db.models import MuseumObject, MuseumPackage
+from passari_workflow.queue.queues import QueueType, get_queue
+from rq.registry import FailedJobRegistry, StartedJobRegistry
+from rq.utils import current_timestamp
+
+
+def get_object_counts():
+    """
+    Get the amount of objects in different states using a single aggregate
+    query.
+
+    The counts are calculated using conditional aggregates over a single join
+    between each object and its latest package, instead of performing
+    a separate full table scan for each count.
+
+    :returns: Dictionary containing the keys 'total', 'frozen', 'submitted',
+              'rejected' and 'preserved'
+    """
+    # Whether a preserved object is pending preservation again is decided
+    # by passari-workflow, so reuse the same transformation as a scalar
+    # subquery. Disable correlation; the subquery has its own joins.
+    preserved_count = (
+        db.session.query(func.count(MuseumObject.id))
+        .with_transformation(MuseumObject.exclude_preservation_pending)
+        .filter(MuseumObject.preserved)
+        .statement
+        .correlate(None)
+        .as_scalar()
+    )
+
+    result = (
+        db.session.query(
+            func.count().label("total"),
+            func.count().filter(MuseumObject.frozen == True).label("frozen"),
+            func.count().filter(
+                and_(
+                    MuseumPackage.rejected == False,
+                    MuseumPackage.preserved == False,
+                    MuseumPackage.uploaded == True
+                )
+            ).label("submitted"),
+            func.count().filter(
+                MuseumPackage.rejected == True
+            ).label("rejected"),
+            preserved_count.label("preserved")
+        )
+        .select_from(MuseumObject)
+        .outerjoin(
+            MuseumPackage, MuseumObject.latest_package_id == MuseumPackage.id
+        )
+        .one()
+    )
+
+    return {
+        "total": int(result.total),
+        "frozen": int(result.frozen),
+        "submitted": int(result.submitted),
+        "rejected": int(result.rejected),
+        "preserved": int(result.preserved)
+    }
+
+
+# Workflow queues displayed in the statistics, in display order
+QUEUE_TYPES = (
+    QueueType.DOWNLOAD_OBJECT,
+    QueueType.CREATE_SIP,
+    QueueType.SUBMIT_SIP,
+    QueueType.CONFIRM_SIP
+)
+
+
+def get_queue_counts():
+    """
+    Get the amount of pending, processing and failed jobs in each workflow
+    queue using a single Redis pipeline.
+
+    Unlike the 'count' properties of RQ registries, expired registry entries
+    are not cleaned up first. Instead, only the entries that haven't expired
+    yet are counted. Started jobs that have expired are counted as failed,
+    since the cleanup would move them to the failed job registry.
+
+    :returns: Dictionary of {queue_name: {"pending": int, "processing": int,
+              "failed": int}} in the order of QUEUE_TYPES
+    """
+    queues = [get_queue(queue_type) for queue_type in QUEUE_TYPES]
+
+    # Registry entries are scored by their expiration time. Entries that
+    # never expire are scored '+inf'.
+    timestamp = current_timestamp()
+    unexpired_min = f"({timestamp}"
+
+    pipeline = get_redis_connection().pipeline(transaction=False)
+    for queue in queues:
+        started_key = StartedJobRegistry(queue=queue).key
+
+        pipeline.llen(queue.key)
+        pipeline.zcount(started_key, unexpired_min, "+inf")
+        pipeline.zcount(started_key, "-inf", timestamp)
+        pipeline.zcount(
+            FailedJobRegistry(queue=queue).key, unexpired_min, "+inf"
+        )
+
+    results = pipeline.execute()
+
+    counts = {}
+    for i, queue in enumerate(queues):
+        pending, processing, expired, failed = results[i*4:i*4+4]
+        counts[queue.name] = {
+            "pending": int(pending),
+            "processing": int(processing),
+            "failed": int(expired) + int(failed)
+        }
+
+    return counts
+
+
+def get_overview_stats():
+    """
+    Get the real-time statistics used in the 'Overview' page
+    """
+    queue_counts = get_queue_counts()
+
+    job_count = sum([
+        counts["pending"] for counts in queue_counts.values()
+    ])
+    failed_count = sum([
+        counts["failed"] for counts in queue_counts.values()
+    ])
+
+    counts = get_object_counts()
+
+    result = {
+        "steps": {
+            "pending": {
+                "count": int(
+                    counts["total"]
+                    - job_count - failed_count - counts["frozen"]
+                    - counts["rejected"] - counts["submitted"]
+                    - counts["preserved"]
+                )
+            },
+        },
+        "total_count": counts["total"]
+    }
+
+    # Add the individual queues
+    for queue_name, queue_count in queue_counts.items():
+        result["steps"][queue_name] = {
+            "count": queue_count["pending"]
+        }
+
+    # Add counts outside of queues
+    other_steps = [
+        ("preserved", counts["preserved"]),
+        ("rejected", counts["rejected"]),
+        ("submitted", counts["submitted"]),
+        ("frozen", counts["frozen"]),
+        ("failed", failed_count)
+    ]
+
+    for name, count in other_steps:
+        result["steps"][name] = {"count": count}
+
+    return result
+
+
+def refresh_overview_stats():
+    """
+    Compute the statistics used in the 'Overview' page and record them in
+    the statistics time-series
+    """
+    result = get_overview_stats()
+    record_snapshot(result)
+
+    return result
+
+
+def get_navbar_stats():
+    """
+    Get the object counts used for the navbar
+    """
+    queue_counts = get_queue_counts()
+
+    result = {"queues": {}}
+    for queue_name, queue_count in queue_counts.items():
+        result["queues"][queue_name] = {
+            "pending": queue_count["pending"],
+            "processing": queue_count["processing"]
+        }
+
+    # Add failed
+    result["failed"] = sum([
+        queue_count["failed"] for queue_count in queue_counts.values()
+    ])
+
+    return result
+
+
+# Statistics that are precomputed and stored in the API cache under the
+# same name
+STATS_FUNCS = {
+    "overview_stats": refresh_overview_stats,
+    "navbar_stats": get_navbar_stats
+}
+
+
+def update_stats():
+    """
+    Compute all statistics and save them into the API cache
+    """
+    for name, get_stats in STATS_FUNCS.items():
+        save_cache_entry(name, get_stats())
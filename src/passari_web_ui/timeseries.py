@@ -0,0 +1,203 @@
+"""
+Rolling time-series of the workflow statistics.
+
+Every time the 'Overview' statistics are computed, the object count of each
+step is recorded in Redis. The snapshots are downsampled into per-second,
+per-minute and per-hour buckets, each of which keeps the latest snapshot
+within the bucket, and only a bounded amount of buckets is kept for each
+resolution.
+
+The time-series is used to approximate the throughput of each workflow step
+and the time remaining until the backlog has been processed.
+"""
+import json
+import time
+
+from flask import current_app
+
+from passari_web_ui.redis_connection import get_redis_connection
+
+# Redis sorted set for each resolution, scored by the start of the bucket
+KEY_PREFIX = "stats_timeseries:"
+
+# Bucket size in seconds and the maximum amount of buckets for each
+# resolution
+RESOLUTIONS = {
+    "second": (1, 600),  # 10 minutes
+    "minute": (60, 1440),  # 24 hours
+    "hour": (3600, 720)  # 30 days
+}
+
+# Workflow steps in processing order, and the states objects enter
+# after finishing each step
+WORKFLOW_STEPS = (
+    ("download_object", ("create_sip",)),
+    ("create_sip", ("submit_sip",)),
+    ("submit_sip", ("submitted", "confirm_sip")),
+    ("confirm_sip", ("preserved", "rejected"))
+)
+
+# States of objects that haven't finished the workflow yet
+BACKLOG_STATES = (
+    "pending", "download_object", "create_sip", "submit_sip", "submitted",
+    "confirm_sip"
+)
+
+
+def record_snapshot(stats, timestamp=None):
+    """
+    Record the object counts of the 'Overview' statistics in each resolution
+    of the time-series
+
+    :param stats: Statistics returned by `get_overview_stats`
+    :param timestamp: UNIX timestamp of the snapshot. Defaults to the
+                      current time.
+    """
+    if timestamp is None:
+        timestamp = time.time()
+
+    member = json.dumps({
+        "timestamp": timestamp,
+        "steps": {
+            name: entry["count"] for name, entry in stats["steps"].items()
+        }
+    }, sort_keys=True)
+
+    pipeline = get_redis_connection().pipeline()
+    for resolution, (bucket_size, max_buckets) in RESOLUTIONS.items():
+        key = f"{KEY_PREFIX}{resolution}"
+        bucket = int(timestamp // bucket_size * bucket_size)
+
+        # Replace the previous snapshot in the same bucket and discard the
+        # oldest buckets
+        pipeline.zremrangebyscore(key, bucket, bucket)
+        pipeline.zadd(key, {member: bucket})
+        pipeline.zremrangebyrank(key, 0, -max_buckets - 1)
+
+    pipeline.execute()
+
+
+def get_snapshots(resolution, since=None):
+    """
+    Get the recorded snapshots in chronological order
+
+    :param resolution: One of the resolutions in RESOLUTIONS
+    :param since: Optional UNIX timestamp. Only buckets starting at or after
+                  the timestamp are returned.
+
+    :returns: List of dicts containing 'timestamp' and 'steps'
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution '{resolution}'")
+
+    members = get_redis_connection().zrangebyscore(
+        f"{KEY_PREFIX}{resolution}",
+        "-inf" if since is None else since,
+        "+inf"
+    )
+
+    return [json.loads(member) for member in members]
+
+
+def get_completed_counts(steps):
+    """
+    Approximate the amount of objects that have finished each workflow step
+    based on the amount of objects in the subsequent states
+
+    :returns: Dictionary of {step: count}
+    """
+    completed = {}
+    count = 0
+
+    for step, next_states in reversed(WORKFLOW_STEPS):
+        count += sum(steps.get(state, 0) for state in next_states)
+        completed[step] = count
+
+    return completed
+
+
+def _get_drain_time(count, throughput):
+    """
+    Get the seconds needed to process 'count' objects with the given
+    hourly throughput, or None if the objects are not being processed
+    """
+    if count == 0:
+        return 0
+
+    if not throughput:
+        return None
+
+    return count / throughput * 3600
+
+
+def get_throughput(snapshots):
+    """
+    Calculate the throughput of each workflow step and the projected time
+    needed to process the current backlog between the first and the last
+    snapshot.
+
+    Objects returning to 'pending' after being modified reduce the amount of
+    completed objects, so throughputs are never reported as negative.
+
+    :returns: Dictionary containing 'steps', 'backlog' and the time range in
+              'start' and 'end', or None if there are less than two snapshots.
+              Each entry in 'steps' contains the current 'count', the
+              'throughput' and 'trend' of the count in objects per hour and
+              the 'drain_time' in seconds.
+    """
+    if len(snapshots) < 2:
+        return None
+
+    first, last = snapshots[0], snapshots[-1]
+    duration = last["timestamp"] - first["timestamp"]
+
+    if duration <= 0:
+        return None
+
+    first_completed = get_completed_counts(first["steps"])
+    last_completed = get_completed_counts(last["steps"])
+
+    steps = {}
+    for step, _ in WORKFLOW_STEPS:
+        count = last["steps"].get(step, 0)
+        throughput = max(
+            (last_completed[step] - first_completed[step]) / duration * 3600,
+            0
+        )
+        trend = (count - first["steps"].get(step, 0)) / duration * 3600
+
+        steps[step] = {
+            "count": count,
+            "throughput": throughput,
+            "trend": trend,
+            "drain_time": _get_drain_time(count, throughput)
+        }
+
+    backlog_count = sum(
+        last["steps"].get(state, 0) for state in BACKLOG_STATES
+    )
+    # Objects leave the backlog once they have been confirmed
+    backlog_throughput = steps["confirm_sip"]["throughput"]
+
+    return {
+        "start": first["timestamp"],
+        "end": last["timestamp"],
+        "steps": steps,
+        "backlog": {
+            "count": backlog_count,
+            "throughput": backlog_throughput,
+            "drain_time": _get_drain_time(backlog_count, backlog_throughput)
+        }
+    }
+
+
+def get_current_throughput():
+    """
+    Calculate the throughput over the last STATS_THROUGHPUT_WINDOW seconds
+    using the per-minute snapshots
+    """
+    window = float(current_app.config["STATS_THROUGHPUT_WINDOW"])
+
+    return get_throughput(
+        get_snapshots("minute", since=time.time() - window)
+    )
@@ -1,12 +1,21 @@
+import re
+
 from flask_wtf import FlaskForm
 from wtforms.fields import BooleanField, Field, IntegerField, StringField
-from wtforms.validators import InputRequired, ValidationError
+from wtforms.validators import InputRequired, StopValidation, ValidationError
 from wtforms.widgets import TextArea
 
 from passari_web_ui.db import db
-from passari_web_ui.ui.utils import get_available_object_count
+from passari_web_ui.jobs import get_unreenqueueable_object_ids
+from passari_web_ui.ui.utils import (get_cached_available_object_count,
+                                     get_missing_object_ids)
 from passari_workflow.db.models import MuseumObject
 
+# Maximum amount of object IDs listed in a validation error message
+MAX_REPORTED_OBJECT_IDS = 20
+
+OBJECT_ID_SEPARATOR_RE = re.compile(r"[\s,]+")
+
 
 class EnqueueObjectsForm(FlaskForm):
     """
@@ -15,7 +24,9 @@ class EnqueueObjectsForm(FlaskForm):
     object_count = IntegerField(validators=[InputRequired()])
 
     def validate_object_count(self, field):
-        available_count = get_available_object_count()
+        # Use the same count that was displayed to the user. Enqueuing
+        # more objects than are available only enqueues the available ones.
+        available_count = get_cached_available_object_count().data["count"]
 
         if available_count == 0:
             raise ValidationError(
@@ -46,27 +57,58 @@ class ReenqueueObjectForm(FlaskForm):
 
 class MultipleObjectIDField(Field):
     """
-    Field for retrieving a list of multiple object IDs
+    Field for retrieving a list of multiple object IDs.
+
+    The IDs can be separated by commas or whitespace. Duplicate IDs are
+    removed while keeping the order of the remaining IDs.
     """
     widget = TextArea()
 
     def _value(self):
-        if self.data:
-            return "\n".join(self.data)
+        if self.raw_data:
+            # Display the submitted input as-is
+            return self.raw_data[0]
+        elif isinstance(self.data, str):
+            # Object IDs provided as a prepopulated string
+            return self.data
+        elif self.data:
+            return "\n".join(str(object_id) for object_id in self.data)
         else:
             return ""
 
     def process_formdata(self, valuelist):
         if valuelist:
+            entries = OBJECT_ID_SEPARATOR_RE.split(valuelist[0].strip())
             try:
-                self.data = [
-                    int(entry.strip()) for entry in valuelist[0].split("\n")
-                ]
+                self.data = list(dict.fromkeys(
+                    int(entry) for entry in entries if entry
+                ))
             except ValueError:
                 self.data = None
+                raise ValueError("Object IDs must be integers")
         else:
             self.data = []
 
+    def pre_validate(self, form):
+        if self.process_errors:
+            # Don't run the validators if the input couldn't be parsed
+            raise StopValidation()
+
+
+def format_object_ids(object_ids):
+    """
+    Format object IDs for a validation error message, listing up to
+    MAX_REPORTED_OBJECT_IDS IDs
+    """
+    result = ", ".join(
+        str(object_id) for object_id in object_ids[:MAX_REPORTED_OBJECT_IDS]
+    )
+
+    if len(object_ids) > MAX_REPORTED_OBJECT_IDS:
+        result += f" and {len(object_ids) - MAX_REPORTED_OBJECT_IDS} more"
+
+    return result
+
 
 def object_ids_exist_check(form, field):
     """
@@ -75,22 +117,48 @@ def object_ids_exist_check(form, field):
     if not field.data:
         raise ValidationError("No object ID was provided")
 
-    existing_object_ids = [
-        result[0] for result in
-        db.session.query(MuseumObject.id)
-        .filter(MuseumObject.id.in_(field.data))
-        .all()
-    ]
+    missing_object_ids = get_missing_object_ids(field.data)
+
+    if missing_object_ids:
+        raise ValidationError(
+            f"Following objects don't exist: "
+            f"{format_object_ids(missing_object_ids)}"
+        )
+
+
+def rejected_object_ids_check(form, field):
+    """
+    Check that all given object IDs exist and their latest packages
+    have been rejected
+    """
+    if not field.data:
+        raise ValidationError("No object ID was provided")
 
-    missing_object_ids = set(field.data) - set(existing_object_ids)
+    missing_object_ids, not_rejected_object_ids = \
+        get_unreenqueueable_object_ids(field.data)
 
     if missing_object_ids:
         raise ValidationError(
             f"Following objects don't exist: "
-            f"{', '.join([str(o) for o in sorted(missing_object_ids)])}"
+            f"{format_object_ids(missing_object_ids)}"
+        )
+
+    if not_rejected_object_ids:
+        raise ValidationError(
+            f"Latest packages of following objects weren't rejected: "
+            f"{format_object_ids(not_rejected_object_ids)}"
         )
 
 
+class ReenqueueObjectsForm(FlaskForm):
+    """
+    Form to re-enqueue multiple rejected objects
+    """
+    object_ids = MultipleObjectIDField(
+        "Object IDs", validators=[rejected_object_ids_check]
+    )
+
+
 class FreezeObjectsForm(FlaskForm):
     """
     Form for freezing multiple objects with a single reason
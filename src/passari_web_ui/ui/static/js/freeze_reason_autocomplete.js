@@ -0,0 +1,23 @@
+// Maximum amount of freeze reasons displayed as suggestions
+var FREEZE_REASON_SUGGESTION_LIMIT = 10;
+
+$("#reason").autocomplete({
+    source: async function(request, response) {
+        var url = new URL(URLMap["api.list_freeze_reasons"]);
+        url.searchParams.append("search", request.term);
+        url.searchParams.append("limit", FREEZE_REASON_SUGGESTION_LIMIT);
+
+        try {
+            var result = await apiFetch(url);
+            var data = await result.json();
+
+            response(data["results"].map((entry) => ({
+                label: `${entry["reason"]} (${entry["count"]})`,
+                value: entry["reason"]
+            })));
+        } catch (err) {
+            response([]);
+        }
+    },
+    minLength: 0
+});
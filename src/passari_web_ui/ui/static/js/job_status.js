@@ -0,0 +1,36 @@
+var UPDATE_INTERVAL = 1000; // 1 second
+
+var app = new Vue({
+    el: "#job_status_app",
+    data: {
+        // 'jobId' is provided in the Flask template
+        jobId: jobId,
+        status: null,
+        progress: {done: 0, total: null},
+        result: null,
+        error: null
+    }
+});
+
+var updateJobStatus = async function() {
+    var url = URLMap["api.job_status"].replace("JOB_ID", app.jobId);
+
+    try {
+        var result = await apiFetch(url);
+        var data = await result.json();
+
+        app.status = data["status"];
+        app.progress = data["progress"];
+        app.result = data["result"];
+        app.error = data["error"];
+    } catch (err) {
+        console.log("Could not update job status: " + err);
+    }
+
+    // Keep polling until the job has finished or failed
+    if (!["finished", "failed"].includes(app.status)) {
+        setTimeout(updateJobStatus, UPDATE_INTERVAL);
+    }
+};
+
+updateJobStatus();
@@ -12,9 +12,12 @@ var app = new Vue({
         searchInProgress: false,
         results: [],
         resultCount: 0,
-        pageNumbers: [],
+        resultCountEstimated: false,
         page: 1,
-        pageCount: 0,
+        // Cursors for the current and the adjacent pages
+        cursor: "",
+        nextCursor: null,
+        prevCursor: null,
 
         // Unfreeze modal
         unfreezeInProgress: false,
@@ -40,9 +43,25 @@ var app = new Vue({
                 app.updateResults();
             }
         },
-        changePage: function(page) {
-            app.page = page;
-            app.updateResults();
+        nextPage: function() {
+            if (app.nextCursor && !app.searchInProgress) {
+                app.page += 1;
+                loadResults(app.nextCursor, false);
+            }
+        },
+        previousPage: function() {
+            if (app.prevCursor && !app.searchInProgress) {
+                app.page -= 1;
+                loadResults(app.prevCursor, false);
+            }
+        },
+        exportUrl: function(format) {
+            // Export all results of the last performed search
+            var url = new URL(URLMap["api.export_frozen_objects"]);
+            url.searchParams.append("search", app.lastPerformedSearchQuery);
+            url.searchParams.append("format", format);
+
+            return url.toString();
         },
         openUnfreezeModal: function(objectId, reason) {
             app.enqueueUnfrozenObject = false;
@@ -67,19 +86,6 @@ var app = new Vue({
         updateResults: function() {
             updateResults();
         },
-        pageItemClassForPage: (page) => {
-            var itemClass = "page-item";
-
-            if (app.page === page) {
-                itemClass += " active";
-            }
-
-            if (app.searchInProgress) {
-                itemClass += " disabled";
-            }
-
-            return itemClass;
-        },
         viewUrlForPackage: (packageId) => {
             return URLMap["ui.manage_sips.view"].replace(
                 "PACKAGE_ID", packageId
@@ -100,27 +106,32 @@ var unfreezeObject = async function(objectId, enqueue) {
     });
     var data = await response.json();
 
-    // Update search results after unfreezing the object
-    return await updateResults();
+    // Reload the current page after unfreezing the object
+    return await loadResults(app.cursor, true);
 };
 
+// Perform a new search starting from the first page
 var updateResults = async function() {
     if (app.searchTimeout) {
         window.clearTimeout(app.searchTimeout);
     }
 
+    app.page = 1;
+
+    // Only count the results when the results change, since counting
+    // is expensive with a large amount of results
+    return await loadResults("", true);
+};
+
+var loadResults = async function(cursor, includeCount) {
     app.searchInProgress = true;
 
     var searchQuery = app.searchQuery;
-    var queryChanged = searchQuery != app.lastPerformedSearchQuery;
-    if (queryChanged) {
-        // If the search query was changed, reset the page to 1
-        app.page = 1;
-    }
 
     var url = new URL(URLMap["api.list_frozen_objects"]);
     url.searchParams.append("search", searchQuery);
-    url.searchParams.append("page", app.page);
+    url.searchParams.append("cursor", cursor);
+    url.searchParams.append("include_count", includeCount);
     url.searchParams.append("limit", OBJECTS_PER_PAGE);
 
     var result = await apiFetch(url);
@@ -129,10 +140,17 @@ var updateResults = async function() {
     app.lastPerformedSearchQuery = searchQuery;
 
     app.results = data["results"];
-    app.resultCount = data["result_count"];
-    app.pageNumbers = data["page_numbers"];
-    app.page = data["page"];
-    app.pageCount = data["page_count"];
+    if (includeCount) {
+        app.resultCount = data["result_count"];
+        app.resultCountEstimated = data["result_count_estimated"];
+    }
+    app.cursor = cursor;
+    app.nextCursor = data["next_cursor"];
+    app.prevCursor = data["prev_cursor"];
+
+    if (!app.prevCursor) {
+        app.page = 1;
+    }
 
     app.searchInProgress = false;
 };
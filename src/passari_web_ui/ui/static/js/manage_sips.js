@@ -20,9 +20,12 @@ var app = new Vue({
         searchInProgress: false,
         results: [],
         resultCount: 0,
-        pageNumbers: [],
+        resultCountEstimated: false,
         page: 1,
-        pageCount: 0,
+        // Cursors for the current and the adjacent pages
+        cursor: "",
+        nextCursor: null,
+        prevCursor: null,
 
         // Modal settings
         reenqueueInProgress: false,
@@ -47,25 +50,29 @@ var app = new Vue({
                 app.updateResults();
             }
         },
-        changePage: function(page) {
-            app.page = page;
-            app.updateResults();
+        nextPage: function() {
+            if (app.nextCursor && !app.searchInProgress) {
+                app.page += 1;
+                loadResults(app.nextCursor, false);
+            }
+        },
+        previousPage: function() {
+            if (app.prevCursor && !app.searchInProgress) {
+                app.page -= 1;
+                loadResults(app.prevCursor, false);
+            }
         },
         updateResults: function() {
             updateResults();
         },
-        pageItemClassForPage: (page) => {
-            var itemClass = "page-item";
-
-            if (app.page === page) {
-                itemClass += " active";
-            }
-
-            if (app.searchInProgress) {
-                itemClass += " disabled";
-            }
+        exportUrl: function(format) {
+            // Export all results of the last performed search
+            var url = getSearchUrl(
+                URLMap["api.export_sips"], app.lastPerformedSearchQuery
+            );
+            url.searchParams.append("format", format);
 
-            return itemClass;
+            return url.toString();
         },
         viewUrlForPackage: function(package_id) {
             return URLMap["ui.manage_sips.view"].replace(
@@ -88,8 +95,8 @@ var app = new Vue({
                 this.$bvModal.hide("reenqueue_object_modal");
 
                 if (result === true) {
-                    // Re-enqueuing succeeded. Reload the list.
-                    updateResults();
+                    // Re-enqueuing succeeded. Reload the current page.
+                    loadResults(app.cursor, false);
                 } else {
                     // Re-enqueueing failed. Show the error message.
                     app.reenqueueError = result;
@@ -119,50 +126,62 @@ async function reenqueueObject(objectId) {
     }
 };
 
+// Get the URL for an endpoint with the current search parameters
+function getSearchUrl(endpointUrl, searchQuery) {
+    var url = new URL(endpointUrl);
+    url.searchParams.append("search", searchQuery);
+
+    url.searchParams.append("only_latest", app.onlyLatestPackages);
+    url.searchParams.append("preserved", app.showPreserved);
+    url.searchParams.append("rejected", app.showRejected);
+    url.searchParams.append("cancelled", app.showCancelled);
+    url.searchParams.append("processing", app.showProcessing);
+
+    return url;
+};
+
+// Perform a new search starting from the first page
 async function updateResults() {
     if (app.searchTimeout) {
         window.clearTimeout(app.searchTimeout);
     }
 
+    app.page = 1;
+
+    // Only count the results when performing a new search, since counting
+    // is expensive with a large amount of results
+    await loadResults("", true);
+};
+
+async function loadResults(cursor, includeCount) {
     app.searchInProgress = true;
 
     var searchQuery = app.searchQuery;
-    var queryChanged = searchQuery != app.lastPerformedSearchQuery;
-    if (queryChanged) {
-        // If the search query was changed, reset the page to 1
-        app.page = 1;
-    }
 
-    var url = new URL(URLMap["api.list_sips"]);
-    url.searchParams.append("search", searchQuery);
-    url.searchParams.append("page", app.page);
+    var url = getSearchUrl(URLMap["api.list_sips"], searchQuery);
+    url.searchParams.append("cursor", cursor);
+    url.searchParams.append("include_count", includeCount);
     url.searchParams.append("limit", OBJECTS_PER_PAGE);
 
-    url.searchParams.append("only_latest", app.onlyLatestPackages);
-    url.searchParams.append("preserved", app.showPreserved);
-    url.searchParams.append("rejected", app.showRejected);
-    url.searchParams.append("cancelled", app.showCancelled);
-    url.searchParams.append("processing", app.showProcessing);
-
     var result = await apiFetch(url);
     var data = await result.json();
 
     app.lastPerformedSearchQuery = searchQuery;
 
     app.results = data["results"];
-    app.resultCount = data["result_count"];
-    app.pageNumbers = data["page_numbers"];
-    app.page = Math.max(data["page"], 1);
-    app.pageCount = data["page_count"];
-
-    app.searchInProgress = false;
+    if (includeCount) {
+        app.resultCount = data["result_count"];
+        app.resultCountEstimated = data["result_count_estimated"];
+    }
+    app.cursor = cursor;
+    app.nextCursor = data["next_cursor"];
+    app.prevCursor = data["prev_cursor"];
 
-    if (app.page > app.pageCount && app.pageCount > 0) {
-        // If the last page isn't actually available, set the user back
-        // to the latest available page
-        app.page = Math.max(app.pageCount, 1);
-        updateResults();
+    if (!app.prevCursor) {
+        app.page = 1;
     }
+
+    app.searchInProgress = false;
 };
 
 updateResults();
@@ -4,16 +4,7 @@
 
     var UPDATE_INTERVAL = 2000;  // 2 seconds
 
-    var updateNavbar = async () => {
-        // Only update stats if window is in focus
-        if (document.visibilityState != "visible") {
-            window.setTimeout(updateNavbar, 500);
-            return;
-        }
-
-        var result = await apiFetch(URLMap['api.navbar_stats']);
-        var data = await result.json();
-
+    var renderNavbar = (data) => {
         for (var [queueName, queueData] of Object.entries(data['queues'])) {
             var pendingElem = $(`#${queueName}_pending_counter`);
             var processingElem = $(`#${queueName}_processing_counter`);
@@ -43,10 +34,25 @@
         } else {
             failedElem.hide();
         }
+    };
+
+    // Poll the statistics if they can't be streamed
+    var updateNavbar = async () => {
+        // Only update stats if window is in focus
+        if (document.visibilityState != "visible") {
+            window.setTimeout(updateNavbar, 500);
+            return;
+        }
+
+        var result = await apiFetch(URLMap['api.navbar_stats']);
+
+        if (result.ok) {
+            renderNavbar(await result.json());
+        }
 
         // Update every 2 seconds
         window.setTimeout(updateNavbar, UPDATE_INTERVAL);
     };
 
-    updateNavbar();
+    StatsStream.subscribe("navbar_stats", renderNavbar, updateNavbar);
 })();
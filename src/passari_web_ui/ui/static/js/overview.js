@@ -119,6 +119,15 @@ var app = new Vue({
     }
 });
 
+var renderOverview = (data) => {
+    for (let [state, entry] of Object.entries(data["steps"])) {
+        Vue.set(app.steps, state, entry);
+        app.steps[state]["state"] = state;
+    }
+    app.totalCount = data["total_count"];
+};
+
+// Poll the statistics if they can't be streamed
 var updateOverview = async () => {
     // Only update stats if window is in focus
     if (document.visibilityState != "visible") {
@@ -127,15 +136,12 @@ var updateOverview = async () => {
     }
 
     var result = await apiFetch(URLMap["api.overview_stats"]);
-    var data = await result.json();
 
-    for (let [state, entry] of Object.entries(data["steps"])) {
-        Vue.set(app.steps, state, entry);
-        app.steps[state]["state"] = state;
+    if (result.ok) {
+        renderOverview(await result.json());
     }
-    app.totalCount = data["total_count"];
 
     window.setTimeout(updateOverview, UPDATE_INTERVAL);
 };
 
-updateOverview();
+StatsStream.subscribe("overview_stats", renderOverview, updateOverview);
@@ -0,0 +1,96 @@
+// Display the queue depth of each workflow step over time, and the
+// throughput and projected drain time of each step
+(function() {
+    "use strict";
+
+    var UPDATE_INTERVAL = 60000;  // 1 minute
+
+    var historyApp = new Vue({
+        el: "#history_app",
+        data: {
+            resolution: "minute",
+            snapshots: [],
+            throughput: null,
+            chartSteps: [
+                {"state": "download_object", "title": "Download object"},
+                {"state": "create_sip", "title": "Create SIP"},
+                {"state": "submit_sip", "title": "Submit SIP"},
+                {"state": "confirm_sip", "title": "Confirm SIP"}
+            ]
+        },
+        computed: {
+            maxCount: function() {
+                var max = 0;
+                for (let snapshot of this.snapshots) {
+                    for (let step of this.chartSteps) {
+                        max = Math.max(max, snapshot.steps[step.state] || 0);
+                    }
+                }
+                return max;
+            }
+        },
+        methods: {
+            chartPoints: function(state) {
+                var start = this.snapshots[0].timestamp;
+                var end = this.snapshots[this.snapshots.length - 1].timestamp;
+                var maxCount = Math.max(this.maxCount, 1);
+
+                return this.snapshots.map((snapshot) => {
+                    var x = (snapshot.timestamp - start) / (end - start) * 1000;
+                    var y = 200 - (snapshot.steps[state] || 0) / maxCount * 200;
+                    return `${x.toFixed(1)},${y.toFixed(1)}`;
+                }).join(" ");
+            },
+            formatTimestamp: function(timestamp) {
+                return new Date(timestamp * 1000).toLocaleString();
+            },
+            formatTrend: function(trend) {
+                return (trend > 0 ? "+" : "") + trend.toFixed(1);
+            },
+            formatDuration: function(seconds) {
+                if (seconds === null) {
+                    return "-";
+                }
+
+                var minutes = Math.round(seconds / 60);
+                if (minutes < 60) {
+                    return `${minutes} min`;
+                }
+
+                var hours = Math.floor(minutes / 60);
+                if (hours < 48) {
+                    return `${hours} h ${minutes % 60} min`;
+                }
+
+                return `${Math.floor(hours / 24)} d ${hours % 24} h`;
+            },
+            updateHistory: async function() {
+                var url = new URL(URLMap["api.stats_history"]);
+                url.searchParams.set("resolution", this.resolution);
+
+                try {
+                    var result = await apiFetch(url);
+
+                    if (result.ok) {
+                        var data = await result.json();
+                        this.snapshots = data["snapshots"];
+                        this.throughput = data["throughput"];
+                    }
+                } catch (err) {
+                    console.log("Could not update statistics history: " + err);
+                }
+            }
+        }
+    });
+
+    var updateHistory = async () => {
+        // Only update the history if window is in focus
+        if (document.visibilityState == "visible") {
+            await historyApp.updateHistory();
+        }
+
+        window.setTimeout(updateHistory, UPDATE_INTERVAL);
+    };
+
+    updateHistory();
+})();
@@ -0,0 +1,91 @@
+// Shared stream of statistics pushed by the server using server-sent events.
+// A single connection is shared by all scripts on the page. If server-sent
+// events are not available, subscribers fall back to polling.
+var StatsStream = (function() {
+    "use strict";
+
+    // Fall back to polling after this many consecutive connection errors
+    var MAX_ERRORS = 3;
+
+    var subscribers = {};
+    var latestData = {};
+    var source = null;
+    var errorCount = 0;
+    var fallenBack = false;
+
+    var fallBack = () => {
+        if (fallenBack) {
+            return;
+        }
+
+        fallenBack = true;
+
+        if (source !== null) {
+            source.close();
+        }
+
+        for (let entries of Object.values(subscribers)) {
+            for (let entry of entries) {
+                entry.onFallback();
+            }
+        }
+    };
+
+    var connect = () => {
+        if (Object.keys(subscribers).length === 0) {
+            return;
+        }
+
+        if (!STATS_STREAM_ENABLED || typeof EventSource === "undefined") {
+            fallBack();
+            return;
+        }
+
+        var url = new URL(URLMap["api.stats_stream"]);
+        url.searchParams.append("events", Object.keys(subscribers).join(","));
+
+        source = new EventSource(url);
+        source.onopen = () => {
+            errorCount = 0;
+        };
+        source.onerror = () => {
+            // The browser reconnects automatically when the server closes
+            // the stream. Only give up if the errors keep repeating.
+            errorCount += 1;
+            if (errorCount >= MAX_ERRORS) {
+                fallBack();
+            }
+        };
+
+        for (let name of Object.keys(subscribers)) {
+            source.addEventListener(name, (evt) => {
+                var data = JSON.parse(evt.data);
+                latestData[name] = data;
+
+                for (let entry of subscribers[name]) {
+                    entry.onData(data);
+                }
+            });
+        }
+    };
+
+    // Connect once all scripts on the page have subscribed
+    document.addEventListener("DOMContentLoaded", connect);
+
+    return {
+        // Call 'onData' with the statistics whenever they change, or
+        // 'onFallback' once if the stream is not available
+        subscribe: (name, onData, onFallback) => {
+            if (!(name in subscribers)) {
+                subscribers[name] = [];
+            }
+            subscribers[name].push({onData: onData, onFallback: onFallback});
+
+            if (fallenBack) {
+                onFallback();
+            } else if (name in latestData) {
+                onData(latestData[name]);
+            }
+        }
+    };
+})();
@@ -0,0 +1,23 @@
+// Display a warning in the sidebar if any heartbeat is overdue
+(function() {
+    "use strict";
+
+    var UPDATE_INTERVAL = 60000;  // 1 minute
+
+    var updateSystemStatus = async () => {
+        try {
+            var result = await apiFetch(URLMap["api.system_status"]);
+
+            if (result.ok) {
+                var data = await result.json();
+                $("#system_status_overdue_badge").toggle(data["any_overdue"]);
+            }
+        } catch (err) {
+            console.log("Could not update system status: " + err);
+        }
+
+        window.setTimeout(updateSystemStatus, UPDATE_INTERVAL);
+    };
+
+    updateSystemStatus();
+})();
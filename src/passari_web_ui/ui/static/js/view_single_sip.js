@@ -1,11 +1,29 @@
+// Amount of bytes to load at a time when displaying plain text logs
+var LOG_CHUNK_SIZE = 256 * 1024;
+
+// Load the next chunk when the log is scrolled this close to the bottom
+var LOG_SCROLL_THRESHOLD = 200;
+
 var app = new Vue({
     el: "#sip_reports_app",
     data: {
         // 'sipFilename' and 'logFilenames' are provided in the Flask template
         sipFilename: sipFilename,
         logFilenames: logFilenames,
+        // Content of each log file: a string for HTML documents, and
+        // a list of the decoded chunks loaded so far for other logs
         logContents: {},
-        logBlobURLs: {}
+        logBlobURLs: {},
+        // Loading state of each log file: the total size and the amount of
+        // bytes loaded so far
+        logSizes: {},
+        logLoadedBytes: {},
+        // Log search
+        searchQuery: "",
+        searchIgnoreCase: true,
+        searchResults: [],
+        searchSummary: null,
+        searching: false
     },
     methods: {
         loadLogFileForTab: function(tabIndex) {
@@ -13,10 +31,40 @@ var app = new Vue({
         },
         loadLogFile: function(filename) {
             loadLogFile(filename);
+        },
+        onLogScroll: function(filename, evt) {
+            var elem = evt.target;
+            var distanceToBottom = (
+                elem.scrollHeight - elem.scrollTop - elem.clientHeight
+            );
+
+            if (distanceToBottom < LOG_SCROLL_THRESHOLD) {
+                loadNextLogChunk(filename);
+            }
+        },
+        isLogComplete: function(filename) {
+            return app.logLoadedBytes[filename] >= app.logSizes[filename];
+        },
+        searchLogs: function() {
+            searchLogs();
         }
     }
 });
 
+// Chunks that are currently being loaded, and the streaming decoder for
+// each log file. The decoder keeps multi-byte characters split between
+// chunks until the rest of the character has been loaded.
+var loadingLogs = {};
+var logDecoders = {};
+
+var getLogUrl = function(filename) {
+    var url = new URL(URLMap["api.get_log_file"]);
+    url.searchParams.append("sip_filename", app.sipFilename);
+    url.searchParams.append("log_filename", filename);
+
+    return url;
+};
+
 var loadLogFile = async function(filename) {
     if (filename in app.logContents) {
         // Don't load a log file we have already loaded or are loading
@@ -26,21 +74,126 @@ var loadLogFile = async function(filename) {
     // Set the content to null first; this means the download is underway
     Vue.set(app.logContents, filename, null)
 
-    var url = new URL(URLMap["api.get_log_content"]);
-    url.searchParams.append("sip_filename", app.sipFilename);
-    url.searchParams.append("log_filename", filename);
-
-    var result = await apiFetch(url);
-    var data = await result.json();
+    if (filename.endsWith(".html")) {
+        // HTML documents can only be displayed in full
+        var result = await apiFetch(getLogUrl(filename));
+        var content = await result.text();
 
-    Vue.set(app.logContents, filename, data["data"]);
+        Vue.set(app.logContents, filename, content);
 
-    if (filename.endsWith(".html")) {
         // Create a Blob URL for HTML documents so they can be embedded
         // more safely without having to loosen the CSP rules too much
         Vue.set(
             app.logBlobURLs, filename,
-            URL.createObjectURL(new Blob([data["data"]]))
+            URL.createObjectURL(new Blob([content], {type: "text/html"}))
         );
+        return;
+    }
+
+    logDecoders[filename] = new TextDecoder("utf-8");
+    Vue.set(app.logLoadedBytes, filename, 0);
+
+    await loadNextLogChunk(filename);
+};
+
+var loadNextLogChunk = async function(filename) {
+    if (loadingLogs[filename]) {
+        return;
+    }
+
+    var loadedBytes = app.logLoadedBytes[filename];
+    if (filename in app.logSizes && loadedBytes >= app.logSizes[filename]) {
+        // Entire log has been loaded
+        return;
+    }
+
+    loadingLogs[filename] = true;
+
+    try {
+        var url = getLogUrl(filename);
+        url.searchParams.append("offset", loadedBytes);
+        url.searchParams.append("length", LOG_CHUNK_SIZE);
+
+        var result = await apiFetch(url);
+        var chunk = new Uint8Array(await result.arrayBuffer());
+        var size = parseInt(result.headers.get("X-Log-Size"), 10);
+        loadedBytes += chunk.length;
+
+        // Only decode and append the new chunk, so that the previously
+        // loaded part of the log isn't rendered again
+        var text = logDecoders[filename].decode(
+            chunk, {stream: loadedBytes < size}
+        );
+
+        if (app.logContents[filename] === null) {
+            Vue.set(app.logContents, filename, []);
+        }
+        app.logContents[filename].push(text);
+
+        Vue.set(app.logSizes, filename, size);
+        Vue.set(app.logLoadedBytes, filename, loadedBytes);
+    } finally {
+        loadingLogs[filename] = false;
+    }
+};
+
+// Search all log files on the server. The results are streamed as
+// newline-delimited JSON and displayed as they arrive.
+var searchLogs = async function() {
+    if (app.searching || !app.searchQuery) {
+        return;
+    }
+
+    app.searching = true;
+    app.searchResults = [];
+    app.searchSummary = null;
+
+    var url = new URL(URLMap["api.search_logs"]);
+    url.searchParams.append("sip_filename", app.sipFilename);
+    url.searchParams.append("query", app.searchQuery);
+    url.searchParams.append("ignore_case", app.searchIgnoreCase);
+
+    var handleLine = (line) => {
+        if (!line) {
+            return;
+        }
+
+        var entry = JSON.parse(line);
+        if (entry["type"] === "match") {
+            app.searchResults.push(entry);
+        } else if (entry["type"] === "summary") {
+            app.searchSummary = entry;
+        }
+    };
+
+    try {
+        var result = await apiFetch(url);
+
+        if (!result.ok) {
+            var data = await result.json().catch(() => ({}));
+            app.searchSummary = {"error": data["error"] || "Search failed"};
+            return;
+        }
+
+        var reader = result.body.getReader();
+        var decoder = new TextDecoder("utf-8");
+        var buffer = "";
+
+        while (true) {
+            var {done, value} = await reader.read();
+            if (done) {
+                break;
+            }
+
+            buffer += decoder.decode(value, {stream: true});
+
+            var lines = buffer.split("\n");
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+
+        handleLine(buffer + decoder.decode());
+    } finally {
+        app.searching = false;
     }
 };
@@ -1,13 +1,21 @@
 import datetime
+import time
 
 from flask import current_app
+from sqlalchemy import text
 
 import arrow
+from passari_web_ui.api.cache import delete_cache_entry, get_cached
 from passari_web_ui.db import db
 from passari_workflow.db.models import MuseumObject
 from passari_workflow.heartbeat import HeartbeatSource, get_heartbeats
 from passari_workflow.queue.queues import get_enqueued_object_ids
 
+# Maximum amount of object IDs sent to the database in a single query
+OBJECT_ID_CHUNK_SIZE = 10000
+
+AVAILABLE_OBJECT_COUNT_CACHE_NAME = "available_object_count"
+
 
 class SystemStatus:
     """
@@ -81,6 +89,28 @@ class SystemStatus:
         distance = arrow.utcnow() - interval
         return distance.humanize(only_distance=True)
 
+    def to_dict(self):
+        """
+        Get the status of each heartbeat as a JSON serializable dict
+        """
+        heartbeats = {}
+        for source in HeartbeatSource:
+            timestamp = self.heartbeats[source]
+            heartbeats[source.value] = {
+                "last_run": timestamp.isoformat() if timestamp else None,
+                "last_run_natural": self.get_heartbeat_natural_time(source),
+                "interval": int(
+                    self.get_heartbeat_interval(source).total_seconds()
+                ),
+                "recent": self.is_heartbeat_recent(source)
+            }
+
+        return {
+            "all_ok": self.is_all_ok,
+            "any_overdue": self.is_any_overdue,
+            "heartbeats": heartbeats
+        }
+
     @property
     def is_all_ok(self):
         """
@@ -108,8 +138,30 @@ class SystemStatus:
         return False
 
 
-def get_system_status():
-    heartbeats = get_heartbeats()
+def get_cached_heartbeats():
+    """
+    Get the heartbeats, retrieving them from Redis at most once every
+    HEARTBEAT_CACHE_TTL seconds in each process
+    """
+    cache = current_app.extensions.setdefault("heartbeat_cache", {})
+    ttl = float(current_app.config["HEARTBEAT_CACHE_TTL"])
+    now = time.monotonic()
+
+    if "heartbeats" not in cache or now - cache["fetched_at"] >= ttl:
+        cache["heartbeats"] = get_heartbeats()
+        cache["fetched_at"] = now
+
+    return cache["heartbeats"]
+
+
+def get_system_status(cached=True):
+    """
+    Get the system status
+
+    :param cached: Whether to use the heartbeats cached in this process
+                   instead of retrieving them from Redis
+    """
+    heartbeats = get_cached_heartbeats() if cached else get_heartbeats()
 
     return SystemStatus(heartbeats=heartbeats)
 
@@ -128,3 +180,60 @@ def get_available_object_count():
     pending_count -= len(get_enqueued_object_ids())
 
     return pending_count
+
+
+def get_cached_available_object_count():
+    """
+    Get the amount of objects that can be enqueued from the API cache.
+    The count is recomputed once it's older than
+    API_CACHE_AVAILABLE_OBJECT_COUNT_TTL seconds.
+
+    :returns: CacheEntry instance with the count in 'data["count"]'
+    """
+    return get_cached(
+        AVAILABLE_OBJECT_COUNT_CACHE_NAME,
+        lambda: {"count": get_available_object_count()}
+    )
+
+
+def invalidate_available_object_count():
+    """
+    Invalidate the cached amount of objects that can be enqueued after
+    objects have been enqueued
+    """
+    delete_cache_entry(AVAILABLE_OBJECT_COUNT_CACHE_NAME)
+
+
+def iter_object_id_chunks(object_ids):
+    """
+    Split object IDs into lists of at most OBJECT_ID_CHUNK_SIZE IDs
+    """
+    for i in range(0, len(object_ids), OBJECT_ID_CHUNK_SIZE):
+        yield list(object_ids[i:i+OBJECT_ID_CHUNK_SIZE])
+
+
+def get_missing_object_ids(object_ids):
+    """
+    Find the object IDs that don't exist.
+
+    The IDs are sent in chunks as arrays and joined against the object table
+    using 'unnest', which avoids creating huge 'IN (...)' lists.
+
+    :returns: Sorted list of missing object IDs
+    """
+    object_table = MuseumObject.__table__.name
+    query = text(
+        f"SELECT ids.id FROM unnest(CAST(:object_ids AS bigint[])) AS ids(id) "
+        f"WHERE NOT EXISTS ("
+        f"  SELECT 1 FROM {object_table} WHERE {object_table}.id = ids.id"
+        f")"
+    )
+
+    missing_object_ids = []
+    for chunk in iter_object_id_chunks(object_ids):
+        missing_object_ids += [
+            result.id for result in
+            db.session.execute(query, {"object_ids": chunk})
+        ]
+
+    return sorted(missing_object_ids)
@@ -1,45 +1,39 @@
-from flask import (Blueprint, flash, redirect, render_template, request,
-                   url_for)
+import time
+
+from flask import (Blueprint, abort, current_app, flash, redirect,
+                   render_template, request, url_for)
 from sqlalchemy import func
 
+from passari_web_ui.api.cache import get_cache_config
 from passari_web_ui.db import db
+from passari_web_ui.db.models import IndexedRejectedPackage, RejectionSignature
+from passari_web_ui.db.replica import read_replica
+from passari_web_ui.jobs import enqueue_job, get_job
+from passari_web_ui.jobs import freeze_objects as do_freeze_objects
+from passari_web_ui.jobs import reenqueue_objects as do_reenqueue_objects
+from passari_web_ui.jobs import unfreeze_objects as do_unfreeze_objects
+from passari_web_ui.profiling import (PERCENTILES, clear_endpoint_stats,
+                                      get_endpoint_stats)
+from passari_web_ui.rejections import (get_signature_counts_query,
+                                       get_signature_packages_query)
 from passari_web_ui.ui.forms import (EnqueueObjectsForm, FreezeObjectsForm,
-                                     ReenqueueObjectForm, UnfreezeObjectsForm)
-from passari_web_ui.ui.utils import get_available_object_count
-from passari_workflow.db.models import (FreezeSource, MuseumObject,
-                                        MuseumPackage)
+                                     ReenqueueObjectForm, ReenqueueObjectsForm,
+                                     UnfreezeObjectsForm)
+from passari_web_ui.ui.utils import (AVAILABLE_OBJECT_COUNT_CACHE_NAME,
+                                     get_cached_available_object_count,
+                                     get_system_status,
+                                     invalidate_available_object_count)
+from passari_workflow.db.models import MuseumObject, MuseumPackage
 from passari_workflow.exceptions import WorkflowJobRunningError
 from passari_workflow.scripts.deferred_enqueue_objects import \
     deferred_enqueue_objects as do_deferred_enqueue_objects
-from passari_workflow.scripts.freeze_objects import \
-    freeze_objects as do_freeze_objects
 from passari_workflow.scripts.reenqueue_object import \
     reenqueue_object as do_reenqueue_object
-from passari_workflow.scripts.unfreeze_objects import \
-    unfreeze_objects as do_unfreeze_objects
 
 routes = Blueprint(
     "ui", __name__, template_folder="templates", static_folder="static")
 
 
-def _get_existing_freeze_reasons():
-    """
-    Get existing freeze reasons as a list for use in input auto-completion
-    """
-    results = (
-        db.session.query(MuseumObject.freeze_reason)
-        # NOTE: 'MuseumObject.frozen == True' filter should keep the query
-        # performant unless a lot of objects are frozen over time. In that
-        # case, the 'MuseumObject.freeze_reason' field should be indexed
-        # in passari-workflow.
-        .filter(MuseumObject.frozen == True)
-        .group_by(MuseumObject.freeze_reason)
-        .all()
-    )
-
-    return [result[0] for result in results]
-
-
 @routes.route("/")
 def home():
     """
@@ -62,7 +56,27 @@ def system_status():
     Display system status to help determine if some features are not working
     correctly
     """
-    return render_template("tabs/system_status.html")
+    # Always display the latest heartbeats on this page
+    return render_template(
+        "tabs/system_status.html",
+        system_status=get_system_status(cached=False)
+    )
+
+
+@routes.route("/system-status/profiling/", methods=("GET", "POST"))
+def request_profiling():
+    """
+    Display percentiles of request timings for each endpoint
+    """
+    if request.method == "POST":
+        clear_endpoint_stats()
+        return redirect(url_for("ui.request_profiling"))
+
+    return render_template(
+        "tabs/request_profiling.html",
+        endpoint_stats=get_endpoint_stats(),
+        percentiles=PERCENTILES
+    )
 
 
 @routes.route("/reenqueue-object/", methods=("GET", "POST"))
@@ -105,17 +119,73 @@ def reenqueue_object_success():
     )
 
 
+@routes.route("/reenqueue-objects/", methods=("GET", "POST"))
+def reenqueue_objects():
+    """
+    Re-enqueue multiple rejected objects. Large amounts of objects are
+    re-enqueued in a background job.
+    """
+    object_ids = request.args.get("object_ids", "")
+    # Prepopulate the "object IDs" field if GET parameter was provided
+    form = ReenqueueObjectsForm(data={"object_ids": object_ids})
+
+    if form.validate_on_submit():
+        object_ids = form.object_ids.data
+
+        if len(object_ids) > current_app.config["BULK_OPERATION_SYNC_LIMIT"]:
+            job = enqueue_job(
+                do_reenqueue_objects, object_ids,
+                description=f"Re-enqueue {len(object_ids)} object(s)"
+            )
+            return redirect(url_for("ui.job_status", job_id=job.id))
+
+        result = do_reenqueue_objects(object_ids)
+        flash(result["message"], category="reenqueue_objects")
+        for object_id, error in result["errors"].items():
+            flash(f"{object_id}: {error}", category="reenqueue_objects_error")
+
+        return redirect(url_for("ui.reenqueue_objects_success"))
+
+    return render_template(
+        "tabs/reenqueue_objects/reenqueue_objects.html",
+        form=form
+    )
+
+
+@routes.route("/reenqueue-objects/success/")
+def reenqueue_objects_success():
+    """
+    Display the results of re-enqueuing multiple objects
+    """
+    return render_template(
+        "tabs/reenqueue_objects/reenqueue_objects_success.html"
+    )
+
+
+@routes.route("/jobs/<job_id>")
+def job_status(job_id):
+    """
+    Display the progress of a background job
+    """
+    job = get_job(job_id)
+    if not job:
+        abort(404)
+
+    return render_template("tabs/jobs/job_status.html", job=job)
+
+
 @routes.route("/enqueue-objects/", methods=("GET", "POST"))
 def enqueue_objects():
     """
     Enqueue objects pending preservation to the workflow
     """
-    available_count = get_available_object_count()
+    available_count = get_cached_available_object_count()
 
     form = EnqueueObjectsForm()
 
     if form.validate_on_submit():
         enqueued_count = do_deferred_enqueue_objects(form.object_count.data)
+        invalidate_available_object_count()
         flash(
             f"{enqueued_count} object(s) will be enqueued.",
             category="enqueue_objects"
@@ -124,7 +194,11 @@ def enqueue_objects():
 
     return render_template(
         "tabs/enqueue_objects/enqueue_objects.html",
-        available_count=available_count,
+        available_count=available_count.data["count"],
+        available_count_age=int(time.time() - available_count.generated_at),
+        available_count_ttl=get_cache_config(
+            AVAILABLE_OBJECT_COUNT_CACHE_NAME
+        )[0],
         form=form
     )
 
@@ -151,6 +225,7 @@ def manage_frozen_objects():
 
 
 @routes.route("/frozen-object-statistics/")
+@read_replica
 def frozen_object_statistics():
     """
     Display a list of freeze reasons sorted by occurrence count
@@ -171,6 +246,52 @@ def frozen_object_statistics():
     )
 
 
+@routes.route("/rejection-statistics/")
+@read_replica
+def rejection_statistics():
+    """
+    Display a list of errors in rejected SIPs sorted by occurrence count
+    """
+    page = int(request.args.get("page", 1))
+
+    pagination = get_signature_counts_query().paginate(
+        page=page,
+        per_page=current_app.config["REJECTION_STATISTICS_PAGE_SIZE"],
+        error_out=False
+    )
+
+    return render_template(
+        "tabs/rejection_statistics/rejection_statistics.html",
+        pagination=pagination,
+        indexed_package_count=db.session.query(IndexedRejectedPackage).count()
+    )
+
+
+@routes.route("/rejection-statistics/<int:signature_id>")
+@read_replica
+def rejection_statistics_packages(signature_id):
+    """
+    Display the rejected SIPs that contained a specific error
+    """
+    page = int(request.args.get("page", 1))
+
+    signature = db.session.query(RejectionSignature).get(signature_id)
+    if not signature:
+        abort(404)
+
+    pagination = get_signature_packages_query(signature_id).paginate(
+        page=page,
+        per_page=current_app.config["REJECTION_STATISTICS_PAGE_SIZE"],
+        error_out=False
+    )
+
+    return render_template(
+        "tabs/rejection_statistics/rejection_statistics_packages.html",
+        signature=signature,
+        pagination=pagination
+    )
+
+
 @routes.route("/freeze-objects/", methods=("GET", "POST"))
 def freeze_objects():
     """
@@ -180,39 +301,34 @@ def freeze_objects():
     # Prepopulate the "object IDs" field if GET parameter was provided
     form = FreezeObjectsForm(data={"object_ids": object_ids})
 
-    # Get a list of existing reasons to use for input auto-completion
-    freeze_reasons = _get_existing_freeze_reasons()
-
     if form.validate_on_submit():
-        object_ids = [object_id for object_id in form.object_ids.data]
+        object_ids = form.object_ids.data
+        reason = form.reason.data
 
-        try:
-            frozen_count, cancel_count = do_freeze_objects(
-                reason=form.reason.data if form.reason.data != "" else "",
-                object_ids=object_ids,
-                source=FreezeSource.USER
+        if len(object_ids) > current_app.config["BULK_OPERATION_SYNC_LIMIT"]:
+            job = enqueue_job(
+                do_freeze_objects, object_ids, reason,
+                description=f"Freeze {len(object_ids)} object(s)"
             )
+            return redirect(url_for("ui.job_status", job_id=job.id))
+
+        try:
+            result = do_freeze_objects(object_ids, reason)
         except WorkflowJobRunningError as exc:
             # Object couldn't be frozen because a workflow job was already
             # running
             return render_template(
                 "tabs/freeze_objects/freeze_objects.html",
                 form=form,
-                freeze_reasons=freeze_reasons,
                 error=str(exc)
             )
 
-        flash(
-            f"{frozen_count} object(s) were frozen, "
-            f"{cancel_count} package(s) were cancelled.",
-            category="freeze_objects"
-        )
+        flash(result["message"], category="freeze_objects")
         return redirect(url_for("ui.freeze_objects_success"))
 
     return render_template(
         "tabs/freeze_objects/freeze_objects.html",
-        form=form,
-        freeze_reasons=freeze_reasons
+        form=form
     )
 
 
@@ -235,24 +351,30 @@ def unfreeze_objects():
     # Prepopulate the "reason" field if GET parameter was provided
     form = UnfreezeObjectsForm(data={"reason": reason})
 
-    # Get a list of existing freeze reasons for input auto-completion
-    freeze_reasons = _get_existing_freeze_reasons()
-
     if form.validate_on_submit():
-        unfrozen_count = do_unfreeze_objects(
-            reason=form.reason.data,
-            enqueue=form.enqueue.data
-        )
-        flash(
-            f"{unfrozen_count} object(s) were unfrozen.",
-            category="unfreeze_objects"
+        reason = form.reason.data
+        enqueue = form.enqueue.data
+        object_count = (
+            db.session.query(MuseumObject)
+            .filter(MuseumObject.frozen)
+            .filter(MuseumObject.freeze_reason == reason)
+            .count()
         )
+
+        if object_count > current_app.config["BULK_OPERATION_SYNC_LIMIT"]:
+            job = enqueue_job(
+                do_unfreeze_objects, reason, enqueue,
+                description=f"Unfreeze {object_count} object(s)"
+            )
+            return redirect(url_for("ui.job_status", job_id=job.id))
+
+        result = do_unfreeze_objects(reason, enqueue)
+        flash(result["message"], category="unfreeze_objects")
         return redirect(url_for("ui.unfreeze_objects_success"))
 
     return render_template(
         "tabs/unfreeze_objects/unfreeze_objects.html",
-        form=form,
-        freeze_reasons=freeze_reasons
+        form=form
     )
 
 
@@ -299,6 +421,7 @@ def manage_sips():
 
 
 @routes.route("/manage-sips/<package_id>")
+@read_replica
 def view_single_sip(package_id):
     """
     View a SIP and its log files
@@ -0,0 +1,92 @@
+import time
+
+from passari_web_ui.api.cache import (COUNTERS_KEY, delete_cache_entry,
+                                      get_cache_counters, get_cached,
+                                      load_cache_entry, save_cache_entry)
+
+
+def test_get_cached(app, redis):
+    """
+    Test that a cached entry is computed once and then served from the cache
+    """
+    calls = []
+
+    def compute():
+        calls.append(True)
+        return {"value": len(calls)}
+
+    with app.app_context():
+        entry = get_cached("test_entry", compute)
+        assert entry.data == {"value": 1}
+
+        entry = get_cached("test_entry", compute)
+        assert entry.data == {"value": 1}
+
+        assert len(calls) == 1
+
+        # Hits are only added to the Redis counters periodically
+        assert redis.hget(COUNTERS_KEY, "test_entry:hit") is None
+
+        assert get_cache_counters()["test_entry"] == {
+            "miss": 1, "recompute": 1, "hit": 1
+        }
+
+
+def test_get_cached_expired(app, redis):
+    """
+    Test that an entry is recomputed once it is no longer fresh
+    """
+    app.config["API_CACHE_TEST_ENTRY_TTL"] = 0
+
+    with app.app_context():
+        save_cache_entry("test_entry", {"value": 1})
+        time.sleep(0.01)
+
+        entry = get_cached("test_entry", lambda: {"value": 2})
+        assert entry.data == {"value": 2}
+        assert load_cache_entry("test_entry").data == {"value": 2}
+
+
+def test_get_cached_deleted_during_compute(app, redis):
+    """
+    Test that an entry computed before the entry was deleted is not saved
+    """
+    def compute():
+        # The underlying data changes while the entry is being computed
+        delete_cache_entry("test_entry")
+        return {"value": 1}
+
+    with app.app_context():
+        entry = get_cached("test_entry", compute)
+        assert entry.data == {"value": 1}
+        assert load_cache_entry("test_entry") is None
+
+        entry = get_cached("test_entry", lambda: {"value": 2})
+        assert entry.data == {"value": 2}
+        assert load_cache_entry("test_entry").data == {"value": 2}
+
+
+def test_get_cached_stale_while_revalidate(app, redis):
+    """
+    Test that a stale entry is served instead of recomputing it if another
+    worker is already recomputing it
+    """
+    app.config["API_CACHE_TEST_ENTRY_TTL"] = 0
+
+    with app.app_context():
+        save_cache_entry("test_entry", {"value": 1})
+        time.sleep(0.01)
+
+        # Another worker is recomputing the entry
+        lock = redis.lock("test_entry:lock", timeout=10)
+        assert lock.acquire(blocking=False)
+
+        def compute():
+            raise AssertionError("Entry should not be recomputed")
+
+        entry = get_cached("test_entry", compute)
+        assert entry.data == {"value": 1}
+
+        counters = get_cache_counters()["test_entry"]
+        assert counters["stale"] == 1
+        assert "recompute" not in counters
@@ -0,0 +1,199 @@
+import datetime
+import time
+
+import pytest
+from passari_web_ui.api import search
+from passari_web_ui.api.search import (SEARCH_INDEXES, get_existing_index_names,
+                                       get_invalid_index_names,
+                                       get_search_backend)
+from passari_web_ui.commands import create_search_indexes
+from passari_web_ui.db import db
+from passari_workflow.db.models import MuseumObject
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+SEED_DATE = datetime.datetime(2019, 1, 2, 10, 0, 0, 0)
+
+WORDS = ("Painting", "Sculpture", "Photograph", "Manuscript", "Textile")
+REASONS = ("Missing metadata", "Missing images", "Unclear license")
+
+
+@pytest.fixture(autouse=True)
+def reset_index_status(monkeypatch):
+    """
+    Forget whether the full-text indexes exist between tests
+    """
+    monkeypatch.setattr(search, "_fulltext_index_status", {})
+
+
+def seed_frozen_objects(session, count):
+    """
+    Create 'count' frozen objects with varying titles and freeze reasons
+    """
+    session.bulk_insert_mappings(MuseumObject, [
+        {
+            "id": i,
+            "title": f"{WORDS[i % len(WORDS)]} number {i}",
+            "created_date": SEED_DATE,
+            "modified_date": SEED_DATE,
+            "frozen": True,
+            "freeze_reason": REASONS[i % len(REASONS)]
+        }
+        for i in range(1, count + 1)
+    ])
+    session.commit()
+
+
+def run_create_search_indexes(app):
+    result = app.test_cli_runner().invoke(
+        create_search_indexes, ["--no-concurrently"]
+    )
+    assert result.exit_code == 0, result.output
+
+    return result
+
+
+def test_create_search_indexes(app):
+    """
+    Test that the search indexes are created, and that running the command
+    again succeeds
+    """
+    with app.app_context():
+        assert get_existing_index_names() == set()
+
+    run_create_search_indexes(app)
+    result = run_create_search_indexes(app)
+    assert "Done" in result.output
+
+    with app.app_context():
+        assert get_existing_index_names() == set(
+            index.name for index in SEARCH_INDEXES
+        )
+
+
+def test_create_search_indexes_rebuild_invalid(app, session):
+    """
+    Test that an invalid index left behind by a failed concurrent build
+    is rebuilt instead of skipped
+    """
+    seed_frozen_objects(session, 5)
+    name = "ix_web_ui_trgm_museum_object_freeze_reason"
+
+    # Building a unique index concurrently on duplicate values fails,
+    # leaving an invalid index behind
+    with app.app_context():
+        engine = db.engine.execution_options(isolation_level="AUTOCOMMIT")
+        with engine.connect() as connection, pytest.raises(IntegrityError):
+            connection.execute(text(
+                f"CREATE UNIQUE INDEX CONCURRENTLY {name} "
+                f"ON {MuseumObject.__table__.name} (freeze_reason)"
+            ))
+
+    with app.app_context():
+        assert get_invalid_index_names() == {name}
+        assert name not in get_existing_index_names()
+
+    result = run_create_search_indexes(app)
+    assert f"Index {name} is invalid" in result.output
+
+    with app.app_context():
+        assert get_invalid_index_names() == set()
+        assert name in get_existing_index_names()
+
+
+def test_fulltext_backend_fallback(app):
+    """
+    Test that substring search is used if the full-text indexes don't exist
+    """
+    app.config["SEARCH_BACKEND"] = "fulltext"
+
+    with app.app_context():
+        assert get_search_backend() == "ilike"
+
+
+@pytest.mark.usefixtures("user")
+def test_fulltext_search(app, session, client):
+    """
+    Test searching frozen objects using full-text search
+    """
+    seed_frozen_objects(session, 20)
+    run_create_search_indexes(app)
+
+    app.config["SEARCH_BACKEND"] = "fulltext"
+
+    with app.app_context():
+        assert get_search_backend() == "fulltext"
+
+    # Word prefixes are matched
+    result = client.get(
+        "/api/list-frozen-objects?search=sculpt&limit=100"
+    ).json
+    assert result["result_count"] == 4
+    assert all(
+        "Sculpture" in museum_object["title"]
+        for museum_object in result["results"]
+    )
+
+    # All words must match
+    result = client.get(
+        "/api/list-frozen-objects?search=painting+number+10&limit=100"
+    ).json
+    assert result["result_count"] == 1
+    assert result["results"][0]["id"] == 10
+
+    # Freeze reasons are searched as well
+    result = client.get(
+        "/api/list-frozen-objects?search=licen&limit=100"
+    ).json
+    assert result["result_count"] == 7
+
+    # Substrings in the middle of words are not matched
+    result = client.get("/api/list-frozen-objects?search=ulptur").json
+    assert result["result_count"] == 0
+
+
+@pytest.mark.benchmark
+def test_search_benchmark(app, session):
+    """
+    Compare the latency of substring searches on a large seeded table
+    with and without the trigram indexes, and of full-text searches
+    """
+    seed_frozen_objects(session, 50000)
+
+    def measure(search_query):
+        with app.app_context():
+            query = db.session.query(MuseumObject.id).filter(
+                search.get_search_filter(
+                    search_query,
+                    text_columns=(
+                        MuseumObject.freeze_reason, MuseumObject.title
+                    )
+                )
+            )
+            # Warm up
+            query.all()
+
+            start = time.perf_counter()
+            ids = set(result.id for result in query.all())
+            return ids, time.perf_counter() - start
+
+    with app.app_context():
+        db.session.execute(f"ANALYZE {MuseumObject.__table__.name}")
+        db.session.commit()
+
+    scan_ids, scan_duration = measure("number 4999")
+
+    run_create_search_indexes(app)
+
+    trigram_ids, trigram_duration = measure("number 4999")
+
+    app.config["SEARCH_BACKEND"] = "fulltext"
+    fulltext_ids, fulltext_duration = measure("Manuscript 4999")
+
+    assert scan_ids == trigram_ids
+    assert scan_ids == set([4999] + list(range(49990, 50000)))
+    # 'Manuscript' titles are the ones where i % 5 == 3
+    assert fulltext_ids == set([49993, 49998])
+
+    assert trigram_duration < scan_duration
+    assert fulltext_duration < scan_duration
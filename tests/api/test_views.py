@@ -1,7 +1,19 @@
 import datetime
+import gzip
+import json
+import time
 
 import pytest
+from passari_web_ui.api.cache import get_cache_counters
+from passari_web_ui.commands import refresh_stats
+from passari_web_ui.db.models import (IndexedRejectedPackage,
+                                      PackageRejection, RejectionSignature)
+from passari_web_ui.db import db
+from passari_web_ui.jobs import WebUIWorker, get_web_ui_queue
+from passari_web_ui.stats import update_stats
+from passari_web_ui.timeseries import record_snapshot
 from passari_workflow.db.models import FreezeSource, MuseumObject
+from passari_workflow.heartbeat import HeartbeatSource, submit_heartbeat
 from passari_workflow.queue.queues import QueueType, get_queue
 from rq import SimpleWorker
 from rq.registry import StartedJobRegistry
@@ -20,7 +32,7 @@ def failing_job():
 @pytest.mark.usefixtures("user")
 class TestOverviewStats:
     def test_overview_stats(
-            self, session, client, museum_object_factory,
+            self, app, session, client, museum_object_factory,
             museum_package_factory):
         def successful_job():
             return ":)"
@@ -98,6 +110,9 @@ class TestOverviewStats:
             get_queue(QueueType.CONFIRM_SIP).enqueue(
                 successful_job, job_id=f"confirm_sip_{mus_id+i}")
 
+        with app.app_context():
+            update_stats()
+
         result = client.get("/api/overview-stats").json
 
         assert result["steps"]["pending"]["count"] == 1
@@ -113,10 +128,84 @@ class TestOverviewStats:
 
         assert result["total_count"] == 26
 
+    def test_overview_stats_not_refreshed(
+            self, client, museum_object_factory):
+        """
+        Test that the statistics are computed on demand if they haven't
+        been refreshed in the background
+        """
+        museum_object_factory()
+
+        result = client.get("/api/overview-stats").json
+
+        assert result["steps"]["pending"]["count"] == 1
+        assert result["total_count"] == 1
+
+    def test_overview_stats_refresh_command(
+            self, app, client, museum_object_factory):
+        """
+        Test refreshing the statistics using the CLI command
+        """
+        museum_object_factory()
+
+        result = app.test_cli_runner().invoke(refresh_stats, ["--once"])
+        assert result.exit_code == 0
+
+        result = client.get("/api/overview-stats").json
+        assert result["steps"]["pending"]["count"] == 1
+        assert result["total_count"] == 1
+
+    def test_overview_stats_not_modified(
+            self, app, client, museum_object_factory):
+        """
+        Test that statistics that haven't been recomputed are answered with
+        '304 Not Modified'
+        """
+        museum_object_factory()
+
+        with app.app_context():
+            update_stats()
+
+        result = client.get("/api/overview-stats")
+        etag = result.headers["ETag"]
+
+        assert etag.startswith('W/"')
+        assert "no-cache" in result.headers["Cache-Control"]
+
+        result = client.get(
+            "/api/overview-stats", headers={"If-None-Match": etag}
+        )
+        assert result.status_code == 304
+        assert result.data == b""
+        assert result.headers["ETag"] == etag
+
+        # Statistics are refreshed without changes
+        with app.app_context():
+            update_stats()
+
+        result = client.get(
+            "/api/overview-stats", headers={"If-None-Match": etag}
+        )
+        assert result.status_code == 304
+        assert result.headers["ETag"] == etag
+
+        # Statistics have changed
+        museum_object_factory()
+
+        with app.app_context():
+            update_stats()
+
+        result = client.get(
+            "/api/overview-stats", headers={"If-None-Match": etag}
+        )
+        assert result.status_code == 200
+        assert result.headers["ETag"] != etag
+        assert result.json["total_count"] == 2
+
 
 @pytest.mark.usefixtures("user")
 class TestNavbarStats:
-    def test_navbar_stats(self, session, client):
+    def test_navbar_stats(self, app, session, client):
         # Create 1 'download_object' job
         get_queue(QueueType.DOWNLOAD_OBJECT).enqueue(
             successful_job, job_id="download_object_1"
@@ -142,6 +231,9 @@ class TestNavbarStats:
         job = confirm_queue.enqueue(successful_job, job_id="confirm_sip_5")
         started_registry.add(job, -1)
 
+        with app.app_context():
+            update_stats()
+
         result = client.get("/api/navbar-stats").json
 
         assert result["queues"]["download_object"] \
@@ -158,6 +250,171 @@ class TestNavbarStats:
 
         assert result["failed"] == 1
 
+    def test_navbar_stats_not_modified(self, app, client):
+        with app.app_context():
+            update_stats()
+
+        etag = client.get("/api/navbar-stats").headers["ETag"]
+
+        result = client.get(
+            "/api/navbar-stats", headers={"If-None-Match": etag}
+        )
+        assert result.status_code == 304
+
+
+@pytest.mark.usefixtures("user")
+class TestSystemStatus:
+    def test_system_status(self, client):
+        result = client.get("/api/system-status").json
+
+        assert not result["all_ok"]
+        assert not result["any_overdue"]
+        heartbeat = result["heartbeats"]["sync_processed_sips"]
+        assert heartbeat["last_run"] is None
+        assert heartbeat["last_run_natural"] == "Never"
+        assert heartbeat["recent"] is None
+        assert heartbeat["interval"] > 0
+
+    def test_system_status_cached(self, app, client):
+        """
+        Test that the heartbeats are cached for HEARTBEAT_CACHE_TTL seconds
+        """
+        result = client.get("/api/system-status").json
+        assert result["heartbeats"]["sync_hashes"]["recent"] is None
+
+        submit_heartbeat(HeartbeatSource.SYNC_HASHES)
+
+        # Cached heartbeats are returned
+        result = client.get("/api/system-status").json
+        assert result["heartbeats"]["sync_hashes"]["recent"] is None
+
+        app.config["HEARTBEAT_CACHE_TTL"] = 0
+
+        result = client.get("/api/system-status").json
+        assert result["heartbeats"]["sync_hashes"]["recent"] is True
+        assert result["heartbeats"]["sync_hashes"]["last_run"] is not None
+
+
+@pytest.mark.usefixtures("user")
+class TestStatsHistory:
+    def test_stats_history(self, app, client, museum_object_factory):
+        """
+        Test that computed statistics are recorded in the time-series
+        """
+        museum_object_factory()
+
+        with app.app_context():
+            update_stats()
+
+        museum_object_factory()
+        get_queue(QueueType.DOWNLOAD_OBJECT).enqueue(
+            successful_job, job_id="download_object_1"
+        )
+
+        # Statistics computed by the API are recorded as well
+        app.config["API_CACHE_OVERVIEW_STATS_TTL"] = 0
+        client.get("/api/overview-stats")
+
+        result = client.get("/api/stats-history?resolution=second").json
+
+        assert result["resolution"] == "second"
+        snapshots = result["snapshots"]
+        assert snapshots[0]["steps"]["pending"] == 1
+        assert snapshots[-1]["steps"]["download_object"] == 1
+
+        result = client.get("/api/stats-history").json
+        assert result["resolution"] == "minute"
+        assert result["snapshots"][-1]["steps"]["download_object"] == 1
+
+    def test_stats_history_throughput(self, app, client):
+        with app.app_context():
+            record_snapshot(
+                {"steps": {"confirm_sip": {"count": 2}}},
+                timestamp=time.time() - 1800
+            )
+            record_snapshot(
+                {"steps": {"preserved": {"count": 2}}},
+                timestamp=time.time()
+            )
+
+        result = client.get("/api/stats-history").json
+
+        assert result["throughput"]["steps"]["confirm_sip"]["throughput"] \
+            == pytest.approx(4, rel=0.01)
+        assert result["throughput"]["backlog"]["count"] == 0
+
+        # Snapshots outside the window are not used
+        app.config["STATS_THROUGHPUT_WINDOW"] = 60
+
+        result = client.get("/api/stats-history").json
+        assert result["throughput"] is None
+
+    def test_stats_history_unknown_resolution(self, client):
+        result = client.get("/api/stats-history?resolution=week")
+
+        assert result.status_code == 400
+        assert result.json["error"] == "Unknown resolution 'week'"
+
+
+@pytest.mark.usefixtures("user")
+class TestStatsStream:
+    @pytest.fixture(autouse=True)
+    def stream_enabled(self, app):
+        app.config["STATS_STREAM_ENABLED"] = True
+
+    def test_stats_stream(self, app, client, museum_object_factory):
+        """
+        Test that the statistics are streamed once as server-sent events
+        when they don't change
+        """
+        app.config["STATS_STREAM_INTERVAL"] = 0.05
+        app.config["STATS_STREAM_MAX_DURATION"] = 0.3
+
+        museum_object_factory()
+
+        result = client.get("/api/stats-stream")
+
+        assert result.mimetype == "text/event-stream"
+
+        events = [
+            event for event in result.data.decode("utf-8").split("\n\n")
+            if event.startswith("event: ")
+        ]
+        assert len(events) == 2
+
+        name_line, data_line = events[0].split("\n")
+        assert name_line == "event: overview_stats"
+        assert json.loads(data_line[6:])["total_count"] == 1
+
+        assert events[1].startswith("event: navbar_stats\n")
+
+        # Checking the statistics in the stream is not counted as cache hits
+        with app.app_context():
+            counters = get_cache_counters()
+
+        assert "hit" not in counters["overview_stats"]
+
+    def test_stats_stream_single_event(self, app, client):
+        """
+        Test streaming only the requested statistics
+        """
+        app.config["STATS_STREAM_INTERVAL"] = 0.05
+        app.config["STATS_STREAM_MAX_DURATION"] = 0.1
+
+        result = client.get("/api/stats-stream?events=navbar_stats")
+
+        assert b"event: navbar_stats" in result.data
+        assert b"event: overview_stats" not in result.data
+
+    def test_stats_stream_disabled(self, app, client):
+        """
+        Test that the stream is not available if it has been disabled
+        """
+        app.config["STATS_STREAM_ENABLED"] = False
+
+        result = client.get("/api/stats-stream")
+        assert result.status_code == 404
+
 
 @pytest.mark.usefixtures("user")
 class TestListFrozenObjects:
@@ -217,6 +474,69 @@ class TestListFrozenObjects:
         assert result["results"][1]["title"] == "Object 11"
         assert result["results"][1]["reason"] == "Object 11 frozen"
 
+    def test_list_frozen_objects_cursor(
+            self, session, client, museum_object_factory):
+        """
+        Test paginating frozen objects using cursors
+        """
+        for i in range(0, 5):
+            museum_object_factory(
+                id=i, title=f"Object {i}", frozen=True,
+                freeze_reason="Test reason"
+            )
+
+        result = client.get(
+            "/api/list-frozen-objects",
+            query_string={"limit": 3, "cursor": "", "include_count": "false"}
+        ).json
+
+        assert [entry["id"] for entry in result["results"]] == [0, 1, 2]
+        assert result["result_count"] is None
+        assert result["prev_cursor"] is None
+
+        result = client.get(
+            "/api/list-frozen-objects",
+            query_string={"limit": 3, "cursor": result["next_cursor"]}
+        ).json
+
+        assert [entry["id"] for entry in result["results"]] == [3, 4]
+        assert result["result_count"] == 5
+        assert result["next_cursor"] is None
+
+    def test_list_frozen_objects_estimated_count(
+            self, app, session, client, museum_object_factory):
+        """
+        Test that the result count is estimated if the estimate exceeds
+        the configured threshold
+        """
+        app.config["EXACT_COUNT_THRESHOLD"] = -1
+
+        for i in range(0, 5):
+            museum_object_factory(id=i, frozen=True)
+
+        result = client.get("/api/list-frozen-objects").json
+
+        assert len(result["results"]) == 5
+        assert result["result_count_estimated"]
+        assert result["result_count"] >= 0
+
+    def test_list_frozen_objects_no_count(
+            self, session, client, museum_object_factory):
+        """
+        Test retrieving a page without counting the results
+        """
+        museum_object_factory(id=1, frozen=True)
+
+        result = client.get(
+            "/api/list-frozen-objects",
+            query_string={"include_count": "false"}
+        ).json
+
+        assert len(result["results"]) == 1
+        assert result["result_count"] is None
+        assert result["page_numbers"] == []
+        assert result["page_count"] is None
+
     def test_list_frozen_objects_empty(self, client):
         result = client.get("/api/list-frozen-objects").json
 
@@ -501,6 +821,364 @@ class TestListSips:
         assert result["results"][1]["filename"] == "testA.tar"
         assert result["results"][1]["queues"] == ["download_object"]
 
+    def test_list_sips_cursor(
+            self, client, session, museum_object_factory,
+            museum_package_factory):
+        """
+        Test paginating SIPs using cursors
+        """
+        museum_object = museum_object_factory(id=10, title="Object")
+
+        for i in range(1, 6):
+            museum_package_factory(
+                id=i, sip_filename=f"test{i}.tar",
+                museum_object=museum_object,
+                created_date=TEST_DATE + datetime.timedelta(days=i)
+            )
+
+        def get_page(**kwargs):
+            return client.get(
+                "/api/list-sips",
+                query_string=dict({"limit": 2}, **kwargs)
+            ).json
+
+        # Newest packages are returned first
+        result = get_page(cursor="")
+        assert [entry["id"] for entry in result["results"]] == [5, 4]
+        assert result["result_count"] == 5
+        assert not result["result_count_estimated"]
+        assert result["prev_cursor"] is None
+
+        result = get_page(
+            cursor=result["next_cursor"], include_count="false"
+        )
+        assert [entry["id"] for entry in result["results"]] == [3, 2]
+        assert result["result_count"] is None
+
+        result = get_page(cursor=result["next_cursor"])
+        assert [entry["id"] for entry in result["results"]] == [1]
+        assert result["next_cursor"] is None
+
+        # Return to the previous pages
+        result = get_page(cursor=result["prev_cursor"])
+        assert [entry["id"] for entry in result["results"]] == [3, 2]
+
+        result = get_page(cursor=result["prev_cursor"])
+        assert [entry["id"] for entry in result["results"]] == [5, 4]
+        assert result["prev_cursor"] is None
+
+    @pytest.mark.parametrize("cursor", [None, ""])
+    def test_list_sips_query_count(
+            self, client, session, sql_statements, museum_object_factory,
+            museum_package_factory, cursor):
+        """
+        Test that the amount of SQL statements per request doesn't depend
+        on the amount of results
+        """
+        def create_packages(start, count):
+            for i in range(start, start + count):
+                museum_package = museum_package_factory(
+                    id=i, sip_filename=f"test{i}.tar", rejected=True,
+                    museum_object=museum_object_factory(
+                        id=i, title=f"Object {i}"
+                    )
+                )
+                museum_package.museum_object.latest_package = museum_package
+                session.commit()
+
+        def count_statements():
+            query_string = {"limit": 50}
+            if cursor is not None:
+                query_string["cursor"] = cursor
+
+            del sql_statements[:]
+            result = client.get("/api/list-sips", query_string=query_string)
+            assert result.status_code == 200
+
+            return len(result.json["results"]), len(sql_statements)
+
+        create_packages(1, 2)
+        result_count, statement_count = count_statements()
+        assert result_count == 2
+
+        create_packages(3, 18)
+        result_count, many_statement_count = count_statements()
+        assert result_count == 20
+
+        assert statement_count == many_statement_count
+
+    def test_list_sips_invalid_cursor(self, client):
+        result = client.get(
+            "/api/list-sips", query_string={"cursor": "invalid"}
+        )
+
+        assert result.status_code == 400
+        assert result.json["error"] == "Invalid cursor"
+
+
+@pytest.mark.usefixtures("user")
+class TestExportSips:
+    @pytest.fixture(autouse=True)
+    def museum_packages(self, museum_object_factory, museum_package_factory):
+        for i in range(1, 6):
+            museum_package_factory(
+                id=i,
+                sip_filename=f"test{i}.tar",
+                created_date=TEST_DATE + datetime.timedelta(days=i),
+                uploaded=True,
+                rejected=i % 2 == 0,
+                preserved=i % 2 == 1,
+                museum_object=museum_object_factory(
+                    id=i * 10, title=f"Object {i}"
+                )
+            )
+
+    def test_export_sips_csv(self, client, monkeypatch):
+        # Use a small batch size to ensure results are streamed in
+        # multiple batches
+        monkeypatch.setattr(
+            "passari_web_ui.api.export.EXPORT_BATCH_SIZE", 2
+        )
+
+        result = client.get("/api/export-sips")
+
+        assert result.status_code == 200
+        assert result.mimetype == "text/csv"
+        assert result.headers["Content-Disposition"] == \
+            "attachment; filename=sips.csv"
+
+        lines = result.data.decode("utf-8").splitlines()
+        assert lines[0] == (
+            "id,filename,object_id,title,status,can_reenqueue,queues,uploaded"
+        )
+        assert lines[1] == "5,test5.tar,50,Object 5,preserved,False,,True"
+        assert lines[2] == "4,test4.tar,40,Object 4,rejected,False,,True"
+        assert [line.split(",")[0] for line in lines[1:]] == \
+            ["5", "4", "3", "2", "1"]
+
+    def test_export_sips_ndjson(self, client):
+        result = client.get(
+            "/api/export-sips",
+            query_string={
+                "format": "ndjson", "rejected": True, "search": "Object"
+            }
+        )
+
+        assert result.mimetype == "application/x-ndjson"
+
+        entries = [
+            json.loads(line) for line in result.data.decode().splitlines()
+        ]
+        assert entries == [
+            {
+                "id": 4,
+                "filename": "test4.tar",
+                "object_id": 40,
+                "title": "Object 4",
+                "status": "rejected",
+                "can_reenqueue": False,
+                "queues": [],
+                "uploaded": True
+            },
+            {
+                "id": 2,
+                "filename": "test2.tar",
+                "object_id": 20,
+                "title": "Object 2",
+                "status": "rejected",
+                "can_reenqueue": False,
+                "queues": [],
+                "uploaded": True
+            }
+        ]
+
+    def test_export_sips_empty(self, client):
+        result = client.get("/api/export-sips", query_string={"search": "nope"})
+
+        assert result.data.decode("utf-8").splitlines() == [
+            "id,filename,object_id,title,status,can_reenqueue,queues,uploaded"
+        ]
+
+    def test_export_sips_invalid_format(self, client):
+        result = client.get("/api/export-sips", query_string={"format": "xml"})
+
+        assert result.status_code == 400
+        assert result.json["error"] == "Unknown export format 'xml'"
+
+
+@pytest.mark.usefixtures("user")
+class TestExportFrozenObjects:
+    def test_export_frozen_objects(
+            self, client, museum_object_factory, monkeypatch):
+        monkeypatch.setattr(
+            "passari_web_ui.api.export.EXPORT_BATCH_SIZE", 3
+        )
+
+        for i in range(1, 11):
+            museum_object_factory(
+                id=i,
+                title=f"Object {i}",
+                frozen=True,
+                freeze_source=FreezeSource.USER,
+                freeze_reason="Reason A" if i <= 7 else "Reason B"
+            )
+        museum_object_factory(id=11, title="Object 11", frozen=False)
+
+        result = client.get(
+            "/api/export-frozen-objects", query_string={"search": "Reason A"}
+        )
+        assert result.headers["Content-Disposition"] == \
+            "attachment; filename=frozen_objects.csv"
+
+        lines = result.data.decode("utf-8").splitlines()
+        assert lines[0] == "id,latest_package_id,title,source,reason"
+        assert lines[1] == "1,,Object 1,user,Reason A"
+        assert len(lines) == 8
+
+        result = client.get(
+            "/api/export-frozen-objects", query_string={"format": "ndjson"}
+        )
+        entries = [
+            json.loads(line) for line in result.data.decode().splitlines()
+        ]
+        assert [entry["id"] for entry in entries] == list(range(1, 11))
+        assert entries[9] == {
+            "id": 10,
+            "latest_package_id": None,
+            "title": "Object 10",
+            "source": "user",
+            "reason": "Reason B"
+        }
+
+
+@pytest.mark.usefixtures("user")
+class TestListRejectionSignatures:
+    def test_list_rejection_signatures(
+            self, session, client, museum_object_factory,
+            museum_package_factory):
+        signature = RejectionSignature(
+            id=1, signature="ERROR: Missing checksum",
+            example="ERROR: Missing checksum"
+        )
+        session.add(signature)
+
+        for package_id in (1, 2):
+            museum_package_factory(
+                id=package_id, sip_filename=f"test{package_id}.tar",
+                rejected=True,
+                museum_object=museum_object_factory(id=package_id)
+            )
+            session.add(
+                IndexedRejectedPackage(
+                    package_id=package_id, indexed_date=TEST_DATE,
+                    rejections=[
+                        PackageRejection(
+                            signature=signature,
+                            log_filename="validation.log", line_number=1
+                        )
+                    ]
+                )
+            )
+        session.commit()
+
+        result = client.get("/api/list-rejection-signatures").json
+
+        assert result["results"] == [{
+            "id": 1,
+            "signature": "ERROR: Missing checksum",
+            "example": "ERROR: Missing checksum",
+            "package_count": 2
+        }]
+        assert result["result_count"] == 1
+
+
+@pytest.mark.usefixtures("user")
+class TestListFreezeReasons:
+    @pytest.fixture(autouse=True)
+    def frozen_objects(self, museum_object_factory):
+        reasons = (
+            ["Missing images"] * 3 + ["Missing metadata"] * 2
+            + ["Unclear license"] * 4
+        )
+        for i, reason in enumerate(reasons, start=1):
+            museum_object_factory(id=i, frozen=True, freeze_reason=reason)
+
+        # Reasons of objects that are no longer frozen are not included
+        museum_object_factory(
+            id=100, frozen=False, freeze_reason="Old reason"
+        )
+
+    def test_list_freeze_reasons(self, client):
+        result = client.get("/api/list-freeze-reasons").json
+        assert result["results"] == [
+            {"reason": "Unclear license", "count": 4},
+            {"reason": "Missing images", "count": 3},
+            {"reason": "Missing metadata", "count": 2}
+        ]
+
+    def test_list_freeze_reasons_not_modified(self, client):
+        result = client.get("/api/list-freeze-reasons")
+        etag = result.headers["ETag"]
+
+        result = client.get(
+            "/api/list-freeze-reasons", headers={"If-None-Match": etag}
+        )
+        assert result.status_code == 304
+
+        # Different search results have a different ETag
+        result = client.get(
+            "/api/list-freeze-reasons",
+            query_string={"search": "missing m"},
+            headers={"If-None-Match": etag}
+        )
+        assert result.status_code == 200
+        assert result.headers["ETag"] != etag
+
+    def test_list_freeze_reasons_prefix(self, client):
+        result = client.get(
+            "/api/list-freeze-reasons", query_string={"search": "missing m"}
+        ).json
+        assert result["results"] == [
+            {"reason": "Missing metadata", "count": 2}
+        ]
+
+        result = client.get(
+            "/api/list-freeze-reasons",
+            query_string={"search": "Missing", "limit": 1}
+        ).json
+        assert result["results"] == [
+            {"reason": "Missing images", "count": 3}
+        ]
+
+    def test_list_freeze_reasons_cached(
+            self, client, session, museum_object_factory):
+        """
+        Test that freeze reasons are cached until objects are frozen or
+        unfrozen using the web UI
+        """
+        result = client.get("/api/list-freeze-reasons").json
+        assert len(result["results"]) == 3
+
+        # Objects frozen outside the web UI are not included until the
+        # cache expires
+        museum_object_factory(id=200, frozen=True, freeze_reason="New reason")
+
+        result = client.get("/api/list-freeze-reasons").json
+        assert len(result["results"]) == 3
+
+        # Unfreezing invalidates the cache
+        result = client.post(
+            "/api/unfreeze-objects", data={"reason": "Missing metadata"}
+        )
+        assert result.json["count"] == 2
+
+        result = client.get("/api/list-freeze-reasons").json
+        assert result["results"] == [
+            {"reason": "Unclear license", "count": 4},
+            {"reason": "Missing images", "count": 3},
+            {"reason": "New reason", "count": 1}
+        ]
+
 
 @pytest.mark.usefixtures("user")
 class TestUnfreezeObjects:
@@ -646,3 +1324,336 @@ class TestReenqueueObject:
         ).json
         assert not result["success"]
         assert result["error"] == "Latest package testSIP.tar wasn't rejected"
+
+
+@pytest.mark.usefixtures("user")
+class TestGetLogFile:
+    @pytest.fixture(autouse=True)
+    def log_dir(self, log_root, museum_object_factory, museum_package_factory):
+        museum_package_factory(
+            id=1, sip_filename="test.tar",
+            museum_object=museum_object_factory(id=10, title="Object")
+        )
+
+        log_dir = log_root / "1"
+        log_dir.mkdir()
+
+        (log_dir / "create_sip.log").write_bytes(
+            b"".join(f"Line {i}\n".encode("utf-8") for i in range(0, 1000))
+        )
+
+        return log_dir
+
+    def get_log(self, client, log_filename="create_sip.log", **kwargs):
+        headers = kwargs.pop("headers", {})
+        return client.get(
+            "/api/get-log-file",
+            query_string=dict(
+                {"sip_filename": "test.tar", "log_filename": log_filename},
+                **kwargs
+            ),
+            headers=headers
+        )
+
+    def test_get_log_file(self, client, log_dir):
+        result = self.get_log(client)
+
+        assert result.status_code == 200
+        assert result.data == (log_dir / "create_sip.log").read_bytes()
+        assert result.headers["X-Log-Size"] == str(len(result.data))
+        assert result.headers["Content-Type"] == "text/plain; charset=utf-8"
+
+    def test_get_log_file_offset_length(self, client):
+        result = self.get_log(client, offset=7, length=14)
+
+        assert result.status_code == 200
+        assert result.data == b"Line 1\nLine 2\n"
+        assert result.headers["X-Log-Size"] == "8890"
+        assert "Content-Range" not in result.headers
+
+        # Reading past the end returns an empty response
+        result = self.get_log(client, offset=10000, length=10)
+        assert result.status_code == 200
+        assert result.data == b""
+
+    def test_get_log_file_tail(self, client):
+        result = self.get_log(client, tail=18)
+
+        assert result.status_code == 200
+        assert result.data == b"Line 998\nLine 999\n"
+
+    def test_get_log_file_range(self, client):
+        result = self.get_log(client, headers={"Range": "bytes=7-13"})
+
+        assert result.status_code == 206
+        assert result.data == b"Line 1\n"
+        assert result.headers["Content-Range"] == "bytes 7-13/8890"
+
+        result = self.get_log(client, headers={"Range": "bytes=-9"})
+        assert result.data == b"Line 999\n"
+
+        result = self.get_log(client, headers={"Range": "bytes=10000-"})
+        assert result.status_code == 416
+        assert result.headers["Content-Range"] == "bytes */8890"
+
+    def test_get_log_file_gzip(self, client, log_dir):
+        result = self.get_log(
+            client, headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert result.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(result.data) \
+            == (log_dir / "create_sip.log").read_bytes()
+
+        # Range requests are not compressed
+        result = self.get_log(
+            client, headers={"Accept-Encoding": "gzip", "Range": "bytes=0-6"}
+        )
+        assert "Content-Encoding" not in result.headers
+        assert result.data == b"Line 0\n"
+
+        # Parts requested using the query parameters are compressed
+        result = self.get_log(
+            client, offset=7, length=7, headers={"Accept-Encoding": "gzip"}
+        )
+        assert result.status_code == 200
+        assert result.headers["Content-Encoding"] == "gzip"
+        assert "Content-Range" not in result.headers
+        assert gzip.decompress(result.data) == b"Line 1\n"
+
+    def test_get_log_file_html(self, client, log_dir):
+        """
+        Test that HTML reports are returned as plain text
+        """
+        (log_dir / "report.html").write_text("<p>Report</p>")
+
+        result = self.get_log(client, log_filename="report.html")
+
+        assert result.data == b"<p>Report</p>"
+        assert result.headers["Content-Type"] == "text/plain; charset=utf-8"
+        assert result.headers["X-Content-Type-Options"] == "nosniff"
+
+    def test_get_log_file_invalid(self, client):
+        assert self.get_log(client, offset=-1).status_code == 400
+        assert self.get_log(client, log_filename="missing.log") \
+            .status_code == 404
+        assert self.get_log(client, log_filename="../logs/create_sip.log") \
+            .status_code == 404
+
+
+@pytest.mark.usefixtures("user")
+class TestSearchLogs:
+    @pytest.fixture(autouse=True)
+    def log_dir(self, log_root, museum_object_factory, museum_package_factory):
+        museum_package_factory(
+            id=1, sip_filename="test.tar",
+            museum_object=museum_object_factory(id=10, title="Object")
+        )
+
+        log_dir = log_root / "1"
+        log_dir.mkdir()
+
+        (log_dir / "create_sip.log").write_text(
+            "Starting\n"
+            "Downloading files\n"
+            "ERROR: File not found\n"
+            "Retrying\n"
+            "Done\n"
+        )
+        (log_dir / "validation.log").write_text(
+            "Validating\n"
+            "error: Invalid METS\n"
+        )
+
+        return log_dir
+
+    def search(self, client, **kwargs):
+        result = client.get(
+            "/api/search-logs",
+            query_string=dict({"sip_filename": "test.tar"}, **kwargs)
+        )
+        assert result.status_code == 200
+        assert result.mimetype == "application/x-ndjson"
+
+        entries = [
+            json.loads(line) for line in result.data.decode().splitlines()
+        ]
+        assert entries[-1]["type"] == "summary"
+
+        return entries[:-1], entries[-1]
+
+    def test_search_logs(self, client):
+        matches, summary = self.search(client, query="ERROR", context=1)
+
+        assert matches == [{
+            "type": "match",
+            "log_filename": "create_sip.log",
+            "line_number": 3,
+            "line": "ERROR: File not found",
+            "before": ["Downloading files"],
+            "after": ["Retrying"]
+        }]
+        assert summary == {
+            "type": "summary",
+            "match_count": 1,
+            "searched_filenames": ["create_sip.log", "validation.log"],
+            "limit_exceeded": None
+        }
+
+    def test_search_logs_ignore_case(self, client):
+        matches, _ = self.search(
+            client, query="error", ignore_case="true", context=0
+        )
+
+        assert [
+            (match["log_filename"], match["line_number"]) for match in matches
+        ] == [("create_sip.log", 3), ("validation.log", 2)]
+        assert matches[1]["before"] == []
+        assert matches[1]["after"] == []
+
+    def test_search_logs_context(self, client):
+        matches, _ = self.search(
+            client, query="in", log_filename="create_sip.log", context=2
+        )
+
+        assert [match["line_number"] for match in matches] == [1, 2, 4]
+        assert matches[0]["before"] == []
+        assert matches[0]["after"] == [
+            "Downloading files", "ERROR: File not found"
+        ]
+        # Matches at the end of the file have fewer lines after them
+        assert matches[2]["after"] == ["Done"]
+
+    def test_search_logs_literal(self, client):
+        """
+        Test that the query is searched as a literal substring instead of
+        a regular expression
+        """
+        matches, _ = self.search(client, query="^Done$")
+        assert matches == []
+
+        matches, _ = self.search(client, query="ERROR: File")
+        assert [match["line_number"] for match in matches] == [3]
+
+    def test_search_logs_limits(self, app, client):
+        app.config["LOG_SEARCH_MAX_MATCHES"] = 1
+
+        matches, summary = self.search(
+            client, query="e", ignore_case="true", context=1
+        )
+        assert len(matches) == 1
+        # Lines after the last match are still included
+        assert matches[0]["line_number"] == 2
+        assert matches[0]["after"] == ["ERROR: File not found"]
+        assert summary["limit_exceeded"] == "matches"
+        assert summary["searched_filenames"] == ["create_sip.log"]
+
+        app.config["LOG_SEARCH_MAX_MATCHES"] = 500
+        app.config["LOG_SEARCH_BYTE_LIMIT"] = 10
+
+        matches, summary = self.search(client, query="ERROR")
+        assert matches == []
+        assert summary["limit_exceeded"] == "bytes"
+
+    def test_search_logs_invalid(self, client):
+        def get_status_code(**kwargs):
+            return client.get(
+                "/api/search-logs",
+                query_string=dict({"sip_filename": "test.tar"}, **kwargs)
+            ).status_code
+
+        assert get_status_code(query="") == 400
+        assert get_status_code(query="ERROR", context=100) == 400
+        assert get_status_code(query="ERROR", log_filename="missing.log") \
+            == 404
+
+
+@pytest.mark.usefixtures("user")
+class TestReenqueueObjects:
+    @pytest.fixture(autouse=True)
+    def rejected_objects(
+            self, session, museum_object_factory, museum_package_factory):
+        """
+        Create objects 1-3 with rejected latest packages, and object 4
+        with a latest package that wasn't rejected
+        """
+        for object_id in range(1, 5):
+            museum_object = museum_object_factory(
+                id=object_id, created_date=TEST_DATE, modified_date=TEST_DATE
+            )
+            museum_package = museum_package_factory(
+                id=object_id, sip_filename=f"test{object_id}.tar",
+                museum_object=museum_object,
+                rejected=object_id != 4
+            )
+            museum_object.latest_package = museum_package
+            session.commit()
+
+    def test_reenqueue_objects(self, client):
+        result = client.post(
+            "/api/reenqueue-objects", data={"object_ids": "1,2,2"}
+        ).json
+
+        assert result["success"]
+        assert result["result"]["count"] == 2
+        assert result["result"]["error_count"] == 0
+
+        # The objects were re-enqueued
+        assert len(get_queue(QueueType.DOWNLOAD_OBJECT).job_ids) == 2
+
+    def test_reenqueue_objects_job(self, app, client):
+        """
+        Test re-enqueuing objects in a background job
+        """
+        app.config["BULK_OPERATION_SYNC_LIMIT"] = 1
+
+        result = client.post(
+            "/api/reenqueue-objects", data={"object_ids": "1,2,3"}
+        ).json
+        assert result["success"]
+        job_id = result["job_id"]
+
+        result = client.get(f"/api/job-status/{job_id}").json
+        assert result["status"] == "queued"
+        assert result["description"] == "Re-enqueue 3 object(s)"
+
+        with app.app_context():
+            queue = get_web_ui_queue()
+            WebUIWorker([queue], connection=queue.connection).work(
+                burst=True
+            )
+
+            # The database session used by the job was removed, so that
+            # the worker doesn't stay idle in a transaction
+            assert not db.session.registry.has()
+
+        result = client.get(f"/api/job-status/{job_id}").json
+        assert result["status"] == "finished"
+        assert result["progress"] == {"done": 3, "total": 3}
+        assert result["result"]["count"] == 3
+        assert result["error"] is None
+
+    def test_reenqueue_objects_invalid(self, client):
+        result = client.post(
+            "/api/reenqueue-objects", data={"object_ids": "1,4,5"}
+        ).json
+
+        assert not result["success"]
+        assert result["missing_object_ids"] == [5]
+        assert result["not_rejected_object_ids"] == [4]
+
+        result = client.post(
+            "/api/reenqueue-objects", data={"object_ids": "1,a"}
+        ).json
+        assert result["error"] == "Invalid object IDs"
+
+    def test_job_status_not_found(self, client):
+        result = client.get("/api/job-status/nonexistent")
+        assert result.status_code == 404
+
+        # Workflow jobs are not returned
+        get_queue(QueueType.DOWNLOAD_OBJECT).enqueue(
+            successful_job, job_id="download_object_1"
+        )
+        result = client.get("/api/job-status/download_object_1")
+        assert result.status_code == 404
@@ -3,7 +3,7 @@ import os
 import subprocess
 
 from flask_security import SQLAlchemySessionUserDatastore, hash_password
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 import fakeredis
 import pytest
@@ -18,6 +18,33 @@ from passari_workflow.db.models import Base, MuseumObject, MuseumPackage
 from pytest_postgresql.janitor import DatabaseJanitor
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", default=False,
+        help="Run the benchmarks marked with 'benchmark'"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "benchmark: slow test that measures performance on a large dataset"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip the benchmarks unless --benchmark is provided
+    """
+    if config.getoption("--benchmark"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="use --benchmark to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture(scope="function", autouse=True)
 def redis(monkeypatch):
     """
@@ -31,13 +58,29 @@ def redis(monkeypatch):
         lambda: conn
     )
     monkeypatch.setattr(
-        "passari_web_ui.api.views.get_redis_connection",
+        "passari_web_ui.api.cache.get_redis_connection",
         lambda: conn
     )
     monkeypatch.setattr(
         "passari_workflow.heartbeat.get_redis_connection",
         lambda: conn
     )
+    monkeypatch.setattr(
+        "passari_web_ui.jobs.get_redis_connection",
+        lambda: conn
+    )
+    monkeypatch.setattr(
+        "passari_web_ui.profiling.get_redis_connection",
+        lambda: conn
+    )
+    monkeypatch.setattr(
+        "passari_web_ui.timeseries.get_redis_connection",
+        lambda: conn
+    )
+    monkeypatch.setattr(
+        "passari_web_ui.stats.get_redis_connection",
+        lambda: conn
+    )
 
     yield conn
 
@@ -147,6 +190,26 @@ def app(session, database, engine):
     yield app
 
 
+@pytest.fixture(scope="function")
+def sql_statements(app):
+    """
+    Fixture for recording the SQL statements executed by the web application.
+
+    Yields a list that is appended with each executed SQL statement.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture(scope="function")
 def client(app):
     """
@@ -215,3 +278,31 @@ def museum_package_factory(session):
         return museum_package
 
     return func
+
+
+@pytest.fixture(scope="function")
+def log_root(tmp_path, monkeypatch):
+    """
+    Fixture for a directory containing the log files of each package in
+    a subdirectory named after the package ID
+    """
+    def get_log_filenames(museum_package):
+        log_dir = tmp_path / str(museum_package.id)
+        if not log_dir.is_dir():
+            return []
+
+        return sorted(path.name for path in log_dir.iterdir())
+
+    def get_log_file_content(museum_package, log_filename):
+        return (tmp_path / str(museum_package.id) / log_filename).read_text()
+
+    monkeypatch.setattr(MuseumPackage, "get_log_filenames", get_log_filenames)
+    monkeypatch.setattr(
+        MuseumPackage, "get_log_file_content", get_log_file_content
+    )
+    monkeypatch.setattr(
+        "passari_web_ui.api.logs.get_log_dir",
+        lambda museum_package: tmp_path / str(museum_package.id)
+    )
+
+    return tmp_path
@@ -0,0 +1,136 @@
+import pytest
+from passari_web_ui.stats import update_stats
+from passari_workflow.heartbeat import HeartbeatSource, submit_heartbeat
+from passari_workflow.queue.queues import QueueType, get_queue
+
+TOKEN = "test metrics token"
+
+
+def successful_job():
+    return ":)"
+
+
+def parse_metrics(text):
+    """
+    Parse metrics in the Prometheus text exposition format into
+    a {sample: value} dict
+    """
+    result = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+
+        sample, value = line.rsplit(" ", 1)
+        result[sample] = float(value)
+
+    return result
+
+
+class TestMetrics:
+    @pytest.fixture(autouse=True)
+    def metrics_token(self, app):
+        app.config["METRICS_TOKEN"] = TOKEN
+
+    def get_metrics(self, client, token=TOKEN):
+        return client.get(
+            "/metrics", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    def test_metrics(self, app, client, museum_object_factory):
+        museum_object_factory(frozen=True)
+        museum_object_factory()
+        get_queue(QueueType.CREATE_SIP).enqueue(
+            successful_job, job_id="create_sip_1"
+        )
+        submit_heartbeat(HeartbeatSource.SYNC_HASHES)
+
+        result = self.get_metrics(client)
+
+        assert result.status_code == 200
+        assert result.content_type.startswith("text/plain; version=0.0.4")
+
+        metrics = parse_metrics(result.data.decode("utf-8"))
+
+        assert metrics["passari_objects"] == 2
+        assert metrics['passari_objects_by_state{state="frozen"}'] == 1
+        assert metrics['passari_objects_by_state{state="create_sip"}'] == 1
+        assert metrics[
+            'passari_queue_jobs{queue="create_sip",status="pending"}'
+        ] == 1
+        assert metrics[
+            'passari_queue_jobs{queue="create_sip",status="processing"}'
+        ] == 0
+        assert metrics["passari_failed_jobs"] == 0
+        assert metrics['passari_stats_age_seconds{stats="overview_stats"}'] \
+            >= 0
+
+        # Heartbeat age is only reported for procedures that have been run
+        assert metrics['passari_heartbeat_age_seconds{source="sync_hashes"}'] \
+            < 60
+        assert 'passari_heartbeat_age_seconds{source="sync_objects"}' \
+            not in metrics
+        assert metrics['passari_heartbeat_overdue{source="sync_hashes"}'] == 0
+        assert metrics[
+            'passari_heartbeat_interval_seconds{source="sync_hashes"}'
+        ] > 0
+
+        assert metrics["passari_web_ui_redis_pool_max_connections"] == 50
+        assert 'passari_web_ui_redis_pool_connections{state="in_use"}' \
+            in metrics
+
+    def test_metrics_cached(self, app, client, sql_statements):
+        """
+        Test that precomputed statistics are served without database queries
+        """
+        with app.app_context():
+            update_stats()
+
+        del sql_statements[:]
+
+        result = self.get_metrics(client)
+
+        assert result.status_code == 200
+        assert sql_statements == []
+
+    def test_metrics_cache_counters(self, client):
+        """
+        Test that the API cache counters are included in the metrics
+        """
+        # Statistics haven't been refreshed yet, so they are computed
+        # on the first scrape and served from the cache on the second one
+        self.get_metrics(client)
+        metrics = parse_metrics(self.get_metrics(client).data.decode("utf-8"))
+
+        assert metrics[
+            'passari_web_ui_api_cache_events_total'
+            '{cache="overview_stats",event="miss"}'
+        ] == 1
+        assert metrics[
+            'passari_web_ui_api_cache_events_total'
+            '{cache="overview_stats",event="recompute"}'
+        ] == 1
+        assert metrics[
+            'passari_web_ui_api_cache_events_total'
+            '{cache="overview_stats",event="hit"}'
+        ] == 1
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {},
+            {"Authorization": "Bearer wrong token"},
+            {"Authorization": f"Basic {TOKEN}"}
+        ]
+    )
+    def test_metrics_unauthorized(self, client, headers):
+        result = client.get("/metrics", headers=headers)
+
+        assert result.status_code == 401
+        assert result.headers["WWW-Authenticate"] == "Bearer"
+
+    def test_metrics_disabled(self, app, client):
+        app.config["METRICS_TOKEN"] = None
+
+        result = self.get_metrics(client)
+
+        assert result.status_code == 404
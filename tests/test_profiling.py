@@ -0,0 +1,104 @@
+import pytest
+from passari_web_ui.profiling import get_endpoint_stats, get_percentile
+
+
+def parse_server_timing(header):
+    """
+    Parse a 'Server-Timing' header into a {name: (duration, desc)} dict
+    """
+    result = {}
+    for metric in header.split(","):
+        name, *params = [param.strip() for param in metric.split(";")]
+        params = dict(param.split("=", 1) for param in params)
+        result[name] = (float(params["dur"]), params.get("desc"))
+
+    return result
+
+
+@pytest.mark.parametrize(
+    "percentile,expected",
+    [(1, 1), (50, 5), (95, 10), (99, 10), (100, 10)]
+)
+def test_get_percentile(percentile, expected):
+    assert get_percentile(list(range(1, 11)), percentile) == expected
+
+
+def test_get_percentile_empty():
+    assert get_percentile([], 95) is None
+
+
+@pytest.mark.usefixtures("user")
+class TestRequestProfiling:
+    @pytest.fixture(autouse=True)
+    def enable_profiling(self, app):
+        app.config["PROFILING_ENABLED"] = True
+
+    def test_server_timing(self, client):
+        result = client.get("/api/list-sips")
+        timings = parse_server_timing(result.headers["Server-Timing"])
+
+        assert timings["total"][0] > 0
+        assert timings["db"][0] > 0
+        assert timings["db"][1].endswith(' queries"')
+        assert int(timings["db"][1].strip('"').split(" ")[0]) > 0
+        assert timings["redis"][1].endswith(' commands"')
+
+    def test_profiling_disabled(self, app, client):
+        app.config["PROFILING_ENABLED"] = False
+
+        result = client.get("/api/list-sips")
+
+        assert "Server-Timing" not in result.headers
+
+        with app.app_context():
+            assert get_endpoint_stats() == []
+
+    def test_endpoint_stats(self, app, client):
+        for _ in range(5):
+            client.get("/api/list-sips")
+        client.get("/api/navbar-stats")
+
+        with app.app_context():
+            stats = {entry["endpoint"]: entry for entry in get_endpoint_stats()}
+
+        assert stats["api.list_sips"]["count"] == 5
+        assert stats["api.navbar_stats"]["count"] == 1
+        assert stats["api.list_sips"]["db_count_p50"] > 0
+        assert (
+            stats["api.list_sips"]["total_p50"]
+            <= stats["api.list_sips"]["total_p99"]
+        )
+
+    def test_streaming_endpoint_excluded(self, app, client):
+        """
+        Test that streaming responses are not profiled
+        """
+        result = client.get("/api/export-sips")
+
+        assert result.status_code == 200
+        assert "Server-Timing" not in result.headers
+
+        with app.app_context():
+            assert get_endpoint_stats() == []
+
+    def test_sample_size(self, app, client):
+        app.config["PROFILING_SAMPLE_SIZE"] = 3
+
+        for _ in range(5):
+            client.get("/api/list-sips")
+
+        with app.app_context():
+            stats = get_endpoint_stats()
+
+        assert stats[0]["count"] == 3
+
+    def test_request_profiling_page(self, client):
+        client.get("/api/list-sips")
+
+        result = client.get("/web-ui/system-status/profiling/")
+        assert b"api.list_sips" in result.data
+
+        result = client.post(
+            "/web-ui/system-status/profiling/", follow_redirects=True
+        )
+        assert b"api.list_sips" not in result.data
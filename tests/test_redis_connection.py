@@ -0,0 +1,45 @@
+from passari_web_ui.redis_connection import (get_pool_stats,
+                                             get_redis_connection,
+                                             get_redis_url)
+
+
+def test_get_redis_url(app, monkeypatch):
+    monkeypatch.setattr(
+        "passari_web_ui.redis_connection.WORKFLOW_CONFIG",
+        {"redis": {"host": "localhost", "port": 6380, "password": "p@ss/w"}}
+    )
+
+    assert get_redis_url(app.config) == (
+        "redis://:p%40ss%2Fw@localhost:6380/0?socket_timeout=10"
+        "&socket_connect_timeout=5&health_check_interval=30"
+    )
+
+
+def test_get_redis_url_no_password(app, monkeypatch):
+    monkeypatch.setattr(
+        "passari_web_ui.redis_connection.WORKFLOW_CONFIG",
+        {"redis": {"host": "localhost", "port": 6379, "password": None}}
+    )
+
+    assert get_redis_url(app.config).startswith("redis://localhost:6379/0?")
+
+
+def test_shared_connection_pool(app):
+    """
+    Test that the same Redis client and connection pool are used for every
+    request
+    """
+    with app.test_request_context():
+        redis = get_redis_connection()
+
+    with app.test_request_context():
+        assert get_redis_connection() is redis
+
+    pool = redis.connection_pool
+    assert pool.max_connections == 50
+    assert pool.connection_kwargs["socket_timeout"] == 10
+    assert pool.connection_kwargs["socket_connect_timeout"] == 5
+    assert pool.connection_kwargs["health_check_interval"] == 30
+
+    with app.app_context():
+        assert get_pool_stats() == {"in_use": 0, "available": 0, "max": 50}
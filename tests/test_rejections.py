@@ -0,0 +1,165 @@
+import pytest
+from passari_web_ui.commands import index_rejections
+from passari_web_ui.db import db
+from passari_web_ui.db.models import (IndexedRejectedPackage,
+                                      PackageRejection, RejectionSignature)
+from passari_web_ui.rejections import (get_signature,
+                                       get_signature_counts_query,
+                                       get_signature_packages_query)
+
+
+@pytest.fixture(scope="function")
+def rejected_package_factory(
+        log_root, museum_object_factory, museum_package_factory):
+    """
+    Factory fixture for creating rejected packages with a log file
+    """
+    def func(package_id, log_content, rejected=True):
+        museum_package = museum_package_factory(
+            id=package_id, sip_filename=f"{package_id}.tar",
+            rejected=rejected,
+            museum_object=museum_object_factory(
+                id=package_id, title=f"Object {package_id}"
+            )
+        )
+
+        log_dir = log_root / str(package_id)
+        log_dir.mkdir()
+        (log_dir / "validation.log").write_text(log_content)
+        (log_dir / "report.html").write_text("<p>ERROR: ignored</p>")
+
+        return museum_package
+
+    return func
+
+
+def run_index_rejections(app, *args):
+    result = app.test_cli_runner().invoke(index_rejections, list(args))
+    assert result.exit_code == 0, result.output
+
+    return result
+
+
+def get_signature_counts(app):
+    with app.app_context():
+        return [
+            (signature.signature, count)
+            for signature, count in get_signature_counts_query().all()
+        ]
+
+
+@pytest.mark.parametrize("line,signature", [
+    (
+        "2020-01-02 10:00:00,123 ERROR: File /tmp/sip/1234.jpg is invalid",
+        "ERROR: File <PATH> is invalid"
+    ),
+    (
+        "[2020-01-02T10:00:00Z] Validation failed for 'image.tif' (3 errors)",
+        "Validation failed for '<STR>' (<N> errors)"
+    ),
+    (
+        "ERROR: Object 6a2f41a3-c54c-fce8-32d2-0324e1c32e22 failed",
+        "ERROR: Object <UUID> failed"
+    ),
+    (
+        "ERROR:   checksum   0123456789abcdef0123 mismatch",
+        "ERROR: checksum <HEX> mismatch"
+    )
+])
+def test_get_signature(line, signature):
+    assert get_signature(line) == signature
+
+
+def test_index_rejections(app, session, rejected_package_factory):
+    """
+    Test indexing rejected packages and that only new rejected packages
+    are indexed on subsequent runs
+    """
+    rejected_package_factory(
+        1,
+        "Starting validation\n"
+        "2020-01-02 10:00:00 ERROR: File /tmp/1/a.jpg is invalid\n"
+        "2020-01-02 10:00:01 ERROR: File /tmp/1/b.jpg is invalid\n"
+        "2020-01-02 10:00:02 ERROR: Missing checksum\n"
+    )
+    rejected_package_factory(
+        2,
+        "2020-01-03 10:00:00 ERROR: File /tmp/2/c.jpg is invalid\n"
+    )
+    # Packages that weren't rejected are not indexed
+    rejected_package_factory(
+        3, "ERROR: Temporary error\n", rejected=False
+    )
+
+    result = run_index_rejections(app)
+    assert "Indexed 2 SIP(s) with 3 error(s)" in result.output
+
+    assert get_signature_counts(app) == [
+        ("ERROR: File <PATH> is invalid", 2),
+        ("ERROR: Missing checksum", 1)
+    ]
+
+    with app.app_context():
+        signature = (
+            db.session.query(RejectionSignature)
+            .filter_by(signature="ERROR: File <PATH> is invalid")
+            .one()
+        )
+        assert signature.example == \
+            "2020-01-02 10:00:00 ERROR: File /tmp/1/a.jpg is invalid"
+
+        packages = get_signature_packages_query(signature.id).all()
+        assert [
+            (package.id, package.log_filename, package.line_number)
+            for package in packages
+        ] == [(2, "validation.log", 1), (1, "validation.log", 2)]
+
+    # Only the new package is indexed on the next run
+    rejected_package_factory(4, "ERROR: Missing checksum\n")
+
+    result = run_index_rejections(app)
+    assert "Indexed 1 SIP(s) with 1 error(s)" in result.output
+
+    assert get_signature_counts(app) == [
+        ("ERROR: File <PATH> is invalid", 2),
+        ("ERROR: Missing checksum", 2)
+    ]
+
+
+def test_index_rejections_unreadable_log(
+        app, session, log_root, rejected_package_factory):
+    """
+    Test that log files that can't be read are skipped and the package is
+    still indexed
+    """
+    rejected_package_factory(1, "ERROR: Missing checksum\n")
+    # Reading a directory raises an OSError
+    (log_root / "1" / "broken.log").mkdir()
+
+    result = run_index_rejections(app)
+    assert "Indexed 1 SIP(s) with 1 error(s)" in result.output
+
+    assert get_signature_counts(app) == [("ERROR: Missing checksum", 1)]
+
+    # The package is not indexed again
+    result = run_index_rejections(app)
+    assert "Indexed 0 SIP(s) with 0 error(s)" in result.output
+
+
+def test_index_rejections_full(app, session, rejected_package_factory):
+    """
+    Test reindexing all rejected packages
+    """
+    rejected_package_factory(1, "ERROR: Missing checksum\n")
+    rejected_package_factory(2, "No errors here\n")
+
+    run_index_rejections(app)
+    result = run_index_rejections(app, "--full")
+    assert "Indexed 2 SIP(s) with 1 error(s)" in result.output
+
+    assert get_signature_counts(app) == [("ERROR: Missing checksum", 1)]
+
+    with app.app_context():
+        # Packages without errors are recorded as indexed as well
+        assert db.session.query(IndexedRejectedPackage).count() == 2
+        assert db.session.query(PackageRejection).count() == 1
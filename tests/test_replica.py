@@ -0,0 +1,167 @@
+from flask import g
+from sqlalchemy import event
+
+import pytest
+from passari_web_ui.db import db
+from passari_web_ui.db.models import Role
+from passari_web_ui.db.replica import REPLICA_BIND, get_replica_lag
+
+
+@pytest.fixture(scope="function")
+def replica_statements(app, engine):
+    """
+    Fixture for a read replica that uses the test database.
+
+    Yields a list that is appended with each SQL statement executed on the
+    replica.
+    """
+    app.config["READ_REPLICA_DATABASE_URI"] = engine.url
+    app.config["SQLALCHEMY_BINDS"] = {REPLICA_BIND: engine.url}
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        replica_engine = db.get_engine(app, bind=REPLICA_BIND)
+
+    event.listen(
+        replica_engine, "before_cursor_execute", before_cursor_execute
+    )
+    yield statements
+    event.remove(
+        replica_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+    replica_engine.dispose()
+
+
+def _get_queries(statements):
+    """
+    Get the statements excluding the replica lag checks
+    """
+    return [
+        statement for statement in statements
+        if "pg_is_in_recovery" not in statement
+    ]
+
+
+@pytest.mark.usefixtures("user")
+class TestReadReplica:
+    def test_read_only_endpoint(
+            self, client, replica_statements, museum_object_factory):
+        museum_object_factory(id=1, frozen=True, freeze_reason="Test")
+
+        result = client.get("/api/list-frozen-objects").json
+        assert result["results"][0]["id"] == 1
+
+        assert any(
+            "museum_objects" in statement
+            for statement in _get_queries(replica_statements)
+        )
+
+    def test_view_single_sip(
+            self, client, replica_statements, museum_object_factory,
+            museum_package_factory):
+        museum_package_factory(
+            id=1, sip_filename="test.tar",
+            museum_object=museum_object_factory(id=10)
+        )
+
+        result = client.get("/web-ui/manage-sips/1")
+        assert result.status_code == 200
+
+        assert any(
+            "museum_packages" in statement
+            for statement in _get_queries(replica_statements)
+        )
+
+    def test_flush_uses_primary(self, app, replica_statements):
+        """
+        Test that writes are sent to the primary database even when the
+        replica is used for queries
+        """
+        with app.test_request_context():
+            g.use_read_replica = True
+
+            assert db.session.get_bind() \
+                is db.get_engine(app, bind=REPLICA_BIND)
+
+            db.session.add(Role(name="test"))
+            db.session.flush()
+            db.session.rollback()
+
+        assert not any(
+            statement.startswith("INSERT") for statement in replica_statements
+        )
+
+    def test_not_read_only_endpoint(
+            self, client, replica_statements, museum_object_factory):
+        museum_object_factory(id=1)
+
+        result = client.post(
+            "/web-ui/freeze-objects/",
+            data={"object_ids": "1", "reason": "Test"}
+        )
+        assert result.status_code == 302
+
+        assert _get_queries(replica_statements) == []
+
+    def test_freeze_reasons_use_primary(
+            self, client, replica_statements, museum_object_factory):
+        """
+        Test that freeze reasons are cached from the primary database,
+        since they are refilled right after objects have been frozen
+        """
+        museum_object_factory(id=1, frozen=True, freeze_reason="Test")
+
+        result = client.get("/api/list-freeze-reasons").json
+        assert result["results"] == [{"reason": "Test", "count": 1}]
+
+        assert _get_queries(replica_statements) == []
+
+    def test_get_replica_lag(self, app, replica_statements):
+        """
+        Test that the lag can be checked. The test database is not a replica,
+        so there is no lag.
+        """
+        with app.app_context():
+            assert get_replica_lag() == 0
+
+    def test_replica_lagging(
+            self, app, client, replica_statements, monkeypatch):
+        """
+        Test that the primary database is used if the replica lags behind
+        too much
+        """
+        monkeypatch.setattr(
+            "passari_web_ui.db.replica.get_replica_lag", lambda: 11
+        )
+
+        client.get("/api/list-frozen-objects")
+        assert _get_queries(replica_statements) == []
+
+        app.config["READ_REPLICA_MAX_LAG"] = 15
+        # Lag is cached for READ_REPLICA_LAG_CHECK_INTERVAL seconds
+        app.config["READ_REPLICA_LAG_CHECK_INTERVAL"] = 0
+
+        client.get("/api/list-frozen-objects")
+        assert _get_queries(replica_statements)
+
+    def test_replica_unavailable(
+            self, app, client, replica_statements, monkeypatch):
+        monkeypatch.setattr(
+            "passari_web_ui.db.replica.get_replica_lag", lambda: None
+        )
+
+        result = client.get("/api/list-frozen-objects")
+
+        assert result.status_code == 200
+        assert _get_queries(replica_statements) == []
+
+    def test_replica_not_configured(self, app, client, sql_statements):
+        result = client.get("/api/list-frozen-objects")
+
+        assert result.status_code == 200
+        assert sql_statements
@@ -0,0 +1,211 @@
+import datetime
+import time
+
+from sqlalchemy import and_
+
+import pytest
+from passari_web_ui.db import db
+from passari_web_ui.stats import get_object_counts, get_queue_counts
+from passari_workflow.db.models import MuseumObject, MuseumPackage
+from passari_workflow.queue.queues import QueueType, get_queue
+from rq.registry import FailedJobRegistry, StartedJobRegistry
+
+SEED_DATE = datetime.datetime(2019, 1, 2, 10, 0, 0, 0)
+PACKAGE_DATE = datetime.datetime(2019, 1, 3, 10, 0, 0, 0)
+
+
+def successful_job():
+    return ":)"
+
+
+def get_object_counts_legacy():
+    """
+    Retrieve the object counts using one query per count, as was done
+    before 'get_object_counts' was introduced
+    """
+    total_count = db.session.query(MuseumObject).count()
+
+    frozen_count = (
+        db.session.query(MuseumObject)
+        .filter(MuseumObject.frozen)
+        .count()
+    )
+
+    submitted_count = (
+        db.session.query(MuseumObject)
+        .join(
+            MuseumPackage, MuseumObject.latest_package_id == MuseumPackage.id
+        )
+        .filter(
+            and_(
+                MuseumObject.latest_package,
+                MuseumPackage.rejected == False,
+                MuseumPackage.preserved == False,
+                MuseumPackage.uploaded
+            )
+        )
+        .count()
+    )
+
+    rejected_count = (
+        db.session.query(MuseumObject)
+        .join(
+            MuseumPackage, MuseumObject.latest_package_id == MuseumPackage.id
+        ).filter(
+            and_(MuseumObject.latest_package, MuseumPackage.rejected)
+        )
+        .count()
+    )
+
+    preserved_count = (
+        db.session.query(MuseumObject)
+        .with_transformation(MuseumObject.exclude_preservation_pending)
+        .filter(MuseumObject.preserved)
+        .count()
+    )
+
+    return {
+        "total": total_count,
+        "frozen": frozen_count,
+        "submitted": submitted_count,
+        "rejected": rejected_count,
+        "preserved": preserved_count
+    }
+
+
+def seed_objects(session, count):
+    """
+    Create 'count' objects with the latest package in different states.
+
+    Objects are cycled through the states 'pending', 'frozen', 'submitted',
+    'rejected' and 'preserved'.
+    """
+    objects = []
+    packages = []
+
+    for i in range(1, count + 1):
+        state = i % 5
+        objects.append({
+            "id": i,
+            "title": f"Object {i}",
+            "created_date": SEED_DATE,
+            "modified_date": SEED_DATE,
+            "frozen": state == 1,
+            "preserved": state == 4
+        })
+
+        if state in (2, 3, 4):
+            packages.append({
+                "id": i,
+                "museum_object_id": i,
+                "sip_filename": f"{i}.tar",
+                "object_modified_date": PACKAGE_DATE,
+                "uploaded": True,
+                "rejected": state == 3,
+                "preserved": state == 4
+            })
+
+    session.bulk_insert_mappings(MuseumObject, objects)
+    session.bulk_insert_mappings(MuseumPackage, packages)
+    session.query(MuseumObject).filter(
+        MuseumObject.id.in_([package["id"] for package in packages])
+    ).update(
+        {MuseumObject.latest_package_id: MuseumObject.id},
+        synchronize_session=False
+    )
+    session.commit()
+
+
+def test_object_counts(app, session):
+    """
+    Test that the single aggregate query returns the same counts as the
+    individual queries
+    """
+    seed_objects(session, 50)
+
+    with app.app_context():
+        counts = get_object_counts()
+        assert counts == get_object_counts_legacy()
+
+    assert counts == {
+        "total": 50,
+        "frozen": 10,
+        "submitted": 10,
+        "rejected": 10,
+        "preserved": 10
+    }
+
+
+@pytest.mark.benchmark
+def test_object_counts_benchmark(app, session, sql_statements):
+    """
+    Compare the query count and wall time of the single aggregate query
+    against the individual queries on a seeded database
+    """
+    seed_objects(session, 20000)
+
+    with app.app_context():
+        # Warm up the connection pool before measuring
+        db.session.execute("SELECT 1")
+        del sql_statements[:]
+
+        start = time.perf_counter()
+        legacy_counts = get_object_counts_legacy()
+        legacy_duration = time.perf_counter() - start
+        legacy_query_count = len(sql_statements)
+        del sql_statements[:]
+
+        start = time.perf_counter()
+        counts = get_object_counts()
+        duration = time.perf_counter() - start
+        query_count = len(sql_statements)
+
+    assert counts == legacy_counts
+    assert legacy_query_count == 5
+    assert query_count == 1
+    assert duration < legacy_duration
+
+
+def test_queue_counts(redis, monkeypatch):
+    """
+    Test that the queue and registry counts are retrieved in a single
+    Redis round trip and match the counts reported by RQ
+    """
+    create_queue = get_queue(QueueType.CREATE_SIP)
+    for i in range(1, 4):
+        create_queue.enqueue(successful_job, job_id=f"create_sip_{i}")
+
+    confirm_queue = get_queue(QueueType.CONFIRM_SIP)
+    job = confirm_queue.enqueue(successful_job, job_id="confirm_sip_4")
+    StartedJobRegistry(queue=confirm_queue).add(job, -1)
+    # Expired entry that would be moved to the failed job registry by RQ
+    confirm_queue.enqueue(successful_job, job_id="confirm_sip_5")
+    redis.zadd(
+        StartedJobRegistry(queue=confirm_queue).key, {"confirm_sip_5": 1}
+    )
+
+    job = create_queue.enqueue(successful_job, job_id="create_sip_6")
+    FailedJobRegistry(queue=create_queue).add(job, 3600)
+
+    # Each command or pipeline retrieves a connection from the pool
+    # once, so count those to count the round trips
+    get_connection = redis.connection_pool.get_connection
+    round_trips = []
+
+    def counting_get_connection(*args, **kwargs):
+        round_trips.append(args)
+        return get_connection(*args, **kwargs)
+
+    monkeypatch.setattr(
+        redis.connection_pool, "get_connection", counting_get_connection
+    )
+
+    counts = get_queue_counts()
+
+    assert len(round_trips) == 1
+    assert counts == {
+        "download_object": {"pending": 0, "processing": 0, "failed": 0},
+        "create_sip": {"pending": 4, "processing": 0, "failed": 1},
+        "submit_sip": {"pending": 0, "processing": 0, "failed": 0},
+        "confirm_sip": {"pending": 2, "processing": 1, "failed": 1}
+    }
@@ -0,0 +1,154 @@
+import pytest
+from passari_web_ui.timeseries import (get_completed_counts, get_snapshots,
+                                       get_throughput, record_snapshot)
+
+START_TIME = 1577872800  # 2020-01-01 10:00:00 UTC
+
+
+def get_stats(**counts):
+    """
+    Create 'Overview' statistics with the given step counts
+    """
+    steps = {
+        "pending": 0, "download_object": 0, "create_sip": 0,
+        "submit_sip": 0, "submitted": 0, "confirm_sip": 0, "preserved": 0,
+        "rejected": 0, "frozen": 0, "failed": 0
+    }
+    steps.update(counts)
+
+    return {
+        "steps": {name: {"count": count} for name, count in steps.items()},
+        "total_count": sum(steps.values())
+    }
+
+
+def create_snapshot(timestamp, **counts):
+    return {
+        "timestamp": timestamp,
+        "steps": {
+            name: entry["count"]
+            for name, entry in get_stats(**counts)["steps"].items()
+        }
+    }
+
+
+def test_record_snapshot():
+    record_snapshot(get_stats(pending=5), timestamp=START_TIME)
+
+    for resolution in ("second", "minute", "hour"):
+        snapshots = get_snapshots(resolution)
+        assert len(snapshots) == 1
+        assert snapshots[0]["timestamp"] == START_TIME
+        assert snapshots[0]["steps"]["pending"] == 5
+
+
+def test_record_snapshot_downsample():
+    """
+    Test that only the latest snapshot within each bucket is kept
+    """
+    # Three minutes of snapshots every 10 seconds
+    for i in range(18):
+        record_snapshot(
+            get_stats(pending=i), timestamp=START_TIME + i * 10
+        )
+
+    assert len(get_snapshots("second")) == 18
+
+    snapshots = get_snapshots("minute")
+    assert [snapshot["steps"]["pending"] for snapshot in snapshots] \
+        == [5, 11, 17]
+
+    snapshots = get_snapshots("hour")
+    assert len(snapshots) == 1
+    assert snapshots[0]["steps"]["pending"] == 17
+
+
+def test_record_snapshot_bounded():
+    """
+    Test that only the most recent buckets are kept
+    """
+    for i in range(700):
+        record_snapshot(get_stats(pending=i), timestamp=START_TIME + i)
+
+    snapshots = get_snapshots("second")
+    assert len(snapshots) == 600
+    assert snapshots[0]["steps"]["pending"] == 100
+    assert snapshots[-1]["steps"]["pending"] == 699
+
+
+def test_get_snapshots_since():
+    for i in range(5):
+        record_snapshot(get_stats(), timestamp=START_TIME + i * 60)
+
+    snapshots = get_snapshots("minute", since=START_TIME + 120)
+    assert [snapshot["timestamp"] for snapshot in snapshots] == [
+        START_TIME + 120, START_TIME + 180, START_TIME + 240
+    ]
+
+
+def test_get_snapshots_unknown_resolution():
+    with pytest.raises(ValueError):
+        get_snapshots("week")
+
+
+def test_get_completed_counts():
+    completed = get_completed_counts(
+        create_snapshot(
+            START_TIME, pending=100, download_object=1, create_sip=2,
+            submit_sip=3, submitted=4, confirm_sip=5, preserved=6,
+            rejected=7
+        )["steps"]
+    )
+
+    assert completed == {
+        "confirm_sip": 13,
+        "submit_sip": 22,
+        "create_sip": 25,
+        "download_object": 27
+    }
+
+
+def test_get_throughput():
+    # In one hour, 10 objects were preserved and 20 objects were enqueued
+    # in 'download_object'
+    snapshots = [
+        create_snapshot(START_TIME, pending=100, confirm_sip=10),
+        create_snapshot(
+            START_TIME + 1800, pending=90, download_object=10, confirm_sip=5,
+            preserved=5
+        ),
+        create_snapshot(
+            START_TIME + 3600, pending=80, download_object=20, preserved=10
+        )
+    ]
+
+    throughput = get_throughput(snapshots)
+
+    assert throughput["start"] == START_TIME
+    assert throughput["end"] == START_TIME + 3600
+
+    assert throughput["steps"]["confirm_sip"] == {
+        "count": 0,
+        "throughput": 10.0,
+        "trend": -10.0,
+        "drain_time": 0
+    }
+    # Nothing has been downloaded
+    assert throughput["steps"]["download_object"] == {
+        "count": 20,
+        "throughput": 0,
+        "trend": 20.0,
+        "drain_time": None
+    }
+
+    # 100 objects in the backlog are processed at 10 objects per hour
+    assert throughput["backlog"] == {
+        "count": 100,
+        "throughput": 10.0,
+        "drain_time": 36000.0
+    }
+
+
+def test_get_throughput_not_enough_snapshots():
+    assert get_throughput([]) is None
+    assert get_throughput([create_snapshot(START_TIME)]) is None
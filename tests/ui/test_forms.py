@@ -0,0 +1,104 @@
+import datetime
+
+import pytest
+from passari_web_ui.ui.forms import FreezeObjectsForm
+from passari_workflow.db.models import MuseumObject
+
+TEST_DATE = datetime.datetime(2019, 1, 1, 0, 0)
+
+
+def validate_freeze_form(app, object_ids):
+    """
+    Validate a FreezeObjectsForm with the given object ID input
+
+    :returns: Validated form
+    """
+    with app.test_request_context(
+            method="POST",
+            data={"object_ids": object_ids, "reason": "Test reason"}):
+        form = FreezeObjectsForm()
+        form.validate()
+
+        return form
+
+
+class TestMultipleObjectIDField:
+    @pytest.fixture(autouse=True)
+    def museum_objects(self, session):
+        session.bulk_insert_mappings(MuseumObject, [
+            {"id": i, "created_date": TEST_DATE, "modified_date": TEST_DATE}
+            for i in range(1, 1001)
+        ])
+        session.commit()
+
+    def test_separators(self, app):
+        """
+        Test that object IDs can be separated by commas and whitespace
+        """
+        form = validate_freeze_form(app, " 1,2 3\n4\r\n5,\t6 ,, 7\n")
+
+        assert not form.errors
+        assert form.object_ids.data == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_duplicates(self, app):
+        """
+        Test that duplicate object IDs are removed and the order is kept
+        """
+        form = validate_freeze_form(app, "3\n1\n3\n2\n1")
+
+        assert not form.errors
+        assert form.object_ids.data == [3, 1, 2]
+
+    def test_invalid_object_id(self, app):
+        form = validate_freeze_form(app, "1\nfoo\n2")
+
+        assert form.errors["object_ids"] == ["Object IDs must be integers"]
+        # Input is displayed as-is
+        assert form.object_ids._value() == "1\nfoo\n2"
+
+    def test_empty(self, app):
+        form = validate_freeze_form(app, " \n ")
+
+        assert form.errors["object_ids"] == ["No object ID was provided"]
+
+    def test_missing_object_ids_capped(self, app):
+        """
+        Test that only a limited amount of missing object IDs are listed
+        """
+        form = validate_freeze_form(
+            app, "\n".join(str(i) for i in range(1050, 995, -1))
+        )
+
+        assert form.errors["object_ids"] == [
+            "Following objects don't exist: "
+            + ", ".join(str(i) for i in range(1001, 1021))
+            + " and 30 more"
+        ]
+
+    @pytest.mark.parametrize(
+        "count",
+        [
+            1000,
+            pytest.param(100000, marks=pytest.mark.benchmark),
+            pytest.param(1000000, marks=pytest.mark.benchmark)
+        ]
+    )
+    def test_validation_large(self, app, count):
+        """
+        Test validating large amounts of object IDs, of which all but the
+        first 1000 are missing
+        """
+        object_ids = "\n".join(str(i) for i in range(1, count + 1))
+
+        form = validate_freeze_form(app, object_ids)
+
+        assert len(form.object_ids.data) == count
+
+        if count == 1000:
+            assert not form.errors
+        else:
+            assert form.errors["object_ids"] == [
+                "Following objects don't exist: "
+                + ", ".join(str(i) for i in range(1001, 1021))
+                + f" and {count - 1020} more"
+            ]
@@ -3,15 +3,26 @@ import datetime
 from flask import escape
 
 import pytest
+from passari_web_ui.db.models import (IndexedRejectedPackage,
+                                      PackageRejection, RejectionSignature)
+from passari_web_ui.jobs import WebUIWorker, get_web_ui_queue
 from passari_workflow.db.models import FreezeSource, MuseumObject
 from passari_workflow.heartbeat import HeartbeatSource, submit_heartbeat
 from passari_workflow.queue.queues import QueueType, get_queue
-from rq import SimpleWorker
 from rq.registry import StartedJobRegistry
 
 TEST_DATE = datetime.datetime(2019, 1, 1, 0, 0)
 
 
+def _run_web_ui_worker(app):
+    """
+    Process all queued web UI jobs
+    """
+    with app.app_context():
+        queue = get_web_ui_queue()
+        WebUIWorker([queue], connection=queue.connection).work(burst=True)
+
+
 @pytest.mark.usefixtures("user")
 class TestChangePassword:
     def test_change_password(self, session, client, app):
@@ -87,6 +98,22 @@ class TestSystemStatus:
 
         assert result.data.count(b"Inactive</span>") == 1
 
+    def test_system_status_not_retrieved(self, client, monkeypatch):
+        """
+        Test that heartbeats are not retrieved for pages other than the
+        'System status' page
+        """
+        def get_heartbeats():
+            raise AssertionError("Heartbeats were retrieved")
+
+        monkeypatch.setattr(
+            "passari_web_ui.ui.utils.get_heartbeats", get_heartbeats
+        )
+
+        result = client.get("/web-ui/overview/")
+        assert result.status_code == 200
+        assert b'id="system_status_overdue_badge"' in result.data
+
 
 @pytest.mark.usefixtures("user")
 class TestEnqueueObjects:
@@ -138,6 +165,72 @@ class TestEnqueueObjects:
         )
         assert b"Object count has to be in range 1 - 5" in result.data
 
+    def test_enqueue_objects_in_workflow(self, client, museum_object_factory):
+        """
+        Test that objects already in the workflow are not counted as
+        available
+        """
+        def successful_job():
+            return ":)"
+
+        for i in range(0, 5):
+            museum_object_factory(
+                id=i, created_date=TEST_DATE, modified_date=TEST_DATE,
+                metadata_hash="", attachment_metadata_hash=""
+            )
+
+        get_queue(QueueType.DOWNLOAD_OBJECT).enqueue(
+            successful_job, job_id="download_object_0"
+        )
+        get_queue(QueueType.CREATE_SIP).enqueue(
+            successful_job, job_id="create_sip_1"
+        )
+        # Objects with jobs in multiple queues are only counted once
+        get_queue(QueueType.DOWNLOAD_OBJECT).enqueue(
+            successful_job, job_id="download_object_1"
+        )
+
+        result = client.get("/web-ui/enqueue-objects/")
+        assert b"<b>3</b> are available" in result.data
+
+    def test_enqueue_objects_count_cached(
+            self, client, museum_object_factory):
+        """
+        Test that the available object count is cached until objects are
+        enqueued
+        """
+        for i in range(0, 5):
+            museum_object_factory(
+                id=i, created_date=TEST_DATE, modified_date=TEST_DATE,
+                metadata_hash="", attachment_metadata_hash=""
+            )
+
+        result = client.get("/web-ui/enqueue-objects/")
+        assert b"<b>5</b> are available" in result.data
+        assert b"counted 0 second(s) ago" in result.data
+        assert b"updated at most every 30 seconds" in result.data
+
+        for i in range(5, 7):
+            museum_object_factory(
+                id=i, created_date=TEST_DATE, modified_date=TEST_DATE,
+                metadata_hash="", attachment_metadata_hash=""
+            )
+
+        # Cached count is displayed
+        result = client.get("/web-ui/enqueue-objects/")
+        assert b"<b>5</b> are available" in result.data
+
+        # Enqueuing objects invalidates the count
+        client.post(
+            "/web-ui/enqueue-objects/", data={"object_count": "2"},
+            follow_redirects=True
+        )
+        # Objects may already have been placed in the workflow
+        enqueued_count = len(get_queue(QueueType.DOWNLOAD_OBJECT).job_ids)
+        result = client.get("/web-ui/enqueue-objects/")
+        assert f"<b>{7 - enqueued_count}</b> are available".encode() \
+            in result.data
+
 
 @pytest.mark.usefixtures("user")
 class TestReenqueueObject:
@@ -183,6 +276,79 @@ class TestReenqueueObject:
         assert b"Latest package testSIP.tar wasn&#39;t rejected" in result.data
 
 
+@pytest.mark.usefixtures("user")
+class TestReenqueueObjects:
+    @pytest.fixture(autouse=True)
+    def rejected_objects(
+            self, session, museum_object_factory, museum_package_factory):
+        """
+        Create objects 1-3 with rejected latest packages, and object 4
+        with a latest package that wasn't rejected
+        """
+        for object_id in range(1, 5):
+            museum_object = museum_object_factory(
+                id=object_id, created_date=TEST_DATE, modified_date=TEST_DATE
+            )
+            museum_package = museum_package_factory(
+                id=object_id, sip_filename=f"test{object_id}.tar",
+                museum_object=museum_object,
+                rejected=object_id != 4
+            )
+            museum_object.latest_package = museum_package
+            session.commit()
+
+    def test_reenqueue_objects(self, client):
+        result = client.get("/web-ui/reenqueue-objects/")
+        assert b"Re-enqueue objects</h1>" in result.data
+
+        result = client.post(
+            "/web-ui/reenqueue-objects/",
+            data={"object_ids": "1\n2"},
+            follow_redirects=True
+        )
+        assert b"2 object(s) were re-enqueued" in result.data
+
+    def test_reenqueue_objects_job(self, app, client):
+        """
+        Test that large amounts of objects are re-enqueued in a background
+        job
+        """
+        app.config["BULK_OPERATION_SYNC_LIMIT"] = 2
+
+        result = client.post(
+            "/web-ui/reenqueue-objects/",
+            data={"object_ids": "1\n2\n3"}
+        )
+        assert result.status_code == 302
+        assert "/web-ui/jobs/" in result.headers["Location"]
+
+        result = client.get(result.headers["Location"])
+        assert b"Re-enqueue 3 object(s)" in result.data
+
+        # Nothing was re-enqueued yet
+        assert len(get_queue(QueueType.DOWNLOAD_OBJECT).job_ids) == 0
+
+    def test_reenqueue_objects_invalid(self, client):
+        result = client.post(
+            "/web-ui/reenqueue-objects/",
+            data={"object_ids": "1\n4\n5"}
+        )
+        assert b"Following objects don&#39;t exist: 5" in result.data
+
+        result = client.post(
+            "/web-ui/reenqueue-objects/",
+            data={"object_ids": "1\n4"}
+        )
+        assert (
+            b"Latest packages of following objects weren&#39;t rejected: 4"
+            in result.data
+        )
+
+    def test_job_status_not_found(self, client):
+        result = client.get("/web-ui/jobs/nonexistent")
+        assert result.status_code == 404
+
+
 @pytest.mark.usefixtures("user")
 class TestFrozenObjectStatistics:
     def test_frozen_object_statistics(
@@ -217,6 +383,81 @@ class TestFrozenObjectStatistics:
         assert b"No objects have been frozen" in result.data
 
 
+@pytest.mark.usefixtures("user")
+class TestRejectionStatistics:
+    @pytest.fixture(scope="function")
+    def rejections(
+            self, session, museum_object_factory, museum_package_factory):
+        """
+        Create two indexed rejection signatures found in three packages
+        """
+        checksum_error = RejectionSignature(
+            id=1, signature="ERROR: Missing checksum",
+            example="ERROR: Missing checksum"
+        )
+        file_error = RejectionSignature(
+            id=2, signature="ERROR: File <PATH> is invalid",
+            example="ERROR: File /tmp/a.jpg is invalid"
+        )
+        session.add_all([checksum_error, file_error])
+
+        for package_id, signature in [
+                (1, checksum_error), (2, file_error), (3, file_error)]:
+            museum_package_factory(
+                id=package_id, sip_filename=f"test{package_id}.tar",
+                rejected=True,
+                museum_object=museum_object_factory(
+                    id=package_id, title=f"Object {package_id}"
+                )
+            )
+            session.add(
+                IndexedRejectedPackage(
+                    package_id=package_id, indexed_date=TEST_DATE,
+                    rejections=[
+                        PackageRejection(
+                            signature=signature,
+                            log_filename="validation.log", line_number=5
+                        )
+                    ]
+                )
+            )
+
+        session.commit()
+
+    @pytest.mark.usefixtures("rejections")
+    def test_rejection_statistics(self, client):
+        """
+        Test that the signatures are displayed in order of occurrence
+        """
+        result = client.get("/web-ui/rejection-statistics/")
+
+        assert b"3 rejected SIP(s) have been indexed" in result.data
+        assert (
+            result.data.index(escape("ERROR: File <PATH> is invalid").encode())
+            < result.data.index(b"ERROR: Missing checksum")
+        )
+
+    @pytest.mark.usefixtures("rejections")
+    def test_rejection_statistics_packages(self, client):
+        """
+        Test that the packages containing a signature are displayed
+        """
+        result = client.get("/web-ui/rejection-statistics/2")
+
+        assert b"test2.tar" in result.data
+        assert b"test3.tar" in result.data
+        assert b"test1.tar" not in result.data
+        assert b"validation.log, line 5" in result.data
+
+        result = client.get("/web-ui/rejection-statistics/3")
+        assert result.status_code == 404
+
+    def test_rejection_statistics_none(self, client):
+        result = client.get("/web-ui/rejection-statistics/")
+
+        assert b"No rejections have been indexed" in result.data
+
+
 @pytest.mark.usefixtures("user")
 class TestFreezeObjects:
     def test_freeze_objects(self, session, client, museum_object_factory):
@@ -250,9 +491,51 @@ class TestFreezeObjects:
             .count() == 2
         )
 
-        # Auto-completion entry can be found in the page
-        result = client.get("/web-ui/freeze-objects/")
-        assert b"Test reason" in result.data
+        # Auto-completion entry can be found
+        result = client.get("/api/list-freeze-reasons").json
+        assert result["results"] == [{"reason": "Test reason", "count": 2}]
+
+    def test_freeze_objects_job(
+            self, app, session, client, museum_object_factory):
+        """
+        Test freezing objects in a background job
+        """
+        app.config["BULK_OPERATION_SYNC_LIMIT"] = 1
+
+        for i in [5, 10]:
+            museum_object_factory(
+                id=i, created_date=TEST_DATE, modified_date=TEST_DATE
+            )
+
+        result = client.post(
+            "/web-ui/freeze-objects/",
+            data={"reason": "Test reason", "object_ids": "10\n5"}
+        )
+        assert result.status_code == 302
+        job_id = result.headers["Location"].split("/")[-1]
+
+        result = client.get(f"/web-ui/jobs/{job_id}")
+        assert b"Freeze 2 object(s)" in result.data
+
+        _run_web_ui_worker(app)
+
+        result = client.get(f"/api/job-status/{job_id}").json
+        assert result["status"] == "finished"
+        assert result["progress"] == {"done": 2, "total": 2}
+        assert result["result"]["message"] == (
+            "2 object(s) were frozen, 0 package(s) were cancelled."
+        )
+
+        assert (
+            session.query(MuseumObject)
+            .filter(MuseumObject.id.in_([5, 10]))
+            .filter_by(
+                frozen=True,
+                freeze_reason="Test reason",
+                freeze_source=FreezeSource.USER
+            )
+            .count() == 2
+        )
 
     def test_freeze_objects_not_found(self, session, client):
         """
@@ -308,9 +591,11 @@ class TestUnfreezeObjects:
         museum_object_factory(id=4, frozen=True, freeze_reason="Test reason B")
 
         # Auto-completion entries can be found
-        result = client.get("/web-ui/unfreeze-objects/")
-        assert b"Test reason A" in result.data
-        assert b"Test reason B" in result.data
+        result = client.get("/api/list-freeze-reasons").json
+        assert result["results"] == [
+            {"reason": "Test reason A", "count": 2},
+            {"reason": "Test reason B", "count": 2}
+        ]
 
         # Objects 1 and 3 will be unfrozen
         result = client.post(
@@ -319,6 +604,10 @@ class TestUnfreezeObjects:
         )
         assert b"2 object(s) were unfrozen." in result.data
 
+        # Cached auto-completion entries were updated
+        result = client.get("/api/list-freeze-reasons").json
+        assert result["results"] == [{"reason": "Test reason B", "count": 2}]
+
         assert (
             session.query(MuseumObject)
             .filter(MuseumObject.id.in_([1, 3]))
@@ -361,6 +650,46 @@ class TestUnfreezeObjects:
         # Object was enqueued
         assert set(["download_object_2"]) == set(queue.job_ids)
 
+    def test_unfreeze_objects_job(
+            self, app, client, session, museum_object_factory):
+        """
+        Test unfreezing objects in a background job
+        """
+        app.config["BULK_OPERATION_SYNC_LIMIT"] = 2
+
+        for i in range(1, 6):
+            museum_object_factory(
+                id=i, frozen=True, freeze_reason="Test reason A"
+            )
+        museum_object_factory(id=6, frozen=True, freeze_reason="Test reason B")
+
+        result = client.post(
+            "/web-ui/unfreeze-objects/",
+            data={"reason": "Test reason A", "enqueue": True}
+        )
+        assert result.status_code == 302
+        job_id = result.headers["Location"].split("/")[-1]
+
+        result = client.get(f"/web-ui/jobs/{job_id}")
+        assert b"Unfreeze 5 object(s)" in result.data
+
+        # Nothing is unfrozen until the job is processed
+        assert session.query(MuseumObject).filter_by(frozen=False).count() == 0
+
+        _run_web_ui_worker(app)
+
+        result = client.get(f"/api/job-status/{job_id}").json
+        assert result["status"] == "finished"
+        assert result["progress"] == {"done": 5, "total": 5}
+        assert result["result"]["message"] == "5 object(s) were unfrozen."
+
+        assert (
+            session.query(MuseumObject)
+            .filter_by(frozen=False)
+            .count() == 5
+        )
+        assert len(get_queue(QueueType.DOWNLOAD_OBJECT).job_ids) == 5
+
     def test_unfreeze_objects_not_found(self, client):
         """
         Test unfreezing objects with a reason that's not used anywhere